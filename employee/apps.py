@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate, pre_migrate
 
 
 class EmployeeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employee'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .archive import drop_archive_view, install_archive_view
+        from .search import install_search_index
+
+        post_migrate.connect(install_search_index, sender=self)
+        pre_migrate.connect(drop_archive_view, sender=self)
+        post_migrate.connect(install_archive_view, sender=self)
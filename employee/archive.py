@@ -0,0 +1,147 @@
+from django.conf import settings
+from django.db import connections, router, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .models import ArchivedEmployee, Department, Employee, EmployeeRecord, Status
+from .serializers import RestoreSerializer
+from .signals import post_bulk_delete
+
+VIEW = EmployeeRecord._meta.db_table
+# Columns shared by the three models, in view order.
+COLUMNS = [field.column for field in EmployeeRecord._meta.concrete_fields]
+
+
+def get_archive_statuses():
+    return getattr(settings, 'EMPLOYEE_ARCHIVE_STATUSES', ['resigned', 'terminated'])
+
+
+def archivable_employees(status_names=None):
+    """
+    Employees whose status is one of ``status_names``. Department managers
+    are left in place, since their departments still point at them.
+    """
+    names = get_archive_statuses() if status_names is None else status_names
+    managers = Department.objects.filter(manager__isnull=False).values('manager')
+    return Employee.objects.filter(status__in=Status.objects.filter(name__in=names)) \
+        .exclude(pk__in=managers)
+
+
+def archive_employees(status_names=None, batch_size=1000):
+    """
+    Move archivable employees to ``ArchivedEmployee``, one transaction per
+    batch of ``batch_size`` rows, and return how many were moved.
+
+    The rows are deleted without the per-instance signals; the payroll
+    summary and the change log are updated once per batch through
+    ``post_bulk_delete``.
+    """
+    queryset = archivable_employees(status_names).order_by('pk')
+    using = router.db_for_write(Employee)
+    moved = 0
+    while True:
+        with transaction.atomic(using=using):
+            employees = list(queryset.select_for_update()[:batch_size])
+            if not employees:
+                return moved
+            ArchivedEmployee.objects.bulk_create([
+                ArchivedEmployee(**{
+                    field.attname: getattr(employee, field.attname)
+                    for field in Employee._meta.concrete_fields
+                })
+                for employee in employees
+            ])
+            Employee.objects.filter(pk__in=[employee.pk for employee in employees])._raw_delete(using)
+            post_bulk_delete.send(sender=Employee, instances=employees)
+        moved += len(employees)
+
+
+def restore_employee(archived, **changes):
+    """
+    Move ``archived`` back to ``Employee`` under its original id, applying
+    ``changes`` (typically a new ``status``) on the way. Raise ``NotFound``
+    when a concurrent restore got there first.
+    """
+    with transaction.atomic(using=router.db_for_write(Employee)):
+        archived = ArchivedEmployee.objects.select_for_update().filter(pk=archived.pk).first()
+        if archived is None:
+            raise NotFound()
+        values = {
+            field.attname: getattr(archived, field.attname) for field in Employee._meta.concrete_fields
+        }
+        employee = Employee(**values)
+        for name, value in changes.items():
+            setattr(employee, name, value)
+        employee.save(force_insert=True)
+        archived.delete()
+    return employee
+
+
+def drop_archive_view(sender, using, **kwargs):
+    """
+    ``pre_migrate`` receiver dropping the view, which would otherwise keep
+    migrations from altering the employee tables.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DROP VIEW IF EXISTS {VIEW}')
+
+
+def install_archive_view(sender, using, **kwargs):
+    """``post_migrate`` receiver (re)creating the view behind ``EmployeeRecord``."""
+    connection = connections[using]
+    tables = connection.introspection.table_names()
+    if Employee._meta.db_table not in tables or ArchivedEmployee._meta.db_table not in tables:
+        return
+    columns = ', '.join(connection.ops.quote_name(column) for column in COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP VIEW IF EXISTS {VIEW}')
+        cursor.execute(
+            f'CREATE VIEW {VIEW} AS '
+            f'SELECT {columns} FROM {Employee._meta.db_table} '
+            f'UNION ALL SELECT {columns} FROM {ArchivedEmployee._meta.db_table}'
+        )
+
+
+class ArchiveMixin:
+    """
+    Serve reads with ``?include_archived=true`` from ``EmployeeRecord``,
+    which adds the archived employees to the active ones, and add
+    ``POST <id>/restore/`` to move an archived employee back, optionally
+    with a new ``status_id``. Place it after ``EagerLoadingMixin``.
+    """
+    include_archived_param = 'include_archived'
+    archived_filterset_class = None
+
+    @property
+    def include_archived(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return False
+        value = request.query_params.get(self.include_archived_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def get_queryset(self):
+        if self.include_archived:
+            return EmployeeRecord.objects.all()
+        return super().get_queryset()
+
+    def filter_queryset(self, queryset):
+        if self.include_archived and self.archived_filterset_class is not None:
+            self.filterset_class = self.archived_filterset_class
+        return super().filter_queryset(queryset)
+
+    @action(detail=True, methods=['post'])
+    def restore(self, request, pk=None):
+        archived = get_object_or_404(ArchivedEmployee, pk=pk)
+        serializer = RestoreSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data.get('status', archived.status)
+        if new_status is not None and new_status.name in get_archive_statuses():
+            # It would only be archived again by the next run.
+            raise ValidationError({'status_id': [f'"{new_status.name}" employees are archived.']})
+        employee = restore_employee(archived, **serializer.validated_data)
+        return Response(self.get_serializer(employee).data, status=status.HTTP_201_CREATED)
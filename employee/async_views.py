@@ -0,0 +1,100 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .instrumentation import phase
+
+
+class AsyncReadOnlyView(View):
+    """
+    Async ``list`` and ``retrieve`` for a sync viewset.
+
+    The viewset still supplies authentication, permissions, the queryset,
+    filters, search, pagination and the serializer, so the JSON matches the
+    sync endpoint; rows are fetched with the async ORM, leaving the event
+    loop free while the database or a slow client is waiting. Filtering
+    runs in a worker thread because django-filter validates model choices
+    with synchronous queries.
+    """
+    viewset_class = None
+    renderer_class = JSONRenderer
+
+    async def get(self, request, pk=None):
+        view = self.viewset_class(
+            args=(), kwargs={} if pk is None else {'pk': pk},
+            action='list' if pk is None else 'retrieve',
+            format_kwarg=None, headers={},
+        )
+        view.request = Request(request, authenticators=view.get_authenticators())
+        try:
+            with phase('auth'):
+                await self.authenticate(view)
+                view.check_permissions(view.request)
+            if pk is None:
+                data = await self.list(view)
+            else:
+                data = await self.retrieve(view, pk)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+            return self.render(response.data, response.status_code, response.headers)
+        return self.render(data)
+
+    async def authenticate(self, view):
+        request = view.request
+        for authenticator in request.authenticators:
+            if hasattr(authenticator, 'aauthenticate'):
+                user_auth = await authenticator.aauthenticate(request._request)
+            else:
+                user_auth = await sync_to_async(authenticator.authenticate)(request)
+            if user_auth is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth
+                return
+        request._not_authenticated()
+
+    async def list(self, view):
+        def get_page_queryset():
+            queryset = view.filter_queryset(view.get_queryset())
+            if view.paginator is None:
+                return queryset
+            page_queryset = view.paginator.get_page_queryset(queryset, view.request, view)
+            return queryset if page_queryset is None else page_queryset
+
+        with phase('queryset'):
+            queryset = await sync_to_async(get_page_queryset)()
+            rows = [row async for row in queryset]
+        with phase('serializer'):
+            if view.paginator is None or not view.paginator.page_size:
+                return view.get_serializer(rows, many=True).data
+
+            page = view.paginator.build_page(rows)
+            data = view.get_serializer(page, many=True).data
+            return view.paginator.get_paginated_response(data).data
+
+    async def retrieve(self, view, pk):
+        with phase('queryset'):
+            queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+            model = queryset.model
+            try:
+                instance = await queryset.aget(**{view.lookup_field: pk})
+            except model.DoesNotExist:
+                raise exceptions.NotFound(f'No {model._meta.object_name} matches the given query.')
+            except (TypeError, ValueError, DjangoValidationError):
+                raise exceptions.NotFound()
+        view.check_object_permissions(view.request, instance)
+        with phase('serializer'):
+            return view.get_serializer(instance).data
+
+    def render(self, data, status_code=status.HTTP_200_OK, headers=None):
+        renderer = self.renderer_class()
+        with phase('render'):
+            content = renderer.render(data, renderer.media_type)
+        response = HttpResponse(content, status=status_code, content_type=renderer.media_type)
+        for name, value in (headers or {}).items():
+            if name.lower() != 'content-type':
+                response[name] = value
+        return response
@@ -0,0 +1,130 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+
+from . import cache
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU mapping with a per-entry time to live.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+token_cache = LRUCache(
+    maxsize=getattr(settings, 'TOKEN_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'TOKEN_CACHE_TTL', 60),
+)
+
+
+def _shared_cache():
+    alias = getattr(settings, 'TOKEN_CACHE_ALIAS', None)
+    return caches[alias] if alias else None
+
+
+def _shared_key(key):
+    return f'auth:token:{key}'
+
+
+def _version_key(key):
+    return f'auth:token:{key}:version'
+
+
+def _bump(key):
+    # Outlives every copy cached under the previous version.
+    timeout = max(getattr(settings, 'TOKEN_CACHE_TTL', 60),
+                  getattr(settings, 'TOKEN_CACHE_SHARED_TTL', 300))
+    cache.get_cache().set(_version_key(key), uuid.uuid4().hex, timeout)
+
+
+def invalidate_token(key):
+    token_cache.delete(key)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(_shared_key(key))
+    if cache.is_shared():
+        # Other workers drop their copies of this token when they see its
+        # new version; bumped again on commit, as employee.cache does.
+        _bump(key)
+        transaction.on_commit(lambda: _bump(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` that remembers resolved tokens so the
+    ``Token``/``User`` lookup runs once per token instead of once per request.
+
+    Tokens are kept in a per-process LRU (``TOKEN_CACHE_SIZE`` entries,
+    ``TOKEN_CACHE_TTL`` seconds) and, when ``TOKEN_CACHE_ALIAS`` names a
+    cache, in that shared cache for ``TOKEN_CACHE_SHARED_TTL`` seconds.
+    Each entry carries the version of its token, kept in the shared cache
+    and bumped when the token is deleted or its user deactivated, so every
+    worker stops accepting its copies on the next request. With a
+    local-memory cache a worker cannot hear about revocations elsewhere,
+    so it keeps tokens for ``TOKEN_CACHE_LOCAL_TTL`` seconds only.
+    """
+
+    def authenticate_credentials(self, key):
+        if not cache.is_shared():
+            entry = token_cache.get(key)
+            if entry is None:
+                entry = (super().authenticate_credentials(key), None)
+                token_cache.set(key, entry, getattr(settings, 'TOKEN_CACHE_LOCAL_TTL', 5))
+            return entry[0]
+
+        version = cache.get_cache().get(_version_key(key))
+        entry = token_cache.get(key)
+        if entry is None or entry[1] != version:
+            shared = _shared_cache()
+            entry = shared.get(_shared_key(key)) if shared is not None else None
+            if entry is None or entry[1] != version:
+                entry = (super().authenticate_credentials(key), version)
+                if shared is not None:
+                    shared.set(
+                        _shared_key(key), entry,
+                        getattr(settings, 'TOKEN_CACHE_SHARED_TTL', 300),
+                    )
+            token_cache.set(key, entry)
+        return entry[0]
@@ -0,0 +1,182 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .serializers import PreloadedPrimaryKeyRelatedField
+from .signals import post_bulk_save, pre_bulk_save
+
+
+class BulkWriteMixin:
+    """
+    Adds ``/bulk/`` to a model viewset: POST creates, PATCH updates and
+    DELETE removes a list of rows in a single transaction.
+
+    Foreign keys are validated with one ``in_bulk`` lookup per related
+    model and rows are written with ``bulk_create``/``bulk_update``. By
+    default any invalid row rejects the whole batch; with
+    ``?allow_partial=true`` the valid rows are written and the invalid ones
+    are reported per index with a 207 response.
+    """
+    bulk_max_rows = 1000
+    bulk_batch_size = 500
+    bulk_partial_param = 'allow_partial'
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        rows = request.data
+        if not isinstance(rows, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+        if len(rows) > self.bulk_max_rows:
+            raise ValidationError({
+                'non_field_errors': [f'A batch may contain at most {self.bulk_max_rows} items.']
+            })
+
+        if request.method == 'POST':
+            return self.bulk_create(rows)
+        if request.method == 'PATCH':
+            return self.bulk_update(rows)
+        return self.bulk_destroy(rows)
+
+    def bulk_create(self, rows):
+        context = self.get_bulk_serializer_context(rows)
+        serializers, errors = [], []
+        for index, row in enumerate(rows):
+            serializer = self.get_serializer(data=row, context=context)
+            if serializer.is_valid():
+                serializers.append(serializer)
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        if errors and not self.allow_partial():
+            return self.bulk_response([], errors)
+
+        model = self.get_queryset().model
+        instances = [model(**serializer.validated_data) for serializer in serializers]
+        with transaction.atomic():
+            model._default_manager.bulk_create(instances, batch_size=self.bulk_batch_size)
+            post_bulk_save.send(sender=model, instances=instances, created=True)
+        return self.bulk_response(
+            self.get_serializer(instances, many=True).data, errors, status.HTTP_201_CREATED
+        )
+
+    def bulk_update(self, rows):
+        queryset = self.get_queryset()
+        ids, errors = self.get_bulk_ids([
+            row.get('id') if isinstance(row, dict) else None for row in rows
+        ])
+        existing = queryset.in_bulk(list(ids.values()))
+
+        context = self.get_bulk_serializer_context(rows)
+        instances, fields = [], set()
+        for index, row in enumerate(rows):
+            if index not in ids:
+                continue
+            instance = existing.get(ids[index])
+            if instance is None:
+                errors.append({'index': index, 'errors': {'id': ['Not found.']}})
+                continue
+            serializer = self.get_serializer(instance, data=row, partial=True, context=context)
+            if not serializer.is_valid():
+                errors.append({'index': index, 'errors': serializer.errors})
+                continue
+            for attr, value in serializer.validated_data.items():
+                setattr(instance, attr, value)
+            fields.update(serializer.validated_data)
+            instances.append(instance)
+
+        errors.sort(key=lambda error: error['index'])
+        if errors and not self.allow_partial():
+            return self.bulk_response([], errors)
+
+        if instances and fields:
+            with transaction.atomic():
+                pre_bulk_save.send(sender=queryset.model, instances=instances,
+                                   update_fields=sorted(fields))
+                queryset.model._default_manager.bulk_update(
+                    instances, sorted(fields), batch_size=self.bulk_batch_size
+                )
+                post_bulk_save.send(
+                    sender=queryset.model, instances=instances, created=False,
+                    update_fields=sorted(fields),
+                )
+        return self.bulk_response(self.get_serializer(instances, many=True).data, errors)
+
+    def bulk_destroy(self, rows):
+        queryset = self.get_queryset()
+        ids, errors = self.get_bulk_ids(rows)
+        existing = set(queryset.filter(pk__in=ids.values()).values_list('pk', flat=True))
+        for index, pk in ids.items():
+            if pk not in existing:
+                errors.append({'index': index, 'errors': {'id': ['Not found.']}})
+
+        errors.sort(key=lambda error: error['index'])
+        if errors and not self.allow_partial():
+            return self.bulk_response([], errors)
+
+        with transaction.atomic():
+            queryset.filter(pk__in=existing).delete()
+        return self.bulk_response(sorted(existing), errors)
+
+    def get_bulk_ids(self, values):
+        """
+        Coerce the given primary keys, returning ``{index: pk}`` for the
+        valid ones and a list of per-index errors for the rest.
+        """
+        pk_field = self.get_queryset().model._meta.pk
+        ids, errors, seen = {}, [], set()
+        for index, value in enumerate(values):
+            try:
+                if value is None or isinstance(value, bool):
+                    raise DjangoValidationError('invalid')
+                pk = pk_field.to_python(value)
+            except (TypeError, DjangoValidationError):
+                errors.append({'index': index, 'errors': {'id': ['A valid id is required.']}})
+                continue
+            if pk in seen:
+                errors.append({'index': index, 'errors': {'id': ['Duplicate id in batch.']}})
+                continue
+            seen.add(pk)
+            ids[index] = pk
+        return ids, errors
+
+    def get_bulk_serializer_context(self, rows):
+        """
+        Preload every object referenced by a primary key field in ``rows``
+        with one query per related model.
+        """
+        context = self.get_serializer_context()
+        related_objects = {}
+        for name, field in self.get_serializer().fields.items():
+            if not isinstance(field, PreloadedPrimaryKeyRelatedField):
+                continue
+            model = field.get_queryset().model
+            pks = related_objects.setdefault(model, set())
+            for row in rows:
+                if not isinstance(row, dict) or row.get(name) in (None, ''):
+                    continue
+                try:
+                    pks.add(model._meta.pk.to_python(row[name]))
+                except (TypeError, DjangoValidationError):
+                    pass
+
+        context['related_objects'] = {
+            model: model._default_manager.in_bulk(pks) if pks else {}
+            for model, pks in related_objects.items()
+        }
+        return context
+
+    def allow_partial(self):
+        value = self.request.query_params.get(self.bulk_partial_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def bulk_response(self, results, errors, success_status=status.HTTP_200_OK):
+        if errors and not results and not self.allow_partial():
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = success_status
+        return Response({'results': results, 'errors': errors}, status=response_status)
@@ -0,0 +1,176 @@
+import hashlib
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import IntegrityError, transaction
+from django.db.models import DateTimeField, F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import CacheVersion
+
+
+def get_cache():
+    return caches[getattr(settings, 'LOOKUP_CACHE_ALIAS', 'default')]
+
+
+def _version_key(model):
+    return f'lookup:{model._meta.label_lower}:version'
+
+
+def is_shared(cache=None):
+    """Whether every worker process sees the same ``cache``."""
+    return not isinstance(cache or get_cache(), LocMemCache)
+
+
+def get_version(model):
+    """
+    Return ``(version, last_modified)`` for ``model``'s cached responses.
+
+    A local-memory cache is private to each worker, so the version is then
+    read from a ``CacheVersion`` row, one primary key lookup per request.
+    """
+    return get_versions(model)[0]
+
+
+def get_versions(*models):
+    """``get_version()`` for several models, with at most one query."""
+    cache = get_cache()
+    keys = [_version_key(model) for model in models]
+    if not is_shared(cache):
+        rows = _read_rows(keys)
+        missing = [key for key in keys if key not in rows]
+        if missing:
+            # Start from now rather than the epoch, so that no
+            # If-Modified-Since answers 304 for data changed before.
+            CacheVersion.objects.bulk_create(
+                [CacheVersion(key=key) for key in missing], ignore_conflicts=True,
+            )
+            rows.update(_read_rows(missing))
+        return [rows[key] for key in keys]
+    versions = []
+    for key in keys:
+        state = cache.get(key)
+        if state is None:
+            cache.add(key, (uuid.uuid4().hex, int(time.time())), None)
+            state = cache.get(key)
+        versions.append(state)
+    return versions
+
+
+def _read_rows(keys):
+    return {
+        key: (str(version), int(changed_at.timestamp()))
+        for key, version, changed_at in
+        CacheVersion.objects.filter(key__in=keys).values_list('key', 'version', 'changed_at')
+    }
+
+
+def _bump(model):
+    # Last-Modified has whole seconds: each version gets a later second
+    # than the one before, so If-Modified-Since never hides a change.
+    key = _version_key(model)
+    previous = get_cache().get(key)
+    changed_at = int(time.time()) if previous is None else max(int(time.time()), previous[1] + 1)
+    get_cache().set(key, (uuid.uuid4().hex, changed_at), None)
+
+
+def _bump_row(model):
+    key = _version_key(model)
+    now = timezone.now()
+    # As in _bump, never reuse the previous version's second.
+    values = {'version': F('version') + 1,
+              'changed_at': Greatest(Value(now, output_field=DateTimeField()),
+                                    F('changed_at') + timedelta(seconds=1))}
+    if CacheVersion.objects.filter(key=key).update(**values):
+        return
+    try:
+        with transaction.atomic():
+            CacheVersion.objects.create(key=key, version=1, changed_at=now)
+    except IntegrityError:
+        CacheVersion.objects.filter(key=key).update(**values)
+
+
+def invalidate(model):
+    """
+    Drop every cached response for ``model``.
+
+    With a shared cache the version is bumped immediately, so the writing
+    request and later reads in the same transaction see fresh data, and
+    again once the transaction commits, so a concurrent reader that cached
+    the pre-commit rows under the first bump is not served afterwards.
+    Otherwise the ``CacheVersion`` row is bumped in the writing
+    transaction, and other workers see the new version once it commits.
+    """
+    if not is_shared():
+        _bump_row(model)
+        return
+    _bump(model)
+    transaction.on_commit(lambda: _bump(model))
+
+
+class CachedLookupMixin:
+    """
+    Cache the serialized ``list`` and ``retrieve`` responses of small,
+    rarely changing tables and answer conditional requests.
+
+    Responses carry an ``ETag`` and ``Last-Modified`` derived from a
+    per-model version kept in the cache. ``If-None-Match`` and
+    ``If-Modified-Since`` are checked before touching the database, and the
+    version is bumped by the model signals in ``employee.signals``.
+    """
+    lookup_cache_timeout = None
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        model = self.queryset.model
+        version, last_modified = get_version(model)
+        variant = hashlib.sha1(
+            f'{request.build_absolute_uri()}|{request.accepted_media_type}'.encode()
+        ).hexdigest()[:16]
+        etag = f'"{version[:16]}-{variant}"'
+
+        if self.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            cache = get_cache()
+            key = f'lookup:{model._meta.label_lower}:{version}:{variant}'
+            data = cache.get(key)
+            if data is not None:
+                response = Response(data)
+            else:
+                response = handler(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                cache.set(key, response.data, self.get_lookup_cache_timeout())
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def is_not_modified(self, request, etag, last_modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            return if_none_match.strip() == '*' or etag in parse_etags(if_none_match)
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        return if_modified_since is not None and last_modified <= if_modified_since
+
+    def get_lookup_cache_timeout(self):
+        if self.lookup_cache_timeout is not None:
+            return self.lookup_cache_timeout
+        return getattr(settings, 'LOOKUP_CACHE_TIMEOUT', 3600)
@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from .mixins import optimize_queryset
+from .models import ChangeLog, Department, Employee, Position, Status
+from .serializers import (
+    DepartmentSerializer, EmployeeSerializer, PositionSerializer, StatusSerializer,
+)
+
+# The models whose changes are logged, with the serializer rendering them
+# in the feed.
+FEEDS = {
+    model._meta.model_name: (model, serializer_class)
+    for model, serializer_class in [
+        (Status, StatusSerializer),
+        (Position, PositionSerializer),
+        (Department, DepartmentSerializer),
+        (Employee, EmployeeSerializer),
+    ]
+}
+
+
+def record(model, ids, action):
+    """
+    Log ``action`` for the ``model`` rows with the given primary keys.
+
+    On PostgreSQL each entry also gets the first transaction id not yet
+    handed out once its log id is taken: every transaction that could still
+    log a lower id is below it, so the entry is served only when all of
+    them have finished (see ``settled``).
+    """
+    now = timezone.now()
+    postgresql = connections[DEFAULT_DB_ALIAS].vendor == 'postgresql'
+    if postgresql:
+        # Take the transaction id before the log ids, so that the horizon
+        # of any entry logged after ours covers this transaction.
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute('SELECT pg_current_xact_id()')
+    entries = ChangeLog.objects.bulk_create([
+        ChangeLog(model=model._meta.model_name, object_id=pk, action=action, changed_at=now)
+        for pk in ids
+    ])
+    if postgresql and entries:
+        # A statement after the insert sees every id handed out before it.
+        ChangeLog.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+            xid_horizon=RawSQL('pg_snapshot_xmax(pg_current_snapshot())::text::bigint', []),
+        )
+
+
+def snapshot_xmin():
+    """
+    An expression for the oldest transaction id still running, or None on
+    databases that do not expose it.
+    """
+    if connections[DEFAULT_DB_ALIAS].vendor != 'postgresql':
+        return None
+    return RawSQL('pg_snapshot_xmin(pg_current_snapshot())::text::bigint', [])
+
+
+def settled_before():
+    """
+    Entries logged after this time are not served yet, where transaction
+    ids are not available. Log ids are handed out before the writing
+    transaction commits, so a lower id may still become visible after a
+    higher one; waiting ``CHANGE_FEED_DELAY`` seconds, longer than any
+    write transaction, keeps a reader from moving its cursor past it.
+    """
+    return timezone.now() - timedelta(seconds=getattr(settings, 'CHANGE_FEED_DELAY', 2))
+
+
+def settled():
+    """
+    A filter for the entries that can be served: no transaction that could
+    still log a lower id is running. Entries are settled in id order.
+    """
+    delayed = Q(changed_at__lte=settled_before())
+    xmin = snapshot_xmin()
+    if xmin is None:
+        return delayed
+    return Q(xid_horizon__lte=xmin) | Q(xid_horizon__isnull=True) & delayed
+
+
+def annotate_settled(entries):
+    """Annotate each of the ``entries`` with whether it is ``settled``."""
+    return entries.annotate(settled=ExpressionWrapper(settled(), output_field=BooleanField()))
+
+
+def current_cursor():
+    """The cursor to start from before fetching a full snapshot."""
+    return ChangeLog.objects.filter(settled()).order_by('-id') \
+        .values_list('id', flat=True).first() or 0
+
+
+def is_expired(since):
+    """Whether entries after ``since`` have been pruned already."""
+    oldest = ChangeLog.objects.order_by('id').values_list('id', flat=True).first()
+    return oldest is not None and since < oldest - 1
+
+
+def read(since, limit, models, context):
+    """
+    Return ``(results, cursor, has_more)`` for up to ``limit`` log entries
+    after ``since``.
+
+    The entries are collapsed to the latest per object, and each object is
+    rendered once from its current row with relations as primary keys, so
+    a page costs one query for the log plus one per model that changed.
+    Objects that no longer exist are returned as tombstones.
+    """
+    entries = annotate_settled(ChangeLog.objects.filter(id__gt=since).order_by('id'))
+    if models is not None:
+        entries = entries.filter(model__in=models)
+    entries = list(entries.values_list('id', 'model', 'object_id', 'action', 'settled')[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    for index, entry in enumerate(entries):
+        if not entry[4]:
+            entries, has_more = entries[:index], True
+            break
+
+    latest = {}
+    for _, model, object_id, action, _ in entries:
+        # Re-inserting keeps the objects in the order of their last change.
+        latest.pop((model, object_id), None)
+        latest[(model, object_id)] = action
+
+    rendered = {}
+    for name, (model, serializer_class) in FEEDS.items():
+        ids = [pk for (label, pk), action in latest.items()
+               if label == name and action != ChangeLog.DELETE]
+        if not ids:
+            continue
+        serializer = serializer_class(context={**context, 'sparse': (None, set())})
+        queryset = optimize_queryset(model.objects.filter(pk__in=ids), serializer)
+        for instance in queryset:
+            rendered[(name, instance.pk)] = serializer.to_representation(instance)
+
+    results = []
+    for key, action in latest.items():
+        data = rendered.get(key)
+        results.append({'model': key[0], 'id': key[1], 'deleted': data is None, 'data': data})
+    cursor = entries[-1][0] if entries else since
+    return results, cursor, has_more
+
+
+def prune(before):
+    """
+    Delete the entries logged before ``before``, always keeping the newest
+    one so ``is_expired`` can still tell which cursors are too old.
+    Return the number of entries deleted.
+    """
+    newest = ChangeLog.objects.order_by('-id').values_list('id', flat=True).first()
+    horizon = ChangeLog.objects.filter(changed_at__lt=before).order_by('-id') \
+        .values_list('id', flat=True).first()
+    if horizon is None:
+        return 0
+    # Deleting a prefix of the ids keeps the retained ones contiguous.
+    deleted, _ = ChangeLog.objects.filter(id__lte=min(horizon, newest - 1)).delete()
+    return deleted
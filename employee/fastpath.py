@@ -0,0 +1,185 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import FileField
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .serializers import ImageVariantsField
+
+# Serializer fields whose ``to_representation`` returns column values of
+# these model fields unchanged, so they can be copied as they are.
+INTEGER_FIELDS = ('AutoField', 'BigAutoField', 'IntegerField', 'BigIntegerField',
+                  'PositiveIntegerField', 'SmallIntegerField')
+IDENTITY_FIELDS = {
+    serializers.IntegerField: INTEGER_FIELDS,
+    serializers.BigIntegerField: INTEGER_FIELDS,
+    serializers.CharField: ('CharField', 'TextField'),
+    serializers.BooleanField: ('BooleanField',),
+}
+# Serializer fields that render a column value through ``to_representation``.
+CONVERTED_FIELDS = (
+    serializers.DecimalField, serializers.IntegerField, serializers.BigIntegerField,
+    serializers.CharField,
+    serializers.BooleanField, serializers.FloatField, serializers.DateField,
+    serializers.DateTimeField, serializers.ChoiceField, serializers.JSONField,
+    ImageVariantsField,
+)
+
+
+class RowPlan:
+    """
+    Build the representation of a serializer straight from ``values_list()``
+    tuples.
+
+    ``paths`` lists the lookups to fetch, in tuple order. Each entry of the
+    plan is ``(key, index, convert, nested)``: nested serializers are
+    ``None`` when the foreign key at ``index`` is null and are otherwise
+    built from their own entries; other values are copied, or passed
+    through ``convert`` unless they are ``None``, as ``Serializer`` does.
+    """
+
+    def __init__(self):
+        self.paths = []
+        self.entries = []
+
+    def index(self, path):
+        if path not in self.paths:
+            self.paths.append(path)
+        return self.paths.index(path)
+
+    def build(self, row):
+        return _build(self.entries, row)
+
+
+def _build(entries, row):
+    data = {}
+    for key, index, convert, nested in entries:
+        value = row[index]
+        if value is None:
+            data[key] = None
+        elif nested is not None:
+            data[key] = _build(nested, row)
+        elif convert is None:
+            data[key] = value
+        else:
+            data[key] = convert(value)
+    return data
+
+
+def _file_converter(field, model_field):
+    def convert(name):
+        if not name:
+            return None
+        return field.to_representation(model_field.attr_class(None, model_field, name))
+    return convert
+
+
+def _converter(field, model_field):
+    if type(model_field).__name__ in IDENTITY_FIELDS.get(type(field), ()):
+        coerce = getattr(field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING)
+        if not isinstance(field, serializers.BigIntegerField) or not coerce:
+            return None
+    if isinstance(field, serializers.DecimalField):
+        # Quantizing is slow and the same few salaries repeat on every page.
+        return lru_cache(maxsize=1024)(field.to_representation)
+    return field.to_representation
+
+
+def _plain(serializer):
+    to_representation = type(serializer).to_representation
+    return to_representation is serializers.Serializer.to_representation
+
+
+def _compile(serializer, model, plan, prefix):
+    entries = []
+    for field in serializer._readable_fields:
+        if len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete:
+            return None
+        path = prefix + model_field.name
+
+        if model_field.is_relation:
+            if isinstance(field, serializers.BaseSerializer):
+                if isinstance(field, serializers.ListSerializer) or not _plain(field):
+                    return None
+                nested = _compile(field, model_field.related_model, plan, f'{path}__')
+                if nested is None:
+                    return None
+                entries.append((field.field_name, plan.index(path), None, nested))
+            elif type(field) is serializers.PrimaryKeyRelatedField and field.pk_field is None:
+                entries.append((field.field_name, plan.index(path), None, None))
+            else:
+                return None
+        elif isinstance(model_field, FileField) and isinstance(field, serializers.FileField):
+            convert = _file_converter(field, model_field)
+            entries.append((field.field_name, plan.index(path), convert, None))
+        elif type(field) in CONVERTED_FIELDS:
+            entries.append((field.field_name, plan.index(path), _converter(field, model_field), None))
+        else:
+            return None
+    return entries
+
+
+def compile_serializer(serializer, model):
+    """
+    Return a ``RowPlan`` producing exactly what ``serializer`` renders for
+    instances of ``model``, or ``None`` when one of its fields needs the
+    model instance (method fields, properties, reverse or many-to-many
+    relations, overridden ``to_representation`` and the like).
+    """
+    if not _plain(serializer):
+        return None
+    plan = RowPlan()
+    entries = _compile(serializer, model, plan, '')
+    if entries is None:
+        return None
+    plan.entries = entries
+    return plan
+
+
+class FastListMixin:
+    """
+    Serve ``list`` from ``values_list()`` tuples through a ``RowPlan``
+    instead of model instances and ``Serializer.to_representation``, when
+    the serializer can be compiled and the paginator exposes the keyset
+    page queryset. The JSON is the same either way. ``API_FAST_LIST =
+    False`` turns it off.
+    """
+
+    def list(self, request, *args, **kwargs):
+        paginator = self.paginator
+        if not getattr(settings, 'API_FAST_LIST', True) or (
+            paginator is not None and not hasattr(paginator, 'get_page_queryset')
+        ):
+            return super().list(request, *args, **kwargs)
+        queryset = self.get_queryset()
+        plan = compile_serializer(self.get_serializer(), queryset.model)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(queryset)
+
+        page_queryset = None
+        if paginator is not None:
+            page_queryset = paginator.get_page_queryset(queryset, request, view=self)
+        if page_queryset is None:
+            return Response([plan.build(row) for row in queryset.values_list(*plan.paths)])
+
+        # The cursors are built from the ordering values of the first and
+        # last rows, so those are fetched too.
+        row_fields = list(plan.paths)
+        row_fields += [
+            name for name in dict.fromkeys(field.lstrip('-') for field in paginator.ordering)
+            if name not in row_fields
+        ]
+        paginator.row_fields = row_fields
+        page = paginator.build_page(list(page_queryset.values_list(*row_fields)))
+        return paginator.get_paginated_response([plan.build(row) for row in page])
@@ -0,0 +1,29 @@
+from django_filters import rest_framework as filters
+
+from .models import Employee, EmployeeRecord
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    pass
+
+
+class EmployeeFilter(filters.FilterSet):
+    """
+    Every filter here is served by an index: see ``Employee.Meta.indexes``
+    and ``Position.salary``.
+    """
+    status__in = NumberInFilter(field_name='status', lookup_expr='in')
+    department__in = NumberInFilter(field_name='department', lookup_expr='in')
+    salary_min = filters.NumberFilter(field_name='position__salary', lookup_expr='gte')
+    salary_max = filters.NumberFilter(field_name='position__salary', lookup_expr='lte')
+
+    class Meta:
+        model = Employee
+        fields = ['status', 'position', 'department', 'is_manager']
+
+
+class EmployeeRecordFilter(EmployeeFilter):
+    """``EmployeeFilter`` for ``?include_archived=`` reads."""
+
+    class Meta(EmployeeFilter.Meta):
+        model = EmployeeRecord
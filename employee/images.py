@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VARIANTS = {'thumbnail': 64, 'small': 256, 'medium': 768}
+FORMATS = {'jpeg': ('JPEG', 'jpg'), 'webp': ('WEBP', 'webp')}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_variants():
+    return getattr(settings, 'EMPLOYEE_IMAGE_VARIANTS', DEFAULT_VARIANTS)
+
+
+def validate_image(image):
+    """
+    Reject uploads over ``EMPLOYEE_IMAGE_MAX_BYTES`` or whose decoded size
+    exceeds ``EMPLOYEE_IMAGE_MAX_PIXELS``, reading only the image header.
+    """
+    max_bytes = getattr(settings, 'EMPLOYEE_IMAGE_MAX_BYTES', 5 * 1024 * 1024)
+    if image.size > max_bytes:
+        raise serializers.ValidationError(
+            f'Image files may be at most {max_bytes // 1024} KB.'
+        )
+
+    max_pixels = getattr(settings, 'EMPLOYEE_IMAGE_MAX_PIXELS', 25_000_000)
+    image.seek(0)
+    with Image.open(image) as img:
+        width, height = img.size
+    image.seek(0)
+    if width * height > max_pixels:
+        raise serializers.ValidationError(
+            f'Images may be at most {max_pixels} pixels ({width}x{height} given).'
+        )
+    return image
+
+
+def _encode(img, image_format, **options):
+    buffer = BytesIO()
+    if image_format == 'JPEG' and img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    img.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def build_variants(source):
+    """
+    Return ``(original, derivatives)`` for the image in ``source``: the
+    original re-encoded without EXIF and ``{(variant, format): bytes}``.
+    """
+    with Image.open(source) as img:
+        source_format = img.format or 'JPEG'
+        img = ImageOps.exif_transpose(img)
+        # Re-encoding without passing ``exif`` drops EXIF metadata such as
+        # GPS position and camera serial numbers.
+        original = _encode(img, source_format, quality=90)
+
+        derivatives = {}
+        for variant, size in get_variants().items():
+            resized = img.copy()
+            resized.thumbnail((size, size), Image.LANCZOS)
+            for format_name, (image_format, _) in FORMATS.items():
+                derivatives[variant, format_name] = _encode(resized, image_format, quality=82)
+    return original, derivatives
+
+
+def process_employee_image(employee_id):
+    """
+    Strip EXIF from the stored upload, write its resized JPEG and WebP
+    variants and record their names on ``Employee.image_variants``.
+    """
+    from .changes import record
+    from .models import ChangeLog, Employee
+
+    employee = Employee.objects.filter(pk=employee_id).only('image', 'image_variants').first()
+    if employee is None:
+        return
+    storage = employee.image.storage
+    stale = [name for formats in employee.image_variants.values() for name in formats.values()]
+    variants = {}
+
+    if employee.image:
+        image_name = employee.image.name
+        with employee.image.open('rb') as source:
+            content = source.read()
+        original, derivatives = build_variants(BytesIO(content))
+
+        digest = hashlib.sha1(content).hexdigest()[:10]
+        directory = f'{Employee._meta.get_field("image").upload_to}variants/{employee_id}'
+        for (variant, format_name), data in derivatives.items():
+            extension = FORMATS[format_name][1]
+            name = storage.save(f'{directory}/{digest}-{variant}.{extension}', ContentFile(data))
+            variants.setdefault(variant, {})[format_name] = name
+
+        # Written next to the upload, which keeps being served until the
+        # update below swaps the names.
+        saved_name = storage.save(image_name, ContentFile(original))
+
+        # Only record the result if the image was not replaced meanwhile;
+        # the job queued for the newer upload will record its own.
+        updated = Employee.objects.filter(pk=employee_id, image=image_name).update(
+            image=saved_name, image_variants=variants
+        )
+        if updated:
+            stale.append(image_name)
+        else:
+            stale = [saved_name] + [name for formats in variants.values() for name in formats.values()]
+    else:
+        updated = Employee.objects.filter(
+            Q(image='') | Q(image__isnull=True), pk=employee_id
+        ).update(image_variants={})
+
+    if updated:
+        record(Employee, [employee_id], ChangeLog.UPDATE)
+    for name in stale:
+        storage.delete(name)
+
+
+def _run(employee_id):
+    try:
+        process_employee_image(employee_id)
+    except Exception:
+        logger.exception('Processing image of employee %s failed', employee_id)
+    finally:
+        close_old_connections()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'EMPLOYEE_IMAGE_WORKERS', 2),
+                thread_name_prefix='employee-images',
+            )
+        return _executor
+
+
+def schedule_image_processing(employee_id):
+    """
+    Process the employee's image once the current transaction commits, on
+    the worker pool unless ``EMPLOYEE_IMAGE_ASYNC`` is off.
+    """
+    if getattr(settings, 'EMPLOYEE_IMAGE_ASYNC', True):
+        transaction.on_commit(lambda: get_executor().submit(_run, employee_id))
+    else:
+        transaction.on_commit(lambda: process_employee_image(employee_id))
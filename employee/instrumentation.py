@@ -0,0 +1,123 @@
+import contextvars
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from time import perf_counter
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+# The recorder of the request being sampled, if any; set by
+# PerformanceMiddleware.
+current_recorder = contextvars.ContextVar('current_recorder', default=None)
+
+
+class Recorder:
+    """
+    Collect the SQL statements and per-phase timings of one request.
+
+    Phases nest, and each reports only its own time: SQL run inside a phase
+    and nested phases are subtracted, so the phases and ``db`` add up to at
+    most the total.
+    """
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.queries = []
+        self.db_time = 0.0
+        self.phases = {}
+        self._stack = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - started
+            self.db_time += elapsed
+            self.queries.append((elapsed, sql))
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+    def enter(self):
+        self._stack.append([perf_counter(), 0.0])
+
+    def exit(self, name):
+        started, nested = self._stack.pop()
+        elapsed = perf_counter() - started
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed - nested
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+    def wrap_connections(self):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+    @contextmanager
+    def activate(self):
+        """Record queries on every connection and make this the current recorder."""
+        token = current_recorder.set(self)
+        try:
+            with self.wrap_connections():
+                yield self
+        finally:
+            current_recorder.reset(token)
+
+    @asynccontextmanager
+    async def aactivate(self):
+        # Connections belong to a thread, and async code queries from the
+        # request's sync_to_async thread, so the wrappers are installed there.
+        stack = await sync_to_async(self.wrap_connections)()
+        token = current_recorder.set(self)
+        try:
+            yield self
+        finally:
+            current_recorder.reset(token)
+            await sync_to_async(stack.close)()
+
+    def elapsed(self):
+        return perf_counter() - self.started
+
+
+@contextmanager
+def phase(name):
+    """Time the block as ``name`` when the request is being sampled."""
+    recorder = current_recorder.get()
+    if recorder is None:
+        yield
+        return
+    recorder.enter()
+    try:
+        yield
+    finally:
+        recorder.exit(name)
+
+
+class InstrumentedViewMixin:
+    """
+    Split a sampled request's time into ``auth`` (authentication,
+    permissions and throttling), ``queryset`` (building, filtering and
+    paginating the queryset) and ``serializer``: what the handler spends
+    outside those phases and SQL, which is serialization for the read
+    endpoints. Rendering is timed by ``PerformanceMiddleware``.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with phase('serializer'):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        with phase('auth'):
+            super().initial(request, *args, **kwargs)
+
+    def get_queryset(self):
+        with phase('queryset'):
+            return super().get_queryset()
+
+    def filter_queryset(self, queryset):
+        with phase('queryset'):
+            return super().filter_queryset(queryset)
+
+    def paginate_queryset(self, queryset):
+        with phase('queryset'):
+            return super().paginate_queryset(queryset)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from employee import archive
+
+
+class Command(BaseCommand):
+    help = (
+        'Move employees whose status is one of EMPLOYEE_ARCHIVE_STATUSES to the archive '
+        'table, in batches. Department managers are skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--statuses', nargs='+',
+                            help='Status names to archive (default: EMPLOYEE_ARCHIVE_STATUSES).')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Employees moved per transaction.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only count the employees that would be archived.')
+
+    def handle(self, *args, statuses=None, batch_size=1000, dry_run=False, **options):
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1.')
+        statuses = statuses or archive.get_archive_statuses()
+        if dry_run:
+            count = archive.archivable_employees(statuses).count()
+            self.stdout.write(f'{count} employees would be archived.')
+            return
+        moved = archive.archive_employees(statuses, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} employees.'))
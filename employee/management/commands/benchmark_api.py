@@ -0,0 +1,255 @@
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_databases, setup_test_environment,
+    teardown_databases, teardown_test_environment,
+)
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from employee import archive, summary
+from employee.authentication import token_cache
+from employee.management.commands.seed_data import parse_scale
+from employee.models import Department, Employee, Position, Status
+from employee.seeding import seed_database
+
+ENDPOINTS = ['list', 'filter', 'search', 'retrieve', 'create', 'login']
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+
+def summarize(latencies, queries, peak):
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'iterations': len(latencies),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'p50_ms': round(cuts[49], 3),
+        'p95_ms': round(cuts[94], 3),
+        'p99_ms': round(cuts[98], 3),
+        'max_ms': round(max(latencies), 3),
+        'queries': statistics.median_high(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def compare_results(baseline, current, threshold):
+    """
+    Return ``(scale, endpoint, metric, before, after)`` for every metric in
+    ``current`` that regressed against ``baseline``: p50/p95 latency grew by
+    more than ``threshold`` (a fraction), or the query count grew at all.
+    """
+    regressions = []
+    for scale, endpoints in current['results'].items():
+        for endpoint, after in endpoints.items():
+            before = baseline['results'].get(scale, {}).get(endpoint)
+            if before is None:
+                continue
+            for metric in ('p50_ms', 'p95_ms'):
+                if after[metric] > before[metric] * (1 + threshold):
+                    regressions.append((scale, endpoint, metric, before[metric], after[metric]))
+            if after['queries'] > before['queries']:
+                regressions.append((scale, endpoint, 'queries', before['queries'], after['queries']))
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the list, filter, search, retrieve, create and login endpoints '
+        'in-process against a throwaway test database seeded at each scale. '
+        'Reports latency percentiles, query counts and peak memory, optionally '
+        'saves them as JSON and flags regressions against a saved baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', nargs='+', default=['1k', '10k', '100k'],
+                            help='Employee counts to seed, e.g. 1k 10k 100k or small large.')
+        parser.add_argument('--iterations', type=int, default=50,
+                            help='Timed requests per endpoint and scale.')
+        parser.add_argument('--warmup', type=int, default=5,
+                            help='Untimed requests per endpoint before timing.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--baseline', help='JSON file of an earlier run to compare against.')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Latency growth, as a fraction, counted as a regression.')
+        parser.add_argument('--inactive', type=float, default=0,
+                            help='Fraction of the seeded employees moved to a resigned status.')
+        parser.add_argument('--archive', action='store_true',
+                            help='Archive the inactive employees before timing.')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 2:
+            raise CommandError('--iterations must be at least 2.')
+        if not 0 <= options['inactive'] < 1:
+            raise CommandError('--inactive must be at least 0 and below 1.')
+        scales = [parse_scale(scale) for scale in options['scales']]
+        baseline = self.load_baseline(options['baseline'])
+        self.options = options
+
+        setup_test_environment()
+        # Replicas and shared caches belong to the real deployment, not to
+        # the throwaway database.
+        with override_settings(
+            DATABASE_REPLICAS=[], TOKEN_CACHE_ALIAS=None,
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        ):
+            old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+            try:
+                results = {str(scale): self.run_scale(scale) for scale in scales}
+            finally:
+                teardown_databases(old_config, verbosity=0)
+                teardown_test_environment()
+
+        report = {'meta': self.get_meta(), 'results': results}
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}.')
+        if baseline is not None:
+            self.compare(baseline, report, options['threshold'])
+
+    def load_baseline(self, path):
+        if not path:
+            return None
+        try:
+            with open(path) as baseline:
+                return json.load(baseline)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+
+    def get_meta(self):
+        try:
+            revision = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            revision = None
+        return {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'revision': revision,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'seed': self.options['seed'],
+            'iterations': self.options['iterations'],
+            'inactive': self.options['inactive'],
+            'archive': self.options['archive'],
+        }
+
+    def run_scale(self, scale):
+        call_command('flush', interactive=False, verbosity=0)
+        token_cache.clear()
+        started = time.monotonic()
+        seed_database(scale, seed=self.options['seed'])
+        self.stdout.write(f'Seeded {scale} employees in {time.monotonic() - started:.1f}s.')
+        if self.options['inactive']:
+            self.deactivate(scale)
+
+        user = User.objects.create_user('benchmark', password=BENCHMARK_PASSWORD)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        requests = self.get_requests(client)
+
+        self.stdout.write(f'{"scale":>8} {"endpoint":<10}{"p50 ms":>10}{"p95 ms":>10}'
+                          f'{"p99 ms":>10}{"queries":>9}{"peak KB":>10}')
+        results = {}
+        for name in ENDPOINTS:
+            results[name] = result = self.measure(requests[name])
+            self.stdout.write(
+                f'{scale:>8} {name:<10}{result["p50_ms"]:>10.2f}{result["p95_ms"]:>10.2f}'
+                f'{result["p99_ms"]:>10.2f}{result["queries"]:>9}{result["peak_memory_kb"]:>10.1f}'
+            )
+        return results
+
+    def deactivate(self, scale):
+        """
+        Give a share of the employees an archived status, and archive them
+        with ``--archive``, so runs with and without it compare list and
+        search latency on the same active headcount.
+        """
+        name = archive.get_archive_statuses()[0]
+        status = Status.objects.filter(name=name).first() or Status.objects.create(name=name)
+        candidates = list(Employee.objects.filter(is_manager=False).values_list('id', flat=True))
+        count = min(int(scale * self.options['inactive']), len(candidates))
+        ids = random.Random(self.options['seed']).sample(candidates, count)
+        for start in range(0, len(ids), 1000):
+            Employee.objects.filter(id__in=ids[start:start + 1000]).update(status=status)
+        summary.rebuild_summary()
+        if self.options['archive']:
+            started = time.monotonic()
+            moved = archive.archive_employees()
+            self.stdout.write(f'Archived {moved} employees in {time.monotonic() - started:.1f}s.')
+
+    def get_requests(self, client):
+        rng = random.Random(self.options['seed'])
+        ids = list(Employee.objects.values_list('id', flat=True))
+        sample = Employee.objects.get(id=ids[len(ids) // 2])
+        term = sample.name.split()[0]
+        status = Status.objects.get(name='normal')
+        department = Department.objects.order_by('id').first()
+        position = Position.objects.order_by('id').first()
+        list_url = reverse('employee-list')
+        new_employee = {
+            'name': 'Benchmark Hire', 'address': '1 Silom Road, Bangkok', 'status_id': status.id,
+            'position_id': position.id, 'department_id': department.id,
+        }
+        login = {'username': 'benchmark', 'password': BENCHMARK_PASSWORD}
+        return {
+            'list': lambda: client.get(list_url),
+            'filter': lambda: client.get(list_url, {'status': status.id,
+                                                    'department': department.id}),
+            'search': lambda: client.get(list_url, {'search': term}),
+            'retrieve': lambda: client.get(reverse('employee-detail', args=[rng.choice(ids)])),
+            'create': lambda: client.post(list_url, new_employee, format='json'),
+            'login': lambda: APIClient().post(reverse('api_token_auth'), login),
+        }
+
+    def measure(self, send):
+        for _ in range(self.options['warmup']):
+            self.check_response(send())
+
+        latencies, queries = [], []
+        for _ in range(self.options['iterations']):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = send()
+                latencies.append((time.perf_counter() - started) * 1000)
+            self.check_response(response)
+            queries.append(len(captured))
+
+        # tracemalloc slows allocation down, so memory gets its own request.
+        tracemalloc.start()
+        try:
+            self.check_response(send())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return summarize(latencies, queries, peak)
+
+    def check_response(self, response):
+        if response.status_code >= 400:
+            raise CommandError(
+                f'{response.request["REQUEST_METHOD"]} {response.request["PATH_INFO"]} '
+                f'answered {response.status_code}: {response.content[:200]!r}'
+            )
+
+    def compare(self, baseline, report, threshold):
+        regressions = compare_results(baseline, report, threshold)
+        revision = baseline.get('meta', {}).get('revision') or 'baseline'
+        for scale, endpoint, metric, before, after in regressions:
+            self.stderr.write(f'REGRESSION {scale} {endpoint} {metric}: {before} -> {after}')
+        if regressions:
+            raise CommandError(f'{len(regressions)} regressions against {revision}.')
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {revision}.'))
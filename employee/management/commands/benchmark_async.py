@@ -0,0 +1,105 @@
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib import parse, request
+from urllib.error import HTTPError, URLError
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput of the sync API on a WSGI server with the async '
+        'read endpoints on an ASGI server under concurrent connections.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://localhost:8000',
+                            help='Base URL of the WSGI server (sync /api/ endpoints).')
+        parser.add_argument('--asgi-url', default='http://localhost:8001',
+                            help='Base URL of the ASGI server (/api/async/ endpoints).')
+        parser.add_argument('--token', help='API token; otherwise log in with --username.')
+        parser.add_argument('--username')
+        parser.add_argument('--password')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50])
+        parser.add_argument('--requests', type=int, default=500,
+                            help='Requests per endpoint and concurrency level.')
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def handle(self, *args, **options):
+        self.timeout = options['timeout']
+        wsgi_url = options['wsgi_url'].rstrip('/')
+        asgi_url = options['asgi_url'].rstrip('/')
+        token = options['token'] or self.login(wsgi_url, options['username'], options['password'])
+        self.headers = {'Authorization': f'Token {token}', 'Accept': 'application/json'}
+
+        endpoints = self.get_endpoints(wsgi_url)
+        targets = [('wsgi', f'{wsgi_url}/api'), ('asgi', f'{asgi_url}/api/async')]
+
+        self.stdout.write(f'{"endpoint":<12}{"server":<6}{"conc":>6}{"req/s":>10}'
+                          f'{"p50 ms":>10}{"p95 ms":>10}{"errors":>8}')
+        for name, path in endpoints:
+            for concurrency in options['concurrency']:
+                for server, base in targets:
+                    result = self.run(f'{base}{path}', concurrency, options['requests'])
+                    self.stdout.write(
+                        f'{name:<12}{server:<6}{concurrency:>6}{result["throughput"]:>10.1f}'
+                        f'{result["p50"]:>10.1f}{result["p95"]:>10.1f}{result["errors"]:>8}'
+                    )
+
+    def login(self, base_url, username, password):
+        if not username:
+            raise CommandError('Pass --token, or --username and --password.')
+        body = parse.urlencode({'username': username, 'password': password}).encode()
+        status, content = self.fetch(f'{base_url}/api/login/', data=body, headers={})
+        if status != 200:
+            raise CommandError(f'Login failed with status {status}.')
+        return json.loads(content)['token']
+
+    def get_endpoints(self, base_url):
+        status, content = self.fetch(f'{base_url}/api/employee/?page_size=1')
+        if status != 200:
+            raise CommandError(f'{base_url} answered {status}; is the server running?')
+        results = json.loads(content)['results']
+        if not results:
+            raise CommandError('No employees to benchmark against; seed some data first.')
+        employee = results[0]
+        term = parse.quote(employee['name'].split()[0])
+        return [
+            ('list', '/employee/'),
+            ('filter', f'/employee/?status={employee["status"]["id"]}'),
+            ('search', f'/employee/?search={term}'),
+            ('retrieve', f'/employee/{employee["id"]}/'),
+            ('lookups', '/department/'),
+        ]
+
+    def fetch(self, url, data=None, headers=None):
+        req = request.Request(url, data=data, headers=self.headers if headers is None else headers)
+        try:
+            with request.urlopen(req, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except HTTPError as exc:
+            return exc.code, exc.read()
+        except (URLError, OSError) as exc:
+            return None, str(exc).encode()
+
+    def timed_fetch(self, url):
+        started = time.perf_counter()
+        status, _ = self.fetch(url)
+        return status, (time.perf_counter() - started) * 1000
+
+    def run(self, url, concurrency, count):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(self.timed_fetch, [url] * count))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for status, latency in results if status == 200)
+        errors = count - len(latencies)
+        if len(latencies) >= 2:
+            cuts = statistics.quantiles(latencies, n=100)
+            p50, p95 = cuts[49], cuts[94]
+        else:
+            p50 = p95 = latencies[0] if latencies else float('nan')
+        return {'throughput': len(latencies) / elapsed, 'p50': p50, 'p95': p95, 'errors': errors}
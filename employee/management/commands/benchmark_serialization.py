@@ -0,0 +1,100 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from employee.fastpath import compile_serializer
+from employee.mixins import optimize_queryset
+from employee.models import Employee
+from employee.renderers import FastJSONRenderer
+from employee.seeding import seed_database
+from employee.serializers import EmployeeSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare building and rendering employee list pages with EmployeeSerializer '
+        'and JSONRenderer against the values_list() fast path and FastJSONRenderer, '
+        'on a throwaway test database. Fails if the two outputs differ.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[50, 1000, 10000],
+                            help='Page sizes to serialize.')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Runs per measurement; the fastest is reported.')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1.')
+        setup_test_environment()
+        with override_settings(DATABASE_REPLICAS=[]):
+            old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+            try:
+                seed_database(max(options['rows']), seed=options['seed'])
+                self.run(options['rows'], options['repeat'])
+            finally:
+                teardown_databases(old_config, verbosity=0)
+                teardown_test_environment()
+
+    def run(self, sizes, repeat):
+        request = Request(RequestFactory().get('/api/employee/'))
+        context = {'request': request}
+        self.stdout.write(f'{"rows":>7} {"path":<6}{"fetch ms":>10}{"build ms":>10}'
+                          f'{"render ms":>11}{"total ms":>10}{"speedup":>9}')
+        for size in sizes:
+            serializer = EmployeeSerializer(context=context)
+            queryset = optimize_queryset(Employee.objects.order_by('id'), serializer)[:size]
+            plan = compile_serializer(serializer, Employee)
+            paths = {
+                'drf': (
+                    lambda: list(queryset.all()),
+                    lambda rows: EmployeeSerializer(rows, many=True, context=context).data,
+                    JSONRenderer().render,
+                ),
+                'fast': (
+                    lambda: list(queryset.values_list(*plan.paths)),
+                    lambda rows: [plan.build(row) for row in rows],
+                    FastJSONRenderer().render,
+                ),
+            }
+            results = {name: self.measure(steps, repeat) for name, steps in paths.items()}
+            if results['drf']['content'] != results['fast']['content']:
+                raise CommandError(f'The fast path output differs at {size} rows.')
+
+            for name, result in results.items():
+                speedup = results['drf']['total'] / result['total']
+                self.stdout.write(
+                    f'{size:>7} {name:<6}{result["fetch"]:>10.2f}{result["build"]:>10.2f}'
+                    f'{result["render"]:>11.2f}{result["total"]:>10.2f}{speedup:>8.1f}x'
+                )
+
+    def measure(self, steps, repeat):
+        """Run fetch, build and render ``repeat`` times and keep the fastest run."""
+        fetch, build, render = steps
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = fetch()
+            fetched = time.perf_counter()
+            data = build(rows)
+            built = time.perf_counter()
+            content = render(data)
+            rendered = time.perf_counter()
+            run = {
+                'fetch': (fetched - started) * 1000,
+                'build': (built - fetched) * 1000,
+                'render': (rendered - built) * 1000,
+                'total': (rendered - started) * 1000,
+                'content': content,
+            }
+            if best is None or run['total'] < best['total']:
+                best = run
+        return best
@@ -0,0 +1,53 @@
+import os
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+from django.db.migrations.executor import MigrationExecutor
+
+
+class Command(BaseCommand):
+    help = (
+        'Prepare the database on container start: apply migrations only when some are '
+        'pending and create the default user if it does not exist.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--skip-user', action='store_true',
+            help='Do not create the DJANGO_NORMAL_USERNAME user.',
+        )
+
+    def handle(self, *args, database, skip_user, **options):
+        started = time.monotonic()
+        # The applied migrations compared with the graph read from disk,
+        # instead of migrate's full pass with its post_migrate handlers.
+        executor = MigrationExecutor(connections[database])
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if plan:
+            self.stdout.write(f'Applying {len(plan)} migrations...')
+            call_command('migrate', database=database, interactive=False,
+                         verbosity=options['verbosity'])
+        else:
+            self.stdout.write('No migrations to apply.')
+
+        username = os.environ.get('DJANGO_NORMAL_USERNAME')
+        if username and not skip_user:
+            self.stdout.write(self.ensure_user(database, username, os.environ.get('DJANGO_NORMAL_PASSWORD')))
+        self.stdout.write(f'Bootstrap finished in {time.monotonic() - started:.2f}s.')
+
+    def ensure_user(self, database, username, password):
+        User = get_user_model()
+        users = User.objects.db_manager(database)
+        if users.filter(username=username).exists():
+            return f'User {username} already exists.'
+        try:
+            # Another container starting at the same time may win the race.
+            with transaction.atomic(using=database):
+                users.create_user(username=username, password=password, email='user@example.com')
+        except IntegrityError:
+            return f'User {username} already exists.'
+        return f'Created user {username}.'
@@ -0,0 +1,238 @@
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from employee.models import Department, Employee, ImportCheckpoint, Position, Status
+from employee.signals import post_bulk_save
+
+LOOKUPS = {'status': Status, 'position': Position, 'department': Department}
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+FALSE_VALUES = {'', '0', 'false', 'no', 'n', 'f'}
+
+
+class RowError(Exception):
+    pass
+
+
+class LookupCache:
+    """
+    Map names of one lookup model to ids, querying only names not seen
+    before. Names that appear more than once resolve to the lowest id.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.ids = {}
+        self.missing = set()
+
+    def load(self, names):
+        names = set(names) - self.ids.keys() - self.missing
+        if not names:
+            return
+        found = self.model.objects.filter(name__in=names).order_by('-id').values_list('name', 'id')
+        self.ids.update(found)
+        self.missing |= names - self.ids.keys()
+
+    def create(self, name, **fields):
+        self.ids[name] = self.model.objects.create(name=name, **fields).id
+        self.missing.discard(name)
+        return self.ids[name]
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream employees from a CSV or JSON Lines file (or - for stdin) into the '
+        'database in batches. Columns: name, address, status, position, department, '
+        'is_manager and, for positions created with --create-missing, salary.'
+    )
+    stealth_options = ('stdin',)
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='Path of the file to import, or - for stdin.')
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='Input format; guessed from the file extension by default.')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows inserted per bulk_create and transaction.')
+        parser.add_argument('--create-missing', action='store_true',
+                            help='Create statuses, positions and departments that do not exist.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Validate and resolve every row without writing anything.')
+        parser.add_argument('--checkpoint',
+                            help='Name under which the database records how many input rows are '
+                                 'committed. An existing checkpoint is resumed by skipping that '
+                                 'many rows.')
+        parser.add_argument('--progress-every', type=float, default=5,
+                            help='Seconds between progress reports.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+        self.create_missing = options['create_missing']
+        self.dry_run = options['dry_run']
+        self.lookups = {field: LookupCache(model) for field, model in LOOKUPS.items()}
+        self.would_create = {field: set() for field in LOOKUPS}
+
+        skip = self.read_checkpoint(options['checkpoint'])
+        stream, close = self.open_source(options['source'], options.get('stdin'))
+        try:
+            rows = self.parse(stream, self.get_format(options))
+            self.run(itertools.islice(rows, skip, None), skip, options)
+        finally:
+            if close:
+                stream.close()
+
+    def run(self, rows, skip, options):
+        imported = errors = 0
+        position = skip
+        started = last_report = time.monotonic()
+        while True:
+            chunk = list(itertools.islice(rows, options['batch_size']))
+            if not chunk:
+                break
+            position = chunk[-1][0]
+            if self.dry_run:
+                instances, chunk_errors = self.build(chunk)
+            else:
+                # Lookups created for the chunk and the checkpoint commit
+                # together with it, so a resumed import never repeats rows.
+                with transaction.atomic():
+                    instances, chunk_errors = self.build(chunk)
+                    Employee.objects.bulk_create(instances)
+                    post_bulk_save.send(sender=Employee, instances=instances, created=True)
+                    self.write_checkpoint(options['checkpoint'], position)
+            for line, message in chunk_errors:
+                self.stderr.write(f'Row {line}: {message}')
+            errors += len(chunk_errors)
+            imported += len(instances)
+
+            now = time.monotonic()
+            if now - last_report >= options['progress_every']:
+                self.report(imported, errors, now - started, position)
+                last_report = now
+
+        self.report(imported, errors, time.monotonic() - started, position)
+        if self.dry_run:
+            for field, names in self.would_create.items():
+                if names:
+                    self.stdout.write(f'Would create {len(names)} {field} rows: '
+                                      f'{", ".join(sorted(names))}')
+            self.stdout.write('Dry run, nothing was written.')
+
+    def report(self, imported, errors, elapsed, position):
+        rate = imported / elapsed if elapsed else 0
+        verb = 'validated' if self.dry_run else 'imported'
+        self.stdout.write(
+            f'{imported} rows {verb}, {errors} skipped, {rate:.0f} rows/s '
+            f'(input row {position})'
+        )
+
+    def build(self, chunk):
+        """Validate ``[(line, row), ...]`` and return the new instances and per-row errors."""
+        for field, cache in self.lookups.items():
+            cache.load(filter(None, (
+                self.get_value(row, field) for _, row in chunk if isinstance(row, dict)
+            )))
+
+        instances, errors = [], []
+        for line, row in chunk:
+            try:
+                instances.append(self.build_instance(row))
+            except RowError as exc:
+                errors.append((line, str(exc)))
+        return instances, errors
+
+    def get_value(self, row, field):
+        value = row.get(field)
+        return '' if value is None else str(value).strip()
+
+    def build_instance(self, row):
+        if isinstance(row, str):
+            raise RowError(row)
+        if not isinstance(row, dict):
+            raise RowError('expected an object')
+        values = {}
+        for name in ('name', 'address'):
+            try:
+                values[name] = Employee._meta.get_field(name).clean(self.get_value(row, name), None)
+            except ValidationError as exc:
+                raise RowError(f'{name}: {" ".join(exc.messages)}')
+
+        is_manager = self.get_value(row, 'is_manager').lower()
+        if is_manager not in TRUE_VALUES | FALSE_VALUES:
+            raise RowError(f'is_manager: {row["is_manager"]!r} is not a boolean')
+        values['is_manager'] = is_manager in TRUE_VALUES
+
+        for field, cache in self.lookups.items():
+            values[f'{field}_id'] = self.resolve(field, cache, row)
+        return Employee(**values)
+
+    def resolve(self, field, cache, row):
+        name = self.get_value(row, field)
+        if not name:
+            return None
+        if name in cache.ids:
+            return cache.ids[name]
+        if not self.create_missing:
+            raise RowError(f'{field}: {name!r} does not exist')
+
+        extra = {}
+        if field == 'position':
+            try:
+                extra['salary'] = Position._meta.get_field('salary').clean(row.get('salary'), None)
+            except ValidationError:
+                raise RowError(f'salary: a valid salary is needed to create position {name!r}')
+        if self.dry_run:
+            self.would_create[field].add(name)
+            return None
+        return cache.create(name, **extra)
+
+    def get_format(self, options):
+        if options['format']:
+            return options['format']
+        extension = os.path.splitext(options['source'])[1].lower()
+        return 'jsonl' if extension in ('.jsonl', '.ndjson') else 'csv'
+
+    def open_source(self, source, stdin=None):
+        if source == '-':
+            return stdin or io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig'), False
+        try:
+            return open(source, encoding='utf-8-sig', newline=''), True
+        except OSError as exc:
+            raise CommandError(f'Cannot read {source}: {exc}')
+
+    def parse(self, stream, input_format):
+        """Yield ``(line, row)`` pairs; rows that cannot be parsed become strings."""
+        if input_format == 'csv':
+            reader = csv.DictReader(stream)
+            for index, row in enumerate(reader, 1):
+                yield index, row
+            return
+        for index, line in enumerate(stream, 1):
+            if not line.strip():
+                yield index, 'empty line'
+                continue
+            try:
+                yield index, json.loads(line)
+            except ValueError:
+                yield index, 'invalid JSON'
+
+    def read_checkpoint(self, name):
+        if not name:
+            return 0
+        skip = ImportCheckpoint.objects.filter(name=name).values_list('position', flat=True).first()
+        if not skip:
+            return 0
+        self.stdout.write(f'Resuming after input row {skip}.')
+        return skip
+
+    def write_checkpoint(self, name, position):
+        if name:
+            ImportCheckpoint.objects.update_or_create(name=name, defaults={'position': position})
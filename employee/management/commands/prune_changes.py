@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employee import changes
+
+
+class Command(BaseCommand):
+    help = 'Delete change feed entries older than the retention period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.CHANGE_LOG_RETENTION_DAYS,
+            help='Keep the entries of this many days (default: CHANGE_LOG_RETENTION_DAYS).',
+        )
+
+    def handle(self, *args, days, **options):
+        if days < 0:
+            raise CommandError('--days must not be negative.')
+        deleted = changes.prune(timezone.now() - timedelta(days=days))
+        self.stdout.write(f'Deleted {deleted} change feed entries.')
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from employee import summary
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the payroll summary table from the employee rows and verify it.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only compare the summary with the employee rows and fail if they differ.',
+        )
+
+    def handle(self, *args, check=False, **options):
+        if not check:
+            count = summary.rebuild_summary()
+            self.stdout.write(f'Rebuilt {count} payroll summary rows.')
+
+        mismatches = summary.verify_summary()
+        for (dimension, key), (stored, expected) in sorted(mismatches.items()):
+            self.stderr.write(
+                f'{dimension} {key}: stored headcount/salaried/total {stored}, expected {expected}'
+            )
+        if mismatches:
+            raise CommandError(f'{len(mismatches)} payroll summary rows are out of date.')
+        self.stdout.write(self.style.SUCCESS('Payroll summary is up to date.'))
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import logging
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+
+from .cache import get_cache, is_shared
+from .instrumentation import Recorder, current_recorder
+from .routers import get_replicas, use_replica
+
+logger = logging.getLogger('employee.performance')
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe-method requests read from the replicas, except for clients
+    that wrote within the last ``DATABASE_REPLICA_PIN_SECONDS``: those keep
+    reading from the primary so they see their own changes before the
+    replicas catch up.
+
+    A write sets a short-lived signed cookie, which pins the client
+    whichever worker answers next. With a shared cache, the client's
+    Authorization header is pinned there too, for API clients that do
+    not keep cookies.
+    """
+    sync_capable = True
+    async_capable = True
+    pin_cookie = 'replica_pin'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not get_replicas():
+            return self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+        pin_key = self.get_pin_key(request)
+        pinned = self.has_pin_cookie(request) or (pin_key is not None and get_cache().get(pin_key))
+        token = use_replica.set(safe and not pinned)
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica.reset(token)
+
+        if not safe:
+            self.set_pin_cookie(request, response)
+            if pin_key is not None:
+                get_cache().set(pin_key, True, self.get_pin_seconds())
+        return response
+
+    async def __acall__(self, request):
+        if not get_replicas():
+            return await self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+        pin_key = self.get_pin_key(request)
+        pinned = self.has_pin_cookie(request) or (
+            pin_key is not None and await get_cache().aget(pin_key)
+        )
+        token = use_replica.set(safe and not pinned)
+        try:
+            response = await self.get_response(request)
+        finally:
+            use_replica.reset(token)
+
+        if not safe:
+            self.set_pin_cookie(request, response)
+            if pin_key is not None:
+                await get_cache().aset(pin_key, True, self.get_pin_seconds())
+        return response
+
+    def get_pin_seconds(self):
+        return getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 5)
+
+    def get_pin_key(self, request):
+        # A local-memory cache would only pin the client on this worker.
+        authorization = request.headers.get('Authorization')
+        if not authorization or not is_shared():
+            return None
+        return f'replica:pin:{hashlib.sha1(authorization.encode()).hexdigest()}'
+
+    def has_pin_cookie(self, request):
+        value = request.COOKIES.get(self.pin_cookie)
+        if not value:
+            return False
+        try:
+            signing.TimestampSigner(salt=self.pin_cookie).unsign(value, max_age=self.get_pin_seconds())
+        except signing.BadSignature:
+            return False
+        return True
+
+    def set_pin_cookie(self, request, response):
+        response.set_cookie(
+            self.pin_cookie, signing.TimestampSigner(salt=self.pin_cookie).sign('1'),
+            max_age=max(self.get_pin_seconds(), 0), secure=request.is_secure(),
+            httponly=True, samesite='Lax',
+        )
+
+
+class PerformanceMiddleware:
+    """
+    Time a ``PERF_SAMPLE_RATE`` fraction of requests: SQL count and time,
+    the ``auth``/``queryset``/``serializer`` phases of instrumented views,
+    rendering and the response size. Each sampled request gets a
+    ``Server-Timing`` header (unless ``PERF_SERVER_TIMING`` is off) and a
+    JSON log line on the ``employee.performance`` logger; requests slower
+    than ``PERF_SLOW_REQUEST_MS`` are logged as warnings with their slowest
+    SQL statements. With sampling off the middleware removes itself.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = getattr(settings, 'PERF_SAMPLE_RATE', 0)
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.slow_ms = getattr(settings, 'PERF_SLOW_REQUEST_MS', 500)
+        self.slow_sql_limit = getattr(settings, 'PERF_SLOW_SQL_LIMIT', 10)
+        self.server_timing = getattr(settings, 'PERF_SERVER_TIMING', True)
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        with Recorder().activate() as recorder:
+            response = self.get_response(request)
+        self.finish(request, response, recorder)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        async with Recorder().aactivate() as recorder:
+            response = await self.get_response(request)
+        self.finish(request, response, recorder)
+        return response
+
+    def process_template_response(self, request, response):
+        recorder = current_recorder.get()
+        if recorder is not None:
+            recorder.enter()
+            response.add_post_render_callback(lambda rendered: recorder.exit('render'))
+        return response
+
+    def finish(self, request, response, recorder):
+        total = recorder.elapsed()
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_queries': len(recorder.queries),
+            'db_ms': round(recorder.db_time * 1000, 2),
+            'phases_ms': {name: round(seconds * 1000, 2) for name, seconds in recorder.phases.items()},
+            'response_bytes': None if response.streaming else len(response.content),
+        }
+        if self.server_timing:
+            metrics = [f'db;dur={record["db_ms"]};desc="{record["db_queries"]} queries"']
+            metrics += [f'{name};dur={ms}' for name, ms in record['phases_ms'].items()]
+            metrics.append(f'total;dur={record["total_ms"]}')
+            response['Server-Timing'] = ', '.join(metrics)
+
+        if record['total_ms'] >= self.slow_ms:
+            slowest = sorted(recorder.queries, key=lambda query: query[0], reverse=True)
+            record['slow_sql'] = [
+                {'ms': round(elapsed * 1000, 2), 'sql': sql}
+                for elapsed, sql in slowest[:self.slow_sql_limit]
+            ]
+            logger.warning('Slow request %s', json.dumps(record))
+        else:
+            logger.info('Request %s', json.dumps(record))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:58
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_summary(apps, schema_editor):
+    Employee = apps.get_model('employee', 'Employee')
+    PayrollSummary = apps.get_model('employee', 'PayrollSummary')
+    db_alias = schema_editor.connection.alias
+    rows = []
+    for dimension in ('department', 'status'):
+        totals = (
+            Employee.objects.using(db_alias).values_list(f'{dimension}_id')
+            .annotate(Count('pk'), Count('position'), Sum('position__salary')).order_by()
+        )
+        for key, headcount, salaried, total in totals:
+            rows.append(PayrollSummary(
+                dimension=dimension, key=key or 0, headcount=headcount,
+                salaried_headcount=salaried, salary_total=total or 0,
+            ))
+    PayrollSummary.objects.using(db_alias).bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0003_employee_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('department', 'Department'), ('status', 'Status')], max_length=20)),
+                ('key', models.BigIntegerField()),
+                ('headcount', models.IntegerField(default=0)),
+                ('salaried_headcount', models.IntegerField(default=0)),
+                ('salary_total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key'), name='payroll_summary_unique')],
+            },
+        ),
+        migrations.RunPython(populate_summary, migrations.RunPython.noop),
+    ]
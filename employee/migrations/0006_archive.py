@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0005_changelog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeRecord',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('address', models.TextField()),
+                ('is_manager', models.BooleanField(default=False)),
+                ('image', models.ImageField(blank=True, null=True, upload_to='employee_images/')),
+                ('image_variants', models.JSONField(blank=True, default=dict, editable=False)),
+            ],
+            options={
+                'db_table': 'employee_employeerecord',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedEmployee',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('address', models.TextField()),
+                ('is_manager', models.BooleanField(default=False)),
+                ('image', models.ImageField(blank=True, null=True, upload_to='employee_images/')),
+                ('image_variants', models.JSONField(blank=True, default=dict, editable=False)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='employee.department')),
+                ('position', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='employee.position')),
+                ('status', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='employee.status')),
+            ],
+        ),
+    ]
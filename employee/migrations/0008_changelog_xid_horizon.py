@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0007_cacheversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changelog',
+            name='xid_horizon',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
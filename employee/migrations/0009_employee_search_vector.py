@@ -0,0 +1,58 @@
+from django.db import migrations
+
+TABLE = 'employee_employee'
+# Searchable columns with their tsvector weights.
+COLUMNS = (('name', 'A'), ('address', 'B'))
+
+
+def create_search_vector(apps, schema_editor):
+    """
+    Add the ``search_vector`` tsvector column, kept current by a trigger and
+    indexed with GIN. PostgreSQL only: SQLite uses the FTS5 table installed
+    by ``employee.search``.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    vector = ' || '.join(
+        f"setweight(to_tsvector('simple', coalesce(NEW.{column}, '')), '{weight}')"
+        for column, weight in COLUMNS
+    )
+    schema_editor.execute(f'ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector')
+    schema_editor.execute(f"""
+        CREATE OR REPLACE FUNCTION {TABLE}_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {vector};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    schema_editor.execute(f'DROP TRIGGER IF EXISTS {TABLE}_search_vector ON {TABLE}')
+    schema_editor.execute(f"""
+        CREATE TRIGGER {TABLE}_search_vector
+        BEFORE INSERT OR UPDATE OF {', '.join(column for column, _ in COLUMNS)}
+        ON {TABLE} FOR EACH ROW EXECUTE FUNCTION {TABLE}_search_vector_update()
+    """)
+    # Fill the column for the existing rows through the trigger.
+    schema_editor.execute(f'UPDATE {TABLE} SET name = name WHERE search_vector IS NULL')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {TABLE}_search_vector_gin ON {TABLE} USING gin (search_vector)'
+    )
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP TRIGGER IF EXISTS {TABLE}_search_vector ON {TABLE}')
+    schema_editor.execute(f'DROP FUNCTION IF EXISTS {TABLE}_search_vector_update()')
+    schema_editor.execute(f'ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0008_changelog_xid_horizon'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_vector, drop_search_vector),
+    ]
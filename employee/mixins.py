@@ -0,0 +1,128 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def get_related_lookups(serializer, model, prefix=''):
+    """
+    Return the ``select_related`` paths and ``Prefetch`` objects needed to
+    render ``serializer`` for instances of ``model`` without extra queries.
+    """
+    select_related = []
+    prefetch_related = []
+
+    for field in serializer.fields.values():
+        if field.write_only or not field.source_attrs:
+            continue
+
+        current_model = model
+        path = []
+        relation = None
+        for attr in field.source_attrs:
+            try:
+                relation = current_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                relation = None
+                break
+            if not relation.is_relation:
+                relation = None
+                break
+            path.append(attr)
+            if relation.many_to_many or relation.one_to_many:
+                break
+            current_model = relation.related_model
+
+        if relation is None:
+            # The source ended on a concrete column or a model attribute
+            # that is not a relation, only the intermediate joins matter.
+            if path:
+                select_related.append(prefix + '__'.join(path))
+            continue
+
+        lookup = prefix + '__'.join(path)
+        related_model = relation.related_model
+
+        if relation.many_to_many or relation.one_to_many:
+            child = getattr(field, 'child', None) or getattr(field, 'child_relation', None)
+            queryset = related_model._default_manager.all()
+            if isinstance(child, serializers.BaseSerializer):
+                queryset = optimize_queryset(queryset, child)
+            prefetch_related.append(Prefetch(lookup, queryset=queryset))
+        elif isinstance(field, serializers.BaseSerializer):
+            select_related.append(lookup)
+            nested_select, nested_prefetch = get_related_lookups(
+                field, related_model, prefix=lookup + '__'
+            )
+            select_related.extend(nested_select)
+            prefetch_related.extend(nested_prefetch)
+        elif not (isinstance(field, serializers.RelatedField) and field.use_pk_only_optimization()):
+            # Related fields that only render the primary key read the
+            # ``<name>_id`` column directly, anything else needs the row.
+            select_related.append(lookup)
+
+    return select_related, prefetch_related
+
+
+def optimize_queryset(queryset, serializer):
+    """
+    Join or prefetch the relations ``serializer`` will render.
+    """
+    select_related, prefetch_related = get_related_lookups(serializer, queryset.model)
+    if select_related:
+        queryset = queryset.select_related(*dict.fromkeys(select_related))
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    return queryset
+
+
+def get_selected_columns(serializer, model):
+    """
+    Return the columns of ``model`` that ``serializer`` reads, or ``None``
+    when a field reads something other than a model field, such as the
+    whole instance or a property, and every column may be needed.
+    """
+    columns = [model._meta.pk.name]
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if not field.source_attrs:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if model_field.many_to_many or model_field.one_to_many:
+            continue
+        if not model_field.concrete:
+            return None
+        columns.append(model_field.name)
+    return columns
+
+
+class EagerLoadingMixin:
+    """
+    Build the viewset queryset from what the serializer will render so that
+    list and detail responses run a fixed number of queries. Reads with
+    ``?fields=``/``?expand=`` also load only the columns they render.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer = self.get_serializer()
+        queryset = optimize_queryset(queryset, serializer)
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            # Writes go through save() and the signal receivers, which
+            # expect fully loaded instances.
+            return queryset
+        if getattr(serializer, 'is_sparse', False):
+            columns = get_selected_columns(serializer, queryset.model)
+            if columns is not None:
+                # Ordering fields stay loaded for the pagination cursors.
+                columns += [
+                    name for name in getattr(self, 'ordering_fields', None) or ()
+                    if name in {field.name for field in queryset.model._meta.concrete_fields}
+                ]
+                queryset = queryset.only(*dict.fromkeys(columns))
+        return queryset
@@ -1,27 +1,77 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
+
+
+class LoadedValuesMixin:
+    """
+    Keep the column values an instance was loaded with in
+    ``_loaded_values`` so signal receivers can tell what a save changed.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values)
+            if value is not models.DEFERRED
+        }
+        return instance
+
 
 class Status(models.Model):
     name = models.CharField(max_length=100) 
     def __str__(self):
         return self.name
 
-class Position(models.Model):
+class Position(LoadedValuesMixin, models.Model):
     name = models.CharField(max_length=100)
-    salary = models.DecimalField(max_digits=10, decimal_places=2)
+    salary = models.DecimalField(max_digits=10, decimal_places=2, db_index=True)
     def __str__(self):
         return self.name
 
-class Employee(models.Model):
+    def save(self, *args, **kwargs):
+        # employee.signals locks the row in pre_save to read the salary the
+        # payroll summary delta starts from; nothing may commit in between.
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+class Employee(LoadedValuesMixin, models.Model):
     name = models.CharField(max_length=100)
     address = models.TextField()
     position = models.ForeignKey(Position, on_delete=models.SET_NULL, null=True, blank=True)
     is_manager = models.BooleanField(default=False) 
-    status = models.ForeignKey(Status, on_delete=models.SET_NULL, null=True)
-    department = models.ForeignKey('Department', on_delete=models.SET_NULL, null=True, blank=True)
+    # status and department are covered by the composite indexes below.
+    status = models.ForeignKey(Status, on_delete=models.SET_NULL, null=True, db_index=False)
+    department = models.ForeignKey('Department', on_delete=models.SET_NULL, null=True, blank=True,
+                                   db_index=False)
     image = models.ImageField(upload_to='employee_images/', null=True, blank=True)
+    # Storage names of the resized variants, {variant: {format: name}},
+    # filled in by employee.images once an upload has been processed.
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Each filter shape keeps ``id`` last so keyset pages come
+            # straight off the index without a sort.
+            models.Index(fields=['status', 'id'], name='employee_status_idx'),
+            models.Index(fields=['department', 'id'], name='employee_department_idx'),
+            models.Index(fields=['department', 'status', 'id'], name='employee_dept_status_idx'),
+            models.Index(fields=['name', 'id'], name='employee_name_idx'),
+            models.Index(fields=['id'], condition=models.Q(is_manager=True),
+                         name='employee_manager_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # employee.signals locks the row in pre_save to read the state the
+        # payroll summary deltas start from; nothing may commit in between.
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
 
 class Department(models.Model):
     name = models.CharField(max_length=100)
@@ -30,3 +80,134 @@ class Department(models.Model):
     def __str__(self):
         return self.name
 
+
+
+class ArchivedEmployee(models.Model):
+    """
+    Employees moved out of ``Employee`` by ``employee.archive`` once their
+    status is one of ``EMPLOYEE_ARCHIVE_STATUSES``, under their original id
+    so they can be restored.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    address = models.TextField()
+    position = models.ForeignKey(Position, on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='+')
+    is_manager = models.BooleanField(default=False)
+    status = models.ForeignKey(Status, on_delete=models.SET_NULL, null=True, related_name='+')
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True,
+                                   related_name='+')
+    image = models.ImageField(upload_to='employee_images/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.name
+
+
+class EmployeeRecord(models.Model):
+    """
+    Read-only view over ``Employee`` and ``ArchivedEmployee``, created by
+    ``employee.archive.install_archive_view``. Serves ``?include_archived=``.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    address = models.TextField()
+    position = models.ForeignKey(Position, on_delete=models.DO_NOTHING, null=True,
+                                 db_constraint=False, related_name='+')
+    is_manager = models.BooleanField(default=False)
+    status = models.ForeignKey(Status, on_delete=models.DO_NOTHING, null=True,
+                               db_constraint=False, related_name='+')
+    department = models.ForeignKey(Department, on_delete=models.DO_NOTHING, null=True,
+                                   db_constraint=False, related_name='+')
+    image = models.ImageField(upload_to='employee_images/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        managed = False
+        db_table = 'employee_employeerecord'
+
+    def __str__(self):
+        return self.name
+
+
+class PayrollSummary(models.Model):
+    """
+    Headcount and salary totals per department and per status, kept up to
+    date by ``employee.summary`` as employees and positions change.
+    ``key`` is the department or status id, or 0 for employees without one.
+    """
+    DEPARTMENT = 'department'
+    STATUS = 'status'
+    DIMENSION_CHOICES = [(DEPARTMENT, 'Department'), (STATUS, 'Status')]
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    key = models.BigIntegerField()
+    headcount = models.IntegerField(default=0)
+    # Employees with a position, the divisor of the average salary.
+    salaried_headcount = models.IntegerField(default=0)
+    salary_total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key'], name='payroll_summary_unique'),
+        ]
+
+    def __str__(self):
+        return f'{self.dimension} {self.key}'
+
+
+class CacheVersion(models.Model):
+    """
+    Version of a model's cached responses, bumped by ``employee.cache``
+    when the cache is local to each process, so every worker sees writes
+    made by the others.
+    """
+    key = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f'{self.key} {self.version}'
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Input rows committed by ``import_employees --checkpoint <name>``,
+    written in the same transaction as each batch.
+    """
+    name = models.CharField(max_length=255, primary_key=True)
+    position = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.name} {self.position}'
+
+
+class ChangeLog(models.Model):
+    """
+    One row per create, update or delete of a synced model, written by
+    ``employee.changes``. The ids are increasing and serve as the cursors
+    of the ``/api/changes/`` feed.
+    """
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ACTION_CHOICES = [(CREATE, 'Create'), (UPDATE, 'Update'), (DELETE, 'Delete')]
+
+    # The model name, e.g. ``employee``.
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+    # On PostgreSQL, the first transaction id not yet handed out when the
+    # entry was logged.
+    xid_horizon = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'id'], name='changelog_model_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.action} {self.model} {self.object_id}'
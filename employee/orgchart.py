@@ -0,0 +1,101 @@
+from django.conf import settings
+
+from . import cache
+from .models import Department, Employee
+
+
+def build_chart():
+    """
+    Load every department with its manager in one query and link each
+    department under the department its manager belongs to.
+
+    Returns ``{'nodes', 'children', 'roots', 'cycles'}``. A department whose
+    manager belongs to it, or to no department, is a root. Each cycle is
+    reported as a list of ids and broken at its lowest id, which becomes a
+    root, so every department appears in the chart exactly once.
+    """
+    rows = Department.objects.order_by('name', 'id').values_list(
+        'id', 'name', 'manager_id', 'manager__name', 'manager__department_id'
+    )
+    nodes, parents = {}, {}
+    for department_id, name, manager_id, manager_name, parent_id in rows:
+        nodes[department_id] = {
+            'id': department_id,
+            'name': name,
+            'manager': {'id': manager_id, 'name': manager_name} if manager_id else None,
+        }
+        parents[department_id] = parent_id if parent_id != department_id else None
+
+    parents = {
+        department_id: parent_id if parent_id in nodes else None
+        for department_id, parent_id in parents.items()
+    }
+    cycles = find_cycles(parents)
+    for cycle in cycles:
+        parents[cycle[0]] = None
+
+    children = {}
+    for department_id in nodes:
+        parent_id = parents[department_id]
+        if parent_id is not None:
+            children.setdefault(parent_id, []).append(department_id)
+    roots = [department_id for department_id in nodes if parents[department_id] is None]
+    return {'nodes': nodes, 'children': children, 'roots': roots, 'cycles': cycles}
+
+
+def find_cycles(parents):
+    """
+    Return the cycles in the ``{node: parent}`` graph, each as the list of
+    nodes met following parents from its lowest node.
+    """
+    state, cycles = {}, []
+    for start in parents:
+        path, node = [], start
+        while node is not None and node not in state:
+            state[node] = start
+            path.append(node)
+            node = parents[node]
+        if node is not None and state[node] == start:
+            cycle = path[path.index(node):]
+            lowest = cycle.index(min(cycle))
+            cycles.append(cycle[lowest:] + cycle[:lowest])
+    return sorted(cycles)
+
+
+def get_chart():
+    """
+    Return the chart from the cache, building it on a miss. The key follows
+    the department and employee versions bumped by ``employee.signals``.
+    """
+    (department_version, _), (employee_version, _) = cache.get_versions(Department, Employee)
+    key = f'orgchart:{department_version}:{employee_version}'
+    chart = cache.get_cache().get(key)
+    if chart is None:
+        chart = build_chart()
+        cache.get_cache().set(key, chart, getattr(settings, 'LOOKUP_CACHE_TIMEOUT', 3600))
+    return chart
+
+
+def render_tree(chart, roots, depth=None):
+    """
+    Return nested ``{'id', 'name', 'manager', 'child_count', 'children'}``
+    nodes for ``roots``, descending at most ``depth`` levels.
+    """
+    def make_node(department_id):
+        return {
+            **chart['nodes'][department_id],
+            'child_count': len(chart['children'].get(department_id, ())),
+            'children': [],
+        }
+
+    tree = [make_node(department_id) for department_id in roots]
+    stack = [(node, 0) for node in tree]
+    while stack:
+        node, level = stack.pop()
+        if depth is not None and level >= depth:
+            continue
+        for child_id in chart['children'].get(node['id'], ()):
+            child = make_node(child_id)
+            node['children'].append(child)
+            stack.append((child, level + 1))
+    return tree
@@ -0,0 +1,208 @@
+import json
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a composite, always unique ordering.
+
+    The cursor stores the ordering values of the last row served and the
+    next page is fetched with a ``WHERE (a, id) > (x, y)`` style filter, so
+    deep pages cost the same as the first one. Clients may order by any of
+    the view's ``ordering_fields``; ``id`` is always appended as tiebreaker.
+    Pages may hold instances, dicts or ``values_list()`` tuples laid out as
+    ``row_fields``.
+    """
+    ordering = ('id',)
+    ordering_param = 'ordering'
+    tiebreaker = 'id'
+    page_size_query_param = 'page_size'
+    row_fields = None
+
+    @property
+    def max_page_size(self):
+        return getattr(settings, 'API_MAX_PAGE_SIZE', 1000)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.build_page(list(queryset))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Return the unevaluated queryset for the requested page, including
+        one extra row to tell whether a following page exists.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        self.cursor = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if self.cursor is not None and self.cursor.reverse:
+            ordering = tuple(_reverse(field) for field in ordering)
+
+        queryset = queryset.order_by(*(self._order_expression(field) for field in ordering))
+        if self.cursor is not None:
+            queryset = queryset.filter(self._keyset_filter(ordering, self.cursor.position))
+        return queryset[:self.page_size + 1]
+
+    def build_page(self, results):
+        reverse = self.cursor is not None and self.cursor.reverse
+        has_following = len(results) > self.page_size
+        self.page = list(results[:self.page_size])
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        for backend in getattr(view, 'filter_backends', []):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    return self._with_tiebreaker(ordering)
+
+        allowed = getattr(view, 'ordering_fields', None) or ()
+        requested = request.query_params.get(self.ordering_param, '')
+        ordering = [
+            field for field in (term.strip() for term in requested.split(','))
+            if field and field.lstrip('-') in allowed
+        ]
+        return self._with_tiebreaker(ordering or self.ordering)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+            position = json.loads(tokens['p'][0])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {'p': json.dumps(cursor.position, separators=(',', ':'), default=str)}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for field in ordering:
+            name = field.lstrip('-')
+            if isinstance(instance, dict):
+                value = instance[name]
+            elif isinstance(instance, tuple):
+                value = instance[self.row_fields.index(name)]
+            else:
+                value = getattr(instance, self._attname(name))
+            if value is not None and not isinstance(value, (int, float, str, bool)):
+                value = str(value)
+            position.append(value)
+        return position
+
+    def _with_tiebreaker(self, ordering):
+        ordering = tuple(ordering)
+        if self.tiebreaker not in (field.lstrip('-') for field in ordering):
+            ordering += (self.tiebreaker,)
+        return ordering
+
+    def _attname(self, name):
+        try:
+            return self.model._meta.get_field(name).attname
+        except FieldDoesNotExist:
+            return name
+
+    def _nullable(self, name):
+        try:
+            return self.model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return False
+
+    def _order_expression(self, field):
+        name = field.lstrip('-')
+        if not self._nullable(name):
+            return field
+        # Pin NULL placement so the keyset filter below agrees with the
+        # ordering on every backend: last when ascending, first when
+        # descending, which is also PostgreSQL's own default.
+        if field.startswith('-'):
+            return F(name).desc(nulls_first=True)
+        return F(name).asc(nulls_last=True)
+
+    def _keyset_filter(self, ordering, position):
+        """
+        Build ``(a > x) OR (a = x AND b > y) OR ...`` for the given ordering.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            descending = field.startswith('-')
+            nullable = self._nullable(name)
+
+            if value is None:
+                after = Q(**{name + '__isnull': False}) if descending else Q(pk__in=[])
+                same = Q(**{name + '__isnull': True})
+            else:
+                after = Q(**{name + ('__lt' if descending else '__gt'): value})
+                if nullable and not descending:
+                    after |= Q(**{name + '__isnull': True})
+                same = Q(**{name: value})
+
+            condition |= equal & after
+            equal &= same
+        return condition
+
+
+def _reverse(field):
+    return field[1:] if field.startswith('-') else '-' + field
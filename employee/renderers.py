@@ -0,0 +1,123 @@
+import csv
+import json
+
+from rest_framework import serializers
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def flatten(row, prefix=''):
+    """
+    Flatten nested representations into ``{'status.name': ...}`` columns.
+    """
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{prefix}{key}.'))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def serializer_columns(serializer, prefix=''):
+    """
+    Return the flattened column names ``serializer`` renders, in order.
+    """
+    columns = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.Serializer):
+            columns.extend(serializer_columns(field, f'{prefix}{name}.'))
+        else:
+            columns.append(prefix + name)
+    return columns
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` encoding with orjson when it is installed. Compact
+    output is byte-for-byte what the stdlib encoder produces for the same
+    data without floats, whose exponent notation differs; indented output,
+    non-default JSON settings and anything orjson rejects (lone
+    surrogates, non-string keys, huge integers) go through the regular
+    renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            data is None or orjson is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=self.encoder_class().default)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped like the stdlib path so the output stays valid JavaScript.
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Renderer that can also emit a lazily evaluated sequence of rows, one
+    chunk per row, for use with ``StreamingHttpResponse``.
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self.render_stream(rows))
+
+    def render_stream(self, rows, columns=None):
+        raise NotImplementedError('.render_stream() must be implemented.')
+
+
+class NDJSONRenderer(StreamingRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render_stream(self, rows, columns=None):
+        for row in rows:
+            yield json.dumps(
+                row, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')
+            ).encode(self.charset) + b'\n'
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(StreamingRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def render_stream(self, rows, columns=None):
+        writer = csv.writer(_Echo())
+        rows = iter(rows)
+        if columns is None:
+            first = next(rows, None)
+            if first is None:
+                return
+            first = flatten(first)
+            columns = list(first)
+            yield writer.writerow(columns).encode(self.charset)
+            yield self._render_row(writer, columns, first)
+        else:
+            yield writer.writerow(columns).encode(self.charset)
+
+        for row in rows:
+            yield self._render_row(writer, columns, flatten(row))
+
+    def _render_row(self, writer, columns, row):
+        return writer.writerow([
+            '' if row.get(column) is None else row[column] for column in columns
+        ]).encode(self.charset)
@@ -0,0 +1,123 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Max, Q, Sum, Value
+from django.db.models.functions import Greatest, Round
+from rest_framework.exceptions import ValidationError
+
+from . import cache, changes, summary
+from .models import ChangeLog, Employee, PayrollSummary, Position
+
+SALARY = Position._meta.get_field('salary')
+# Large enough for the payroll totals, like PayrollSummary.salary_total.
+TOTAL = DecimalField(max_digits=16, decimal_places=2)
+HIGHEST_SALARY = Decimal(10) ** (SALARY.max_digits - SALARY.decimal_places) - Decimal('0.01')
+
+
+def new_salary(salary, percent=None, amount=None):
+    """
+    Expression for ``salary`` raised by ``percent`` or by the fixed
+    ``amount``, rounded to cents and never below zero.
+    """
+    output = DecimalField(max_digits=SALARY.max_digits, decimal_places=SALARY.decimal_places)
+    if percent is not None:
+        value = salary * Value(1 + percent / 100, output_field=TOTAL)
+    else:
+        value = salary + Value(amount, output_field=output)
+    return Greatest(Round(value, SALARY.decimal_places, output_field=output),
+                    Value(Decimal(0), output_field=output), output_field=output)
+
+
+def holder_filter(department=None, status=None):
+    """The filter for employees of ``department`` and/or ``status``."""
+    selection = Q()
+    if department is not None:
+        selection &= Q(department=department)
+    if status is not None:
+        selection &= Q(status=status)
+    return selection
+
+
+def select_positions(department=None, status=None, position_ids=None):
+    """
+    Positions held by employees of ``department`` and/or ``status``,
+    optionally narrowed to ``position_ids``. The salary belongs to the
+    position, so every holder of a selected position is affected.
+    """
+    positions = Position.objects.all()
+    selection = holder_filter(department, status)
+    if selection:
+        holders = Employee.objects.filter(selection, position__isnull=False)
+        positions = positions.filter(pk__in=holders.values('position'))
+    if position_ids is not None:
+        positions = positions.filter(pk__in=position_ids)
+    return positions
+
+
+def project(positions, selection=None, **adjustment):
+    """
+    Work out the payroll before and after the adjustment with aggregates,
+    overall and per department, without changing anything. ``spill_over``
+    counts the affected employees outside the holder ``selection`` the
+    positions were picked by.
+    """
+    after = new_salary(F('position__salary'), **adjustment)
+    holders = Employee.objects.filter(position__in=positions)
+    counts = positions.aggregate(count=Count('pk'),
+                                 highest=Max(new_salary(F('salary'), **adjustment)))
+    rows = list(holders.values('department').annotate(
+        headcount=Count('pk'),
+        outside=Count('pk', filter=~selection) if selection else Value(0),
+        before=Sum('position__salary', output_field=TOTAL),
+        after=Sum(after, output_field=TOTAL),
+    ).order_by('department'))
+    departments = [
+        {'id': row['department'], 'headcount': row['headcount'],
+         'payroll_before': row['before'], 'payroll_after': row['after']}
+        for row in rows
+    ]
+    difference = sum((row['payroll_after'] - row['payroll_before'] for row in departments), Decimal(0))
+    before = PayrollSummary.objects.filter(dimension=PayrollSummary.STATUS) \
+        .aggregate(total=Sum('salary_total'))['total'] or Decimal(0)
+    return {
+        'positions': counts['count'],
+        'employees': sum(row['headcount'] for row in departments),
+        'spill_over': sum(row['outside'] for row in rows),
+        'highest_salary': counts['highest'],
+        'payroll_before': before,
+        'payroll_after': before + difference,
+        'difference': difference,
+        'departments': departments,
+    }
+
+
+def revalue(positions, dry_run=False, selection=None, **adjustment):
+    """
+    Apply the adjustment to ``positions`` with a single ``UPDATE`` and
+    return the projection it was checked against. The payroll summary is
+    adjusted from one grouped aggregate, the change log gets an entry per
+    position and the cached position responses are dropped. A dry run
+    only reads, without locking the positions.
+    """
+    with transaction.atomic():
+        if not dry_run:
+            positions = positions.select_for_update()
+        ids = list(positions.values_list('pk', flat=True))
+        selected = Position.objects.filter(pk__in=ids)
+        projection = project(selected, selection, **adjustment)
+        if projection['highest_salary'] is not None and projection['highest_salary'] > HIGHEST_SALARY:
+            raise ValidationError({'non_field_errors': [
+                f'The adjustment takes a salary to {projection["highest_salary"]}, '
+                f'above the largest allowed {HIGHEST_SALARY}.'
+            ]})
+        if dry_run or not ids:
+            return projection
+
+        summary.salaries_changed(
+            Employee.objects.filter(position__in=ids),
+            new_salary(F('position__salary'), **adjustment) - F('position__salary'),
+        )
+        selected.update(salary=new_salary(F('salary'), **adjustment))
+        changes.record(Position, ids, ChangeLog.UPDATE)
+        cache.invalidate(Position)
+    return projection
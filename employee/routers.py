@@ -0,0 +1,87 @@
+import contextlib
+import contextvars
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Set by ReplicaRoutingMiddleware for requests whose reads may go to a
+# replica; everything else (writes, management commands, background
+# threads) reads from the primary.
+use_replica = contextvars.ContextVar('use_replica', default=False)
+
+_health = {}
+_health_lock = threading.Lock()
+
+
+def get_replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def is_healthy(alias):
+    """
+    Return whether ``alias`` accepted a connection at its last check. Checks
+    run at most once per ``DATABASE_REPLICA_CHECK_INTERVAL`` seconds per
+    process; a failed replica is skipped until the next check passes.
+    """
+    interval = getattr(settings, 'DATABASE_REPLICA_CHECK_INTERVAL', 30)
+    now = time.monotonic()
+    with _health_lock:
+        healthy, checked_at = _health.get(alias, (None, None))
+        if checked_at is not None and now - checked_at < interval:
+            return healthy
+        # Hold the previous verdict while this thread checks.
+        _health[alias] = (healthy is not False, now)
+
+    try:
+        connection = connections[alias]
+        connection.ensure_connection()
+        healthy = connection.is_usable()
+    except DatabaseError:
+        healthy = False
+    if not healthy:
+        logger.warning('Replica %s is unavailable, reading from the primary', alias)
+    with _health_lock:
+        _health[alias] = (healthy, time.monotonic())
+    return healthy
+
+
+@contextlib.contextmanager
+def primary():
+    """Send the reads inside the block to the primary."""
+    token = use_replica.set(False)
+    try:
+        yield
+    finally:
+        use_replica.reset(token)
+
+
+def reset_health():
+    with _health_lock:
+        _health.clear()
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads to a healthy replica from ``DATABASE_REPLICAS`` while
+    ``use_replica`` is set and the primary is not inside a transaction,
+    and everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not use_replica.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = [alias for alias in get_replicas() if is_healthy(alias)]
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
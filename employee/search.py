@@ -0,0 +1,149 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+from .models import Employee
+
+# Columns covered by the full-text index with their relevance weights.
+SEARCH_COLUMNS = (('name', 'A', 10.0), ('address', 'B', 5.0))
+
+TABLE = Employee._meta.db_table
+FTS_TABLE = f'{TABLE}_fts'
+
+_token_re = re.compile(r'\w+', re.UNICODE)
+
+
+def search_tokens(terms):
+    return [token.lower() for term in terms for token in _token_re.findall(term)]
+
+
+class PostgreSQLSearchBackend:
+    """
+    ``search_vector`` tsvector column kept current by a trigger and indexed
+    with GIN, all created by migration 0009. Terms are matched as prefixes
+    and ranked with ``ts_rank``.
+    """
+
+    def search(self, queryset, tokens):
+        query = ' & '.join(f"'{token}':*" for token in tokens)
+        return queryset.filter(RawSQL(
+            f"{TABLE}.search_vector @@ to_tsquery('simple', %s)", [query], BooleanField()
+        )).annotate(search_rank=RawSQL(
+            f"ts_rank({TABLE}.search_vector, to_tsquery('simple', %s))", [query], FloatField()
+        ))
+
+
+class SQLiteSearchBackend:
+    """
+    External-content FTS5 table shadowing the searchable columns, kept in
+    sync by triggers and ranked with ``bm25``.
+    """
+
+    def install(self, connection):
+        names = ', '.join(column for column, _, _ in SEARCH_COLUMNS)
+        new = ', '.join(f'new.{column}' for column, _, _ in SEARCH_COLUMNS)
+        old = ', '.join(f'old.{column}' for column, _, _ in SEARCH_COLUMNS)
+        statements = {
+            FTS_TABLE: f"""
+                CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+                    {names}, content='{TABLE}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """,
+            f'{FTS_TABLE}_insert': f"""
+                CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN
+                    INSERT INTO {FTS_TABLE}(rowid, {names}) VALUES (new.id, {new});
+                END
+            """,
+            f'{FTS_TABLE}_delete': f"""
+                CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN
+                    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names}) VALUES ('delete', old.id, {old});
+                END
+            """,
+            f'{FTS_TABLE}_update': f"""
+                CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF {names} ON {TABLE} BEGIN
+                    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names}) VALUES ('delete', old.id, {old});
+                    INSERT INTO {FTS_TABLE}(rowid, {names}) VALUES (new.id, {new});
+                END
+            """,
+        }
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE name IN (%s)" % ', '.join(['%s'] * len(statements)),
+                list(statements),
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if existing == set(statements):
+                return
+            # Rebuilding a table (as SQLite schema migrations do) drops its
+            # triggers, so recreate whatever is missing and reindex.
+            for name, sql in statements.items():
+                if name not in existing:
+                    cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+    def search(self, queryset, tokens):
+        query = ' '.join(f'"{token}"*' for token in tokens)
+        weights = ', '.join(str(weight) for _, _, weight in SEARCH_COLUMNS)
+        return queryset.filter(RawSQL(
+            f'{TABLE}.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)',
+            [query], BooleanField(),
+        )).annotate(search_rank=RawSQL(
+            f'(SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {TABLE}.id)',
+            [query], FloatField(),
+        ))
+
+
+SEARCH_BACKENDS = {
+    'postgresql': PostgreSQLSearchBackend(),
+    'sqlite': SQLiteSearchBackend(),
+}
+
+
+def get_search_backend(using):
+    return SEARCH_BACKENDS.get(connections[using].vendor)
+
+
+def install_search_index(sender, using, **kwargs):
+    """
+    ``post_migrate`` receiver (re)creating the SQLite full-text table, whose
+    triggers are dropped whenever a migration rebuilds the employee table.
+    Safe to run repeatedly.
+    """
+    backend = get_search_backend(using)
+    if not hasattr(backend, 'install'):
+        return
+    if TABLE in connections[using].introspection.table_names():
+        backend.install(connections[using])
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` backed by the full-text index and ordered by relevance.
+    Each term matches word prefixes in name or address. Databases without
+    a search backend fall back to the ``search_fields`` icontains lookups.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        backend = get_search_backend(queryset.db)
+        if not terms or backend is None or queryset.model is not Employee:
+            return super().filter_queryset(request, queryset, view)
+
+        tokens = search_tokens(terms)
+        if not tokens:
+            return queryset.none()
+        return backend.search(queryset, tokens)
+
+    def get_ordering(self, request, queryset, view):
+        if (
+            search_tokens(self.get_search_terms(request))
+            and get_search_backend(queryset.db) is not None
+            and queryset.model is Employee
+        ):
+            return ('-search_rank',)
+        return None
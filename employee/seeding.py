@@ -0,0 +1,132 @@
+import random
+from decimal import Decimal
+
+from django.db import transaction
+
+from .models import Department, Employee, Position, Status
+from .signals import post_bulk_save, pre_bulk_save
+
+FIRST_NAMES = [
+    'Anan', 'Somchai', 'Somsak', 'Malee', 'Kanya', 'Niran', 'Pranee', 'Sakda', 'Suda',
+    'Thanawat', 'Chaiwat', 'Nattapong', 'Siriporn', 'Wichai', 'Apinya', 'Kittisak',
+    'Ratana', 'Prasert', 'Jintana', 'Arthit', 'Busaba', 'Chanida', 'Decha', 'Ekkachai',
+    'Kamon', 'Lamai', 'Manop', 'Nipon', 'Orathai', 'Pornthip', 'Rungroj', 'Sombat',
+    'Tanawat', 'Uthai', 'Wanida', 'Yupin', 'Boonmee', 'Chalerm', 'Duangjai', 'Kwan',
+]
+LAST_NAMES = [
+    'Krahan', 'Srisuk', 'Thongdee', 'Wongsawat', 'Chaiyaporn', 'Rattanakul', 'Saelim',
+    'Boonyarit', 'Phromma', 'Jaidee', 'Kaewmanee', 'Suwannarat', 'Intharasuk', 'Panyadee',
+    'Sirikul', 'Thammasat', 'Yodsuwan', 'Charoenphon', 'Limsakul', 'Nakprasert',
+    'Pattanapong', 'Ruangrit', 'Sangthong', 'Tangsiri', 'Wattana', 'Yensuk', 'Buranasiri',
+    'Chantarasap', 'Hongthong', 'Kongkaew',
+]
+STREETS = [
+    'Sukhumvit Road', 'Silom Road', 'Rama IV Road', 'Phahonyothin Road', 'Ratchadaphisek Road',
+    'Charoen Krung Road', 'Nimmanhaemin Road', 'Beach Road', 'Mittraphap Road', 'Huay Kaew Road',
+]
+CITIES = [
+    ('Bangkok', 0.5), ('Chiang Mai', 0.12), ('Nonthaburi', 0.1), ('Khon Kaen', 0.07),
+    ('Phuket', 0.07), ('Hat Yai', 0.06), ('Nakhon Ratchasima', 0.05), ('Krabi', 0.03),
+]
+STATUSES = [('normal', 0.86), ('probation', 0.07), ('on leave', 0.04), ('resigned', 0.03)]
+JOB_FAMILIES = [
+    ('Software Developer', 35000), ('Quality Assurance', 30000), ('Data Analyst', 38000),
+    ('Accountant', 28000), ('HR Officer', 26000), ('Sales Executive', 24000),
+    ('Customer Support', 20000), ('Project Manager', 60000), ('Designer', 32000),
+    ('System Administrator', 36000), ('Marketing Officer', 27000), ('Legal Counsel', 55000),
+]
+LEVELS = [('Junior', 1, 0.45), ('', 1.5, 0.35), ('Senior', 2.2, 0.15), ('Lead', 3, 0.05)]
+DEPARTMENT_NAMES = [
+    'Executive Office', 'Information Technology', 'Finance', 'Human Resources', 'Sales',
+    'Marketing', 'Operations', 'Customer Service', 'Legal', 'Research', 'Procurement',
+    'Logistics', 'Quality', 'Security', 'Facilities',
+]
+# Each department is managed by someone working in its parent department,
+# giving the org chart this many children per node.
+DEPARTMENT_FAN_OUT = 5
+
+
+def _weighted(rng, choices, weights, count):
+    return rng.choices(choices, weights=weights, k=count)
+
+
+def seed_database(employees, seed=0, batch_size=2000):
+    """
+    Create statuses, positions, a department tree and ``employees``
+    employees from a ``random.Random(seed)``, so the same arguments on an
+    empty database always produce the same rows.
+    """
+    rng = random.Random(seed)
+    with transaction.atomic():
+        statuses = Status.objects.bulk_create([Status(name=name) for name, _ in STATUSES])
+        positions = Position.objects.bulk_create([
+            Position(
+                name=f'{level} {title}'.strip(),
+                salary=Decimal(round(base * factor, -2)).quantize(Decimal('0.01')),
+            )
+            for title, base in JOB_FAMILIES for level, factor, _ in LEVELS
+        ])
+        department_count = min(max(3, employees // 100), 2000)
+        departments = Department.objects.bulk_create([
+            Department(name=DEPARTMENT_NAMES[index % len(DEPARTMENT_NAMES)]
+                       + (f' {index // len(DEPARTMENT_NAMES) + 1}'
+                          if index >= len(DEPARTMENT_NAMES) else ''))
+            for index in range(department_count)
+        ])
+        for model, instances in ((Status, statuses), (Position, positions), (Department, departments)):
+            post_bulk_save.send(sender=model, instances=instances, created=True)
+
+    position_weights = [weight for _ in JOB_FAMILIES for _, _, weight in LEVELS]
+    status_weights = [weight for _, weight in STATUSES]
+    # The first DEPARTMENT_FAN_OUT + 1 employees of each department are the
+    # candidates for managing it and its child departments.
+    candidates = {department.id: [] for department in departments}
+
+    created = 0
+    while created < employees:
+        count = min(batch_size, employees - created)
+        picked_statuses = _weighted(rng, statuses, status_weights, count)
+        picked_positions = _weighted(rng, positions, position_weights, count)
+        cities = _weighted(rng, [city for city, _ in CITIES], [w for _, w in CITIES], count)
+        batch = [
+            Employee(
+                name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                address=f'{rng.randint(1, 999)} {rng.choice(STREETS)}, {cities[index]}',
+                status=picked_statuses[index],
+                position=picked_positions[index] if rng.random() > 0.02 else None,
+                department=rng.choice(departments),
+            )
+            for index in range(count)
+        ]
+        with transaction.atomic():
+            Employee.objects.bulk_create(batch)
+            post_bulk_save.send(sender=Employee, instances=batch, created=True)
+        for employee in batch:
+            pool = candidates[employee.department_id]
+            if len(pool) <= DEPARTMENT_FAN_OUT:
+                pool.append(employee)
+        created += count
+
+    managers = []
+    for index, department in enumerate(departments):
+        parent = departments[(index - 1) // DEPARTMENT_FAN_OUT] if index else department
+        pool = candidates[parent.id]
+        slot = (index - 1) % DEPARTMENT_FAN_OUT + 1 if index else 0
+        if slot < len(pool):
+            department.manager = pool[slot]
+            pool[slot].is_manager = True
+            managers.append(pool[slot])
+    with transaction.atomic():
+        pre_bulk_save.send(sender=Department, instances=departments, update_fields=['manager'])
+        Department.objects.bulk_update(departments, ['manager'], batch_size=batch_size)
+        pre_bulk_save.send(sender=Employee, instances=managers, update_fields=['is_manager'])
+        Employee.objects.bulk_update(managers, ['is_manager'], batch_size=batch_size)
+        post_bulk_save.send(sender=Department, instances=departments, created=False,
+                            update_fields=['manager'])
+        post_bulk_save.send(sender=Employee, instances=managers, created=False,
+                            update_fields=['is_manager'])
+
+    return {
+        'statuses': len(statuses), 'positions': len(positions),
+        'departments': len(departments), 'employees': created,
+    }
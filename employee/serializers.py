@@ -1,42 +1,219 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+from .images import schedule_image_processing, validate_image
 from .models import Employee, Position, Department, Status
 
 
-class StatusSerializer(serializers.ModelSerializer):
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves against objects preloaded into the
+    serializer context under ``related_objects`` instead of querying once
+    per row. Falls back to the regular lookup when nothing was preloaded.
+    """
+
+    def to_internal_value(self, data):
+        model = self.get_queryset().model
+        preloaded = self.context.get('related_objects', {}).get(model)
+        if preloaded is None:
+            return super().to_internal_value(data)
+
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = model._meta.pk.to_python(data)
+        except (TypeError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return preloaded[pk]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+def parse_field_list(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class SparseFieldsMixin:
+    """
+    Let the request pick the fields of the top-level serializer with
+    ``?fields=id,name`` and the relations rendered as nested objects with
+    ``?expand=status,position``. Once either parameter is given, nested
+    relations not named in ``expand`` render as their primary key. Unknown
+    names are ignored, and writable fields left out are still accepted as
+    input. A view can also set them by passing ``sparse=(fields, expand)``
+    in the serializer context.
+    """
+
+    def get_sparse_params(self):
+        """Return ``(fields or None, expand)`` from the request, or ``None``."""
+        parent = getattr(self, 'parent', None)
+        if isinstance(parent, serializers.ListSerializer):
+            parent = getattr(parent, 'parent', None)
+        if parent is not None:
+            return None
+        if 'sparse' in self.context:
+            return self.context['sparse']
+        request = self.context.get('request')
+        if request is None:
+            return None
+        query = getattr(request, 'query_params', request.GET)
+        if 'fields' not in query and 'expand' not in query:
+            return None
+        only = parse_field_list(query['fields']) if 'fields' in query else None
+        return only, set(parse_field_list(query.get('expand', '')))
+
+    @property
+    def is_sparse(self):
+        return self.get_sparse_params() is not None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        params = self.get_sparse_params()
+        if params is None:
+            return fields
+        only, expand = params
+        for name, field in list(fields.items()):
+            if field.write_only:
+                continue
+            if only is not None and name not in only:
+                if field.read_only:
+                    del fields[name]
+                else:
+                    # Still accepted as input, just not rendered.
+                    field.write_only = True
+            elif isinstance(field, serializers.BaseSerializer) and name not in expand:
+                source = {} if field.source in (None, name) else {'source': field.source}
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, **source)
+        return fields
+
+
+class ImageVariantsField(serializers.Field):
+    """Absolute URLs of the resized image variants, ``{variant: {format: url}}``."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        storage = Employee._meta.get_field('image').storage
+        request = self.context.get('request')
+        variants = {}
+        for variant, formats in value.items():
+            variants[variant] = {}
+            for format_name, name in formats.items():
+                url = storage.url(name)
+                variants[variant][format_name] = request.build_absolute_uri(url) if request else url
+        return variants
+
+
+class StatusSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Status
         fields = '__all__'
 
 
-class PositionSerializer(serializers.ModelSerializer):
+class PositionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Position
         fields = '__all__'
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Department
         fields = '__all__'
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     status = StatusSerializer(read_only=True)
-    status_id = serializers.PrimaryKeyRelatedField(
+    status_id = PreloadedPrimaryKeyRelatedField(
         queryset=Status.objects.all(), source='status', write_only=True
     )
     position = PositionSerializer(read_only=True)
-    position_id = serializers.PrimaryKeyRelatedField(
+    position_id = PreloadedPrimaryKeyRelatedField(
         queryset=Position.objects.all(), source='position', write_only=True
     )
     department = DepartmentSerializer(read_only=True)
-    department_id = serializers.PrimaryKeyRelatedField(
+    department_id = PreloadedPrimaryKeyRelatedField(
         queryset=Department.objects.all(), source='department', write_only=True
     )
     image = serializers.ImageField(required=False)
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Employee
         fields = '__all__'
 
+    def validate_image(self, value):
+        return validate_image(value)
+
+    def create(self, validated_data):
+        instance = super().create(validated_data)
+        if instance.image:
+            schedule_image_processing(instance.pk)
+        return instance
+
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
+        if 'image' in validated_data:
+            schedule_image_processing(instance.pk)
+        return instance
+
+
+class PayrollSummarySerializer(SparseFieldsMixin, serializers.Serializer):
+    id = serializers.IntegerField(allow_null=True)
+    name = serializers.CharField(allow_null=True)
+    headcount = serializers.IntegerField()
+    salary_total = serializers.DecimalField(max_digits=16, decimal_places=2)
+    salary_average = serializers.DecimalField(max_digits=16, decimal_places=2, allow_null=True)
+
+
+class RestoreSerializer(serializers.Serializer):
+    """Changes applied to an archived employee as it is restored."""
+    status_id = serializers.PrimaryKeyRelatedField(
+        queryset=Status.objects.all(), source='status', required=False
+    )
+
+
+class RevaluationSerializer(serializers.Serializer):
+    """
+    A salary adjustment by ``percent`` or by a fixed ``amount``, for the
+    positions held in ``department_id`` and/or ``status_id``, optionally
+    narrowed to ``position_ids``.
+    """
+    percent = serializers.DecimalField(max_digits=7, decimal_places=3, min_value=-100,
+                                       required=False)
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    department_id = serializers.PrimaryKeyRelatedField(
+        queryset=Department.objects.all(), source='department', required=False
+    )
+    status_id = serializers.PrimaryKeyRelatedField(
+        queryset=Status.objects.all(), source='status', required=False
+    )
+    position_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False
+    )
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if ('percent' in attrs) == ('amount' in attrs):
+            raise serializers.ValidationError('Give exactly one of percent and amount.')
+        return attrs
+
+
+class DepartmentProjectionSerializer(serializers.Serializer):
+    id = serializers.IntegerField(allow_null=True)
+    headcount = serializers.IntegerField()
+    payroll_before = serializers.DecimalField(max_digits=16, decimal_places=2)
+    payroll_after = serializers.DecimalField(max_digits=16, decimal_places=2)
+
 
+class RevaluationProjectionSerializer(serializers.Serializer):
+    dry_run = serializers.BooleanField()
+    positions = serializers.IntegerField()
+    employees = serializers.IntegerField()
+    spill_over = serializers.IntegerField()
+    payroll_before = serializers.DecimalField(max_digits=16, decimal_places=2)
+    payroll_after = serializers.DecimalField(max_digits=16, decimal_places=2)
+    difference = serializers.DecimalField(max_digits=16, decimal_places=2)
+    departments = DepartmentProjectionSerializer(many=True)
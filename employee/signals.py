@@ -0,0 +1,216 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+from rest_framework.authtoken.models import Token
+
+from . import cache, changes, summary, typeahead
+from .authentication import invalidate_token
+from .models import ChangeLog, Department, Employee, PayrollSummary, Position, Status
+
+# Sent by code that writes rows with bulk_create()/bulk_update(), which
+# bypass the per-instance signals. Arguments: ``instances``, ``created``
+# and, for updates, ``update_fields``. ``pre_bulk_save`` is sent for
+# updates only, inside the writing transaction.
+pre_bulk_save = Signal()
+post_bulk_save = Signal()
+# Sent after rows were deleted without the per-instance signals, e.g. when
+# employees are archived. Argument: ``instances``, as loaded before.
+post_bulk_delete = Signal()
+
+
+@receiver([post_save, post_delete], sender=Status)
+@receiver([post_save, post_delete], sender=Position)
+@receiver([post_save, post_delete], sender=Department)
+@receiver(post_bulk_save, sender=Status)
+@receiver(post_bulk_save, sender=Position)
+@receiver(post_bulk_save, sender=Department)
+def invalidate_lookup_cache(sender, **kwargs):
+    cache.invalidate(sender)
+
+
+@receiver(post_delete, sender=Employee)
+def invalidate_managed_departments(sender, **kwargs):
+    # Deleting an employee nulls Department.manager with a plain UPDATE
+    # that sends no signal of its own.
+    cache.invalidate(Department)
+
+
+@receiver(pre_save, sender=Employee)
+def check_org_chart_fields(sender, instance, update_fields=None, **kwargs):
+    # Only a manager's name or department shows up in the org chart;
+    # comparing with the loaded values keeps other saves from querying.
+    loaded = getattr(instance, '_loaded_values', {})
+    changed = False
+    for name, attname in (('name', 'name'), ('department', 'department_id')):
+        if update_fields is not None and name not in update_fields and attname not in update_fields:
+            continue
+        if attname not in loaded or loaded[attname] != getattr(instance, attname):
+            changed = True
+    instance._org_chart_changed = changed
+
+
+@receiver(post_save, sender=Employee)
+def invalidate_org_chart(sender, instance, created, **kwargs):
+    if getattr(instance, '_org_chart_changed', False) and not created \
+            and Department.objects.filter(manager=instance).exists():
+        cache.invalidate(Employee)
+
+
+@receiver(post_bulk_save, sender=Employee)
+def invalidate_org_chart_in_bulk(sender, instances, created, update_fields=None, **kwargs):
+    if created or not {'name', 'department'} & set(update_fields or ()):
+        return
+    if Department.objects.filter(manager__in=instances).exists():
+        cache.invalidate(Employee)
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def evict_deactivated_user_tokens(sender, instance, **kwargs):
+    if not instance.is_active:
+        for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+            invalidate_token(key)
+
+
+@receiver(pre_save, sender=Employee)
+def load_employee_summary_state(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is not None and summary.updates_tracked_fields(update_fields):
+        summary.lock_states([instance])
+
+
+@receiver(pre_bulk_save, sender=Employee)
+def load_employee_summary_states(sender, instances, update_fields=None, **kwargs):
+    if summary.updates_tracked_fields(update_fields):
+        summary.lock_states(instances)
+
+
+@receiver(pre_delete, sender=Employee)
+def lock_deleted_employee_state(sender, instance, **kwargs):
+    summary.lock_states([instance])
+
+
+@receiver(post_save, sender=Employee)
+def update_payroll_summary(sender, instance, created, update_fields=None, **kwargs):
+    summary.employees_saved([instance], created, update_fields)
+
+
+@receiver(post_bulk_save, sender=Employee)
+def update_payroll_summary_in_bulk(sender, instances, created, update_fields=None, **kwargs):
+    summary.employees_saved(instances, created, update_fields)
+
+
+@receiver(post_delete, sender=Employee)
+def remove_from_payroll_summary(sender, instance, **kwargs):
+    summary.employee_deleted(instance)
+
+
+@receiver(post_bulk_delete, sender=Employee)
+def remove_from_payroll_summary_in_bulk(sender, instances, **kwargs):
+    summary.employees_deleted(instances)
+
+
+@receiver(pre_save, sender=Position)
+def lock_position_salary(sender, instance, update_fields=None, **kwargs):
+    # Position.save is atomic, so the salary the delta starts from stays
+    # current until the save commits, as lock_states does for employees.
+    if instance.pk is None or (update_fields is not None and 'salary' not in update_fields):
+        return
+    salary = Position.objects.select_for_update().filter(pk=instance.pk) \
+        .values_list('salary', flat=True).first()
+    if salary is not None:
+        instance._loaded_values = {**getattr(instance, '_loaded_values', {}), 'salary': salary}
+
+
+@receiver(post_save, sender=Position)
+def update_payroll_salaries(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and 'salary' not in update_fields:
+        return
+    salary = sender._meta.get_field('salary').to_python(instance.salary)
+    loaded = getattr(instance, '_loaded_values', {})
+    if not created and 'salary' in loaded:
+        summary.position_salary_changed(instance, loaded['salary'], salary)
+    instance._loaded_values = {**loaded, 'salary': salary}
+
+
+@receiver(pre_delete, sender=Position)
+def remove_position_from_payroll_summary(sender, instance, **kwargs):
+    summary.position_removed(instance)
+
+
+@receiver(post_delete, sender=Department)
+def fold_department_summary(sender, instance, **kwargs):
+    summary.group_removed(PayrollSummary.DEPARTMENT, instance.pk)
+
+
+@receiver(post_delete, sender=Status)
+def fold_status_summary(sender, instance, **kwargs):
+    summary.group_removed(PayrollSummary.STATUS, instance.pk)
+
+
+@receiver(post_save, sender=Status)
+@receiver(post_save, sender=Position)
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=Employee)
+def log_saved_change(sender, instance, created, **kwargs):
+    changes.record(sender, [instance.pk], ChangeLog.CREATE if created else ChangeLog.UPDATE)
+
+
+@receiver(post_bulk_save, sender=Status)
+@receiver(post_bulk_save, sender=Position)
+@receiver(post_bulk_save, sender=Department)
+@receiver(post_bulk_save, sender=Employee)
+def log_bulk_saved_changes(sender, instances, created, **kwargs):
+    changes.record(sender, [instance.pk for instance in instances],
+                   ChangeLog.CREATE if created else ChangeLog.UPDATE)
+
+
+@receiver(post_delete, sender=Status)
+@receiver(post_delete, sender=Position)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=Employee)
+def log_deleted_change(sender, instance, **kwargs):
+    changes.record(sender, [instance.pk], ChangeLog.DELETE)
+
+
+@receiver(post_bulk_delete, sender=Employee)
+def log_bulk_deleted_changes(sender, instances, **kwargs):
+    changes.record(sender, [instance.pk for instance in instances], ChangeLog.DELETE)
+
+
+@receiver(pre_delete, sender=Status)
+@receiver(pre_delete, sender=Position)
+@receiver(pre_delete, sender=Department)
+def log_unlinked_employees(sender, instance, **kwargs):
+    # SET_NULL clears the foreign keys with a plain UPDATE once the
+    # pre_delete signals have been sent, so the rows are looked up first.
+    field = sender._meta.model_name
+    ids = Employee.objects.filter(**{field: instance}).values_list('pk', flat=True)
+    changes.record(Employee, ids, ChangeLog.UPDATE)
+
+
+@receiver(pre_delete, sender=Employee)
+def log_unmanaged_departments(sender, instance, **kwargs):
+    ids = Department.objects.filter(manager=instance).values_list('pk', flat=True)
+    changes.record(Department, ids, ChangeLog.UPDATE)
+
+
+@receiver(post_save, sender=Employee)
+def refresh_typeahead(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or 'name' in update_fields:
+        typeahead.invalidate()
+
+
+@receiver(post_bulk_save, sender=Employee)
+def refresh_typeahead_in_bulk(sender, instances, created, update_fields=None, **kwargs):
+    if created or 'name' in (update_fields or ()):
+        typeahead.invalidate()
+
+
+@receiver(post_delete, sender=Employee)
+@receiver(post_bulk_delete, sender=Employee)
+def drop_from_typeahead(sender, **kwargs):
+    typeahead.invalidate()
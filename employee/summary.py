@@ -0,0 +1,275 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Sum
+
+from .models import Department, Employee, PayrollSummary, Position, Status
+
+TRACKED_FIELDS = ('status_id', 'department_id', 'position_id')
+DIMENSIONS = {
+    PayrollSummary.STATUS: 'status_id',
+    PayrollSummary.DEPARTMENT: 'department_id',
+}
+UNASSIGNED = 0
+
+
+def get_state(employee, update_fields=None):
+    """
+    Return ``(status_id, department_id, position_id)`` as the save will
+    leave it: fields outside ``update_fields`` keep their loaded value.
+    """
+    loaded = loaded_state(employee)
+    state = []
+    for index, attname in enumerate(TRACKED_FIELDS):
+        if loaded is not None and not _is_updated(attname, update_fields):
+            state.append(loaded[index])
+        else:
+            state.append(getattr(employee, attname))
+    return tuple(state)
+
+
+def loaded_state(employee):
+    loaded = getattr(employee, '_loaded_values', {})
+    if all(attname in loaded for attname in TRACKED_FIELDS):
+        return tuple(loaded[attname] for attname in TRACKED_FIELDS)
+    return None
+
+
+def lock_states(employees):
+    """
+    Lock the rows of ``employees`` and load their stored state, so the
+    deltas start from what concurrent writers committed rather than from
+    what the instances were loaded with. Call inside the saving transaction.
+    """
+    employees = [employee for employee in employees if employee.pk is not None]
+    if not employees:
+        return
+    rows = {
+        pk: state for pk, *state in Employee.objects.select_for_update()
+        .filter(pk__in=[employee.pk for employee in employees])
+        .order_by('pk').values_list('pk', *TRACKED_FIELDS)
+    }
+    for employee in employees:
+        # Deleting a row another request already deleted still sends the
+        # delete signals; there is nothing left to take out then.
+        employee._summary_row_missing = employee.pk not in rows
+        if employee.pk in rows:
+            employee._loaded_values = {
+                **getattr(employee, '_loaded_values', {}),
+                **dict(zip(TRACKED_FIELDS, rows[employee.pk])),
+            }
+
+
+def _is_updated(attname, update_fields):
+    return update_fields is None or attname in update_fields or attname[:-3] in update_fields
+
+
+def updates_tracked_fields(update_fields):
+    return any(_is_updated(attname, update_fields) for attname in TRACKED_FIELDS)
+
+
+def _new_deltas():
+    # [headcount, salaried_headcount, salary_total] per (dimension, key)
+    return defaultdict(lambda: [0, 0, Decimal(0)])
+
+
+def apply_deltas(deltas):
+    """
+    Add ``deltas`` to the summary rows with ``F()`` expressions, creating
+    missing rows first. Rows are touched in key order so concurrent
+    writers lock them in the same order.
+    """
+    for (dimension, key), (headcount, salaried, total) in sorted(deltas.items()):
+        if not (headcount or salaried or total):
+            continue
+        rows = PayrollSummary.objects.filter(dimension=dimension, key=key)
+        values = {
+            'headcount': F('headcount') + headcount,
+            'salaried_headcount': F('salaried_headcount') + salaried,
+            'salary_total': F('salary_total') + total,
+        }
+        if not rows.update(**values):
+            PayrollSummary.objects.bulk_create(
+                [PayrollSummary(dimension=dimension, key=key)], ignore_conflicts=True
+            )
+            rows.update(**values)
+
+
+def apply_changes(changes):
+    """
+    Apply ``[(sign, state), ...]``: +1 adds an employee with ``state`` to
+    the summary, -1 removes one.
+    """
+    position_ids = {state[2] for _, state in changes if state[2] is not None}
+    salaries = dict(
+        Position.objects.filter(pk__in=position_ids).values_list('pk', 'salary')
+    ) if position_ids else {}
+
+    deltas = _new_deltas()
+    for sign, (status_id, department_id, position_id) in changes:
+        salary = salaries.get(position_id)
+        for dimension, key in ((PayrollSummary.STATUS, status_id),
+                               (PayrollSummary.DEPARTMENT, department_id)):
+            delta = deltas[dimension, key or UNASSIGNED]
+            delta[0] += sign
+            if salary is not None:
+                delta[1] += sign
+                delta[2] += sign * salary
+    apply_deltas(deltas)
+
+
+def employees_saved(employees, created, update_fields=None):
+    changes = []
+    for employee in employees:
+        old = None if created else loaded_state(employee)
+        new = get_state(employee, update_fields)
+        if old != new:
+            changes.append((1, new))
+            if old is not None:
+                changes.append((-1, old))
+        employee._loaded_values = {
+            **getattr(employee, '_loaded_values', {}), **dict(zip(TRACKED_FIELDS, new))
+        }
+    if changes:
+        apply_changes(changes)
+
+
+def employee_deleted(employee):
+    employees_deleted([employee])
+
+
+def employees_deleted(employees):
+    apply_changes([
+        (-1, loaded_state(employee) or get_state(employee)) for employee in employees
+        if not getattr(employee, '_summary_row_missing', False)
+    ])
+
+
+def _group_by_dimension(queryset, *aggregates):
+    for dimension, attname in DIMENSIONS.items():
+        rows = queryset.values_list(attname).annotate(**{
+            f'value_{index}': aggregate for index, aggregate in enumerate(aggregates)
+        }).order_by()
+        for key, *values in rows:
+            yield dimension, key or UNASSIGNED, values
+
+
+def position_salary_changed(position, old_salary, new_salary):
+    difference = new_salary - old_salary
+    if not difference:
+        return
+    deltas = _new_deltas()
+    employees = Employee.objects.filter(position=position)
+    for dimension, key, (count,) in _group_by_dimension(employees, Count('pk')):
+        deltas[dimension, key][2] += difference * count
+    apply_deltas(deltas)
+
+
+def salaries_changed(employees, difference):
+    """
+    Add ``difference``, an expression of each employee's salary change, to
+    the totals, with one grouped aggregate per dimension.
+    """
+    deltas = _new_deltas()
+    total = Sum(difference, output_field=DecimalField(max_digits=16, decimal_places=2))
+    for dimension, key, (change,) in _group_by_dimension(employees, total):
+        deltas[dimension, key][2] += change or 0
+    apply_deltas(deltas)
+
+
+def position_removed(position):
+    """Take the salaries of a position's employees out before it is nulled."""
+    deltas = _new_deltas()
+    employees = Employee.objects.filter(position=position)
+    aggregates = (Count('pk'), Sum('position__salary'))
+    for dimension, key, (count, total) in _group_by_dimension(employees, *aggregates):
+        deltas[dimension, key][1] -= count
+        deltas[dimension, key][2] -= total
+    apply_deltas(deltas)
+
+
+def group_removed(dimension, key):
+    """Fold the row of a deleted department or status into the unassigned row."""
+    row = PayrollSummary.objects.filter(dimension=dimension, key=key).first()
+    if row is None:
+        return
+    row.delete()
+    apply_deltas({
+        (dimension, UNASSIGNED): [row.headcount, row.salaried_headcount, row.salary_total],
+    })
+
+
+def compute_summary():
+    """
+    Aggregate the summary straight from the employee table as
+    ``{(dimension, key): (headcount, salaried_headcount, salary_total)}``.
+    """
+    aggregates = (Count('pk'), Count('position'), Sum('position__salary'))
+    return {
+        (dimension, key): (headcount, salaried, total or Decimal(0))
+        for dimension, key, (headcount, salaried, total)
+        in _group_by_dimension(Employee.objects.all(), *aggregates)
+    }
+
+
+def rebuild_summary():
+    with transaction.atomic():
+        totals = compute_summary()
+        PayrollSummary.objects.all().delete()
+        PayrollSummary.objects.bulk_create([
+            PayrollSummary(dimension=dimension, key=key, headcount=headcount,
+                           salaried_headcount=salaried, salary_total=total)
+            for (dimension, key), (headcount, salaried, total) in totals.items()
+        ])
+    return len(totals)
+
+
+def verify_summary():
+    """
+    Compare the stored summary with a fresh aggregate and return
+    ``{(dimension, key): (stored, expected)}`` for every row that differs.
+    """
+    expected = compute_summary()
+    stored = {
+        (row.dimension, row.key): (row.headcount, row.salaried_headcount, row.salary_total)
+        for row in PayrollSummary.objects.all()
+    }
+    empty = (0, 0, Decimal(0))
+    return {
+        key: (stored.get(key, empty), expected.get(key, empty))
+        for key in stored.keys() | expected.keys()
+        if stored.get(key, empty) != expected.get(key, empty)
+    }
+
+
+def _report_row(key, name, headcount=0, salaried=0, total=Decimal(0)):
+    return {
+        'id': key,
+        'name': name,
+        'headcount': headcount,
+        'salary_total': total,
+        'salary_average': total / salaried if salaried else None,
+    }
+
+
+def report(dimension):
+    """
+    Return one row per department or status, plus an unassigned row when
+    some employees have none, and the overall total. Reads only the
+    summary and lookup tables, never the employees.
+    """
+    model = Department if dimension == PayrollSummary.DEPARTMENT else Status
+    stored = {
+        row.key: (row.headcount, row.salaried_headcount, row.salary_total)
+        for row in PayrollSummary.objects.filter(dimension=dimension)
+    }
+    rows = [
+        _report_row(key, name, *stored.get(key, ()))
+        for key, name in model.objects.order_by('pk').values_list('pk', 'name')
+    ]
+    if stored.get(UNASSIGNED, (0,))[0]:
+        rows.append(_report_row(None, None, *stored[UNASSIGNED]))
+
+    total = [sum(values) for values in zip((0, 0, Decimal(0)), *stored.values())]
+    return rows, _report_row(None, None, *total)
@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from employee.admin import EmployeeAdmin
+from employee.models import Department, Employee, Position, Status
+from employee.tests.test_images import generate_photo
+
+
+class AdminChangeListTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.com', 'pass'))
+        self.status = Status.objects.create(name='normal')
+        self.position = Position.objects.create(name='Clerk', salary=20000)
+        self.department = Department.objects.create(name='Sales')
+
+    def create_employees(self, count):
+        for i in range(count):
+            employee = Employee.objects.create(
+                name=f'Employee {i}', address='Bangkok', status=Status.objects.create(name=f'status {i}'),
+                position=Position.objects.create(name=f'position {i}', salary=1000 + i),
+                department=Department.objects.create(name=f'department {i}'),
+            )
+            Department.objects.filter(pk=employee.department_id).update(manager=employee)
+
+    def changelist(self, model, params=None):
+        response = self.client.get(reverse(f'admin:employee_{model}_changelist'), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # Session, user, the count, the page and, for employees, the
+        # status and department filter choices.
+        expected = {'status': 4, 'position': 4, 'department': 4, 'employee': 6}
+        for count in (1, 10):
+            self.create_employees(count)
+            for model, queries in expected.items():
+                with self.assertNumQueries(queries, msg=model):
+                    self.changelist(model)
+
+    def test_filtered_and_searched_lists(self):
+        self.create_employees(3)
+        response = self.changelist('employee', {'q': 'employee 1'})
+        self.assertEqual([row.name for row in response.context['cl'].result_list], ['Employee 1'])
+        response = self.changelist('employee', {'status__id__exact': self.status.id})
+        self.assertEqual(response.context['cl'].result_count, 0)
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=2)
+    @mock.patch.object(EmployeeAdmin, 'list_per_page', 1)
+    def test_large_tables_are_not_counted(self):
+        self.create_employees(5)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.changelist('employee')
+        counts = [query['sql'] for query in queries if 'COUNT(' in query['sql']]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('LIMIT 3', counts[0])
+        self.assertEqual(response.context['cl'].result_count, 5)
+
+        response = self.changelist('employee', {'q': 'employee'})
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def test_autocomplete(self):
+        self.create_employees(3)
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'employee', 'model_name': 'department', 'field_name': 'manager',
+            'term': 'employee 2',
+        })
+        self.assertEqual([row['text'] for row in response.json()['results']], ['Employee 2'])
+
+
+class AdminImageTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.com', 'pass'))
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        overrides = override_settings(MEDIA_ROOT=media_root, EMPLOYEE_IMAGE_ASYNC=False)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.employee = Employee.objects.create(
+            name='Somchai', address='Bangkok', status=Status.objects.create(name='normal'),
+            position=Position.objects.create(name='Clerk', salary=20000),
+        )
+
+    def upload(self, image, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('admin:employee_employee_change', args=[self.employee.id]), {
+                'name': self.employee.name, 'address': self.employee.address,
+                'status': self.employee.status_id, 'position': self.employee.position_id,
+                'image': image, **data,
+            })
+
+    def test_upload_is_processed(self):
+        response = self.upload(generate_photo())
+        self.assertEqual(response.status_code, 302)
+        self.employee.refresh_from_db()
+        self.assertEqual(set(self.employee.image_variants), {'thumbnail', 'small', 'medium'})
+        self.assertTrue(default_storage.exists(self.employee.image_variants['small']['webp']))
+        with self.employee.image.open('rb') as original:
+            self.assertEqual(dict(Image.open(original).getexif()), {})
+
+    def test_oversized_upload_is_rejected(self):
+        with self.settings(EMPLOYEE_IMAGE_MAX_PIXELS=100 * 100):
+            response = self.upload(generate_photo(size=(200, 200)))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('image', response.context['adminform'].form.errors)
+        self.employee.refresh_from_db()
+        self.assertFalse(self.employee.image)
+
+    def test_clearing_the_image_drops_its_variants(self):
+        self.upload(generate_photo())
+        self.employee.refresh_from_db()
+        thumbnail = self.employee.image_variants['thumbnail']['jpeg']
+
+        response = self.upload('', **{'image-clear': 'on'})
+        self.assertEqual(response.status_code, 302)
+        self.employee.refresh_from_db()
+        self.assertFalse(self.employee.image)
+        self.assertEqual(self.employee.image_variants, {})
+        self.assertFalse(default_storage.exists(thumbnail))
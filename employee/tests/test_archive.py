@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+
+from employee import summary
+from employee.archive import restore_employee
+from employee.authentication import token_cache
+from employee.models import ArchivedEmployee, ChangeLog, Employee, EmployeeRecord, Status
+from employee.tests.test_api import APITestSetup
+
+
+@override_settings(EMPLOYEE_ARCHIVE_STATUSES=['resigned'])
+class ArchiveTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        self.resigned = Status.objects.create(name='resigned')
+        self.leavers = [
+            Employee.objects.create(name=f'Leaver {i}', address='Phuket', status=self.resigned,
+                                    position=self.position, department=self.department)
+            for i in range(3)
+        ]
+
+    def archive(self, *args):
+        output = StringIO()
+        call_command('archive_employees', *args, stdout=output)
+        return output.getvalue()
+
+    def test_command_moves_archivable_employees_in_batches(self):
+        self.assertIn('3 employees would be archived', self.archive('--dry-run'))
+        self.assertEqual(ArchivedEmployee.objects.count(), 0)
+
+        self.assertIn('Archived 3 employees', self.archive('--batch-size', '2'))
+        self.assertEqual(list(Employee.objects.values_list('id', flat=True)), [self.employee.id])
+        archived = ArchivedEmployee.objects.get(id=self.leavers[0].id)
+        self.assertEqual((archived.name, archived.status_id), ('Leaver 0', self.resigned.id))
+        self.assertEqual(summary.verify_summary(), {})
+        self.assertEqual(
+            set(ChangeLog.objects.filter(action=ChangeLog.DELETE).values_list('object_id', flat=True)),
+            {leaver.id for leaver in self.leavers},
+        )
+
+    def test_department_managers_stay(self):
+        self.employee.status = self.resigned
+        self.employee.save()
+        self.archive()
+        self.assertTrue(Employee.objects.filter(id=self.employee.id).exists())
+
+    def test_default_endpoints_only_see_active_employees(self):
+        self.archive()
+        response = self.client.get(reverse('employee-list'), {'search': 'leaver'})
+        self.assertEqual(response.data['results'], [])
+        response = self.client.get(reverse('employee-detail', args=[self.leavers[0].id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_include_archived(self):
+        self.archive()
+        url = reverse('employee-list')
+        response = self.client.get(url, {'include_archived': 'true', 'status': self.resigned.id})
+        self.assertEqual([row['name'] for row in response.data['results']],
+                         ['Leaver 0', 'Leaver 1', 'Leaver 2'])
+        self.assertEqual(response.data['results'][0]['status'],
+                         {'id': self.resigned.id, 'name': 'resigned'})
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'include_archived': 'true', 'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 2)
+
+        response = self.client.get(reverse('employee-detail', args=[self.leavers[0].id]),
+                                   {'include_archived': 'true'})
+        self.assertEqual(response.data['name'], 'Leaver 0')
+        self.assertEqual(EmployeeRecord.objects.count(), 4)
+
+    def test_restore(self):
+        self.archive()
+        leaver = self.leavers[0]
+        url = reverse('employee-restore', args=[leaver.id])
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(url, {'status_id': self.status.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['id'], response.data['status']['id']),
+                         (leaver.id, self.status.id))
+        self.assertFalse(ArchivedEmployee.objects.filter(id=leaver.id).exists())
+        self.assertEqual(summary.verify_summary(), {})
+        response = self.client.get(reverse('employee-list'), {'search': 'leaver'})
+        self.assertEqual([row['id'] for row in response.data['results']], [leaver.id])
+
+        response = self.client.post(url, {'status_id': self.status.id})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_restore_of_a_row_already_restored(self):
+        self.archive()
+        archived = ArchivedEmployee.objects.get(id=self.leavers[0].id)
+        restore_employee(archived, status=self.status)
+        # A concurrent restore that read the row before the first one ended.
+        with self.assertRaises(NotFound):
+            restore_employee(archived, status=self.status)
+        self.assertEqual(Employee.objects.filter(id=archived.id).count(), 1)
@@ -0,0 +1,69 @@
+from django.http import QueryDict
+from django.urls import reverse
+from rest_framework import status
+
+from employee.authentication import token_cache
+from employee.models import Employee
+from employee.tests.test_api import APITestSetup
+
+
+class AsyncReadAPITests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        self.headers = {'Authorization': 'Token ' + self.token.key}
+        for i in range(3):
+            Employee.objects.create(name=f"Kanya {i}", address="Chiang Mai",
+                                    status=self.status, position=self.position)
+
+    async def assertSameAsSync(self, name, *args, query=None):
+        sync_response = await self.async_client.get(
+            reverse(name, args=args), query, headers=self.headers
+        )
+        async_response = await self.async_client.get(
+            reverse(f'async-{name}', args=args), query, headers=self.headers
+        )
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response['Content-Type'], sync_response['Content-Type'])
+        self.assertEqual(
+            async_response.content.replace(b'/api/async/', b'/api/'), sync_response.content
+        )
+        return async_response
+
+    async def test_employee_list_matches_sync(self):
+        response = await self.assertSameAsSync('employee-list', query={'page_size': 2})
+        self.assertEqual(len(response.json()['results']), 2)
+        next_page = QueryDict(response.json()['next'].split('?', 1)[1]).dict()
+        await self.assertSameAsSync('employee-list', query=next_page)
+
+    async def test_filters_search_and_ordering_match_sync(self):
+        await self.assertSameAsSync('employee-list', query={'status': self.status.id})
+        await self.assertSameAsSync('employee-list', query={'search': 'kanya'})
+        await self.assertSameAsSync('employee-list', query={'ordering': '-name'})
+        await self.assertSameAsSync('employee-list', query={'status': 9999})
+
+    async def test_retrieve_matches_sync(self):
+        await self.assertSameAsSync('employee-detail', self.employee.id)
+        response = await self.assertSameAsSync('employee-detail', 9999)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        await self.assertSameAsSync('employee-detail', 'abc')
+
+    async def test_lookups_match_sync(self):
+        for name in ('status', 'position', 'department'):
+            await self.assertSameAsSync(f'{name}-list')
+        await self.assertSameAsSync('position-detail', self.position.id)
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(reverse('async-employee-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+        response = await self.async_client.get(
+            reverse('async-employee-list'), headers={'Authorization': 'Token invalid'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_writes_are_not_allowed(self):
+        response = await self.async_client.post(reverse('async-employee-list'), {},
+                                                headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
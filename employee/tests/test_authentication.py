@@ -0,0 +1,127 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from employee import authentication
+from employee.authentication import LRUCache, token_cache
+from employee.tests.test_api import APITestSetup
+
+
+@mock.patch('employee.cache.is_shared', new=lambda cache=None: True)
+class CachedTokenAuthenticationTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        token_cache.clear()
+        self.url = reverse('api-root')
+
+    def test_token_lookup_runs_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_is_evicted(self):
+        self.client.get(self.url)
+        self.token.delete()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_evicted(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_evicted(self):
+        self.client.get(self.url)
+        self.user.delete()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_route_is_unchanged(self):
+        User.objects.create_user(username='another', password='secret-pass')
+        response = self.client.post(reverse('api_token_auth'), {
+            'username': 'another', 'password': 'secret-pass'
+        })
+        self.assertEqual(response.data['token'], Token.objects.get(user__username='another').key)
+
+    def test_revoked_in_another_worker(self):
+        self.client.get(self.url)
+        # That worker evicts its own copy and bumps the shared version only.
+        with mock.patch('employee.signals.invalidate_token', side_effect=authentication._bump):
+            self.token.delete()
+        self.assertEqual(len(token_cache), 1)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoking_one_token_keeps_the_others(self):
+        token = Token.objects.create(user=User.objects.create_user(username='another'))
+        other = APIClient()
+        other.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        other.get(self.url)
+        self.client.get(self.url)
+        self.token.delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(other.get(self.url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_shared_tier(self):
+        with self.settings(TOKEN_CACHE_ALIAS='default'):
+            self.client.get(self.url)
+            token_cache.clear()
+            with self.assertNumQueries(0):
+                self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+            self.token.delete()
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class LocalCacheTokenTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        self.url = reverse('api-root')
+
+    def test_tokens_are_kept_briefly(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with mock.patch('employee.authentication.time.monotonic', return_value=time.monotonic() + 5):
+            with self.assertNumQueries(1):
+                self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_revoked_in_this_worker(self):
+        self.client.get(self.url)
+        self.token.delete()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual(lru.get('a'), 1)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(len(lru), 2)
+
+    def test_entries_expire(self):
+        lru = LRUCache(maxsize=2, ttl=60)
+        with mock.patch('employee.authentication.time.monotonic', return_value=100):
+            lru.set('a', 1)
+        with mock.patch('employee.authentication.time.monotonic', return_value=159):
+            self.assertEqual(lru.get('a'), 1)
+        with mock.patch('employee.authentication.time.monotonic', return_value=160):
+            self.assertIsNone(lru.get('a'))
@@ -0,0 +1,97 @@
+from django.urls import reverse
+from rest_framework import status
+
+from employee.models import Employee, Status
+from employee.tests.test_api import APITestSetup
+
+
+class EmployeeBulkAPITests(APITestSetup):
+    url = reverse('employee-bulk')
+
+    def new_rows(self, count, **overrides):
+        return [{
+            "name": f"Onboarded {i}",
+            "address": "Khon Kaen",
+            "position_id": self.position.id,
+            "status_id": self.status.id,
+            "department_id": self.department.id,
+            "is_manager": False,
+            **overrides,
+        } for i in range(count)]
+
+    def test_bulk_create(self):
+        response = self.client.post(self.url, self.new_rows(3), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(response.data['errors'], [])
+        self.assertEqual(response.data['results'][0]['status']['name'], "normal")
+        self.assertEqual(Employee.objects.filter(name__startswith="Onboarded").count(), 3)
+
+    def test_bulk_create_query_count_is_constant(self):
+        # status/position/department lookups, savepoint, insert, salary
+        # lookup, one update per payroll summary row, change log, release
+        self.client.post(self.url, self.new_rows(1), format='json')
+        for count in (2, 20):
+            with self.assertNumQueries(10):
+                response = self.client.post(self.url, self.new_rows(count), format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_create_rejects_whole_batch_on_error(self):
+        rows = self.new_rows(3)
+        rows[1]['status_id'] = 9999
+        rows[2]['name'] = ""
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertIn('status_id', response.data['errors'][0]['errors'])
+        self.assertFalse(Employee.objects.filter(name__startswith="Onboarded").exists())
+
+    def test_bulk_create_allow_partial(self):
+        rows = self.new_rows(3)
+        rows[1]['position_id'] = "not-an-id"
+        response = self.client.post(self.url + '?allow_partial=true', rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['errors'][0]['index'], 1)
+        self.assertEqual(Employee.objects.filter(name__startswith="Onboarded").count(), 2)
+
+    def test_bulk_update(self):
+        other = Employee.objects.create(name="Second", address="Phuket", status=self.status)
+        resigned = Status.objects.create(name="resigned")
+        response = self.client.patch(self.url, [
+            {"id": self.employee.id, "status_id": resigned.id},
+            {"id": other.id, "address": "Krabi"},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.employee.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.employee.status, resigned)
+        self.assertEqual(other.address, "Krabi")
+        self.assertEqual(response.data['results'][0]['status']['name'], "resigned")
+
+    def test_bulk_update_reports_unknown_and_duplicate_ids(self):
+        response = self.client.patch(self.url + '?allow_partial=1', [
+            {"id": self.employee.id, "name": "Renamed"},
+            {"id": 9999, "name": "Ghost"},
+            {"id": self.employee.id, "name": "Again"},
+            {"name": "No id"},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2, 3])
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.name, "Renamed")
+
+    def test_bulk_delete(self):
+        other = Employee.objects.create(name="Leaving", address="Hat Yai", status=self.status)
+        response = self.client.delete(self.url, [other.id, 9999], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Employee.objects.filter(id=other.id).exists())
+
+        response = self.client.delete(self.url, [other.id], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [other.id])
+        self.assertFalse(Employee.objects.filter(id=other.id).exists())
+
+    def test_payload_must_be_a_list(self):
+        response = self.client.post(self.url, self.new_rows(1)[0], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
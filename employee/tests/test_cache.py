@@ -0,0 +1,138 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from django.utils.http import http_date, parse_http_date
+from rest_framework import status
+
+from employee.models import CacheVersion, Status, Department
+from employee.tests.test_api import APITestSetup
+
+
+class LookupCacheTests(APITestSetup):
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+
+    def test_repeated_list_is_served_from_cache(self):
+        url = reverse('status-list')
+        # With the default local-memory cache, the version comes from the
+        # database on every request.
+        with self.assertNumQueries(3):
+            first = self.client.get(url)
+        with self.assertNumQueries(1):
+            second = self.client.get(url)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertIn('Last-Modified', second)
+
+    def test_if_none_match_returns_not_modified(self):
+        url = reverse('position-detail', args=[self.position.id])
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.content)
+
+    def test_if_modified_since_returns_not_modified(self):
+        url = reverse('department-list')
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(0))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_version_is_not_older_than_the_data(self):
+        CacheVersion.objects.all().delete()
+        url = reverse('status-list')
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() - 60))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(parse_http_date(response['Last-Modified']), time.time() - 60)
+        self.assertEqual(self.client.get(url)['Last-Modified'], response['Last-Modified'])
+
+    def test_changes_within_a_second_get_distinct_dates(self):
+        url = reverse('status-list')
+        dates = set()
+        for name in ('on leave', 'remote', 'contract'):
+            Status.objects.create(name=name)
+            dates.add(self.client.get(url)['Last-Modified'])
+        self.assertEqual(len(dates), 3)
+
+    def test_api_write_invalidates(self):
+        url = reverse('status-list')
+        etag = self.client.get(url)['ETag']
+        self.client.put(reverse('status-detail', args=[self.status.id]), {"name": "on leave"})
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['name'], "on leave")
+
+    def test_model_signals_invalidate(self):
+        url = reverse('status-list')
+        self.client.get(url)
+        Status.objects.create(name="terminated")
+        names = [row['name'] for row in self.client.get(url).data['results']]
+        self.assertIn("terminated", names)
+
+        Status.objects.filter(name="terminated").delete()
+        names = [row['name'] for row in self.client.get(url).data['results']]
+        self.assertNotIn("terminated", names)
+
+    def test_other_lookups_stay_cached(self):
+        url = reverse('position-list')
+        self.client.get(url)
+        Status.objects.create(name="terminated")
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+    def test_deleting_manager_invalidates_departments(self):
+        url = reverse('department-detail', args=[self.department.id])
+        self.assertEqual(self.client.get(url).data['manager'], self.employee.id)
+        self.employee.delete()
+        self.assertIsNone(self.client.get(url).data['manager'])
+        self.assertIsNone(Department.objects.get(id=self.department.id).manager)
+
+    def test_errors_are_not_cached(self):
+        url = reverse('status-detail', args=[9999])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        Status.objects.create(id=9999, name="late")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def test_unauthenticated_requests_are_rejected_before_cache(self):
+        url = reverse('status-list')
+        self.client.get(url)
+        self.client.credentials()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class WorkerLocalCacheTests(APITestSetup):
+    """Two worker processes, each with its own local-memory cache."""
+
+    def setUp(self):
+        super().setUp()
+        self.workers = [LocMemCache(f'worker-{i}', {}) for i in range(2)]
+
+    def on_worker(self, index):
+        return mock.patch('employee.cache.get_cache', return_value=self.workers[index])
+
+    def test_write_on_one_worker_reaches_the_other(self):
+        url = reverse('status-list')
+        with self.on_worker(0):
+            first = self.client.get(url)
+        with self.on_worker(1):
+            self.assertEqual(self.client.get(url)['ETag'], first['ETag'])
+            self.client.put(reverse('status-detail', args=[self.status.id]), {"name": "on leave"})
+        with self.on_worker(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['name'], "on leave")
+
+    def test_shared_cache_skips_the_database(self):
+        url = reverse('status-list')
+        with mock.patch('employee.cache.is_shared', return_value=True), self.on_worker(0):
+            self.client.get(url)
+            with self.assertNumQueries(0):
+                self.client.get(url)
@@ -0,0 +1,163 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.models import Value
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from employee import routers
+from employee.authentication import token_cache
+from employee.models import ChangeLog, Department, Employee, Position
+from employee.tests.test_api import APITestSetup
+
+
+@override_settings(CHANGE_FEED_DELAY=0)
+class ChangeFeedTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        self.cursor = self.client.get(reverse('changes-list')).data['cursor']
+
+    def changes(self, since=None, **params):
+        since = self.cursor if since is None else since
+        response = self.client.get(reverse('changes-list'), {'since': since, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_start_returns_only_a_cursor(self):
+        response = self.client.get(reverse('changes-list'))
+        self.assertEqual(response.data, {
+            'cursor': ChangeLog.objects.latest('id').id, 'has_more': False, 'results': [],
+        })
+        self.assertEqual(self.changes()['results'], [])
+
+    def test_changes_are_collapsed_to_the_current_state(self):
+        self.employee.name = 'Anan K.'
+        self.employee.save()
+        self.employee.name = 'Anan Krahan-Thongdee'
+        self.employee.save()
+        created = Employee.objects.create(name='Kanya', address='Krabi', status=self.status)
+
+        data = self.changes()
+        self.assertEqual([(entry['model'], entry['id']) for entry in data['results']],
+                         [('employee', self.employee.id), ('employee', created.id)])
+        self.assertEqual(data['results'][0]['data']['name'], 'Anan Krahan-Thongdee')
+        # Relations are sent as primary keys; the lookups have entries of their own.
+        self.assertEqual(data['results'][0]['data']['position'], self.position.id)
+        self.assertFalse(data['results'][0]['deleted'])
+        self.assertEqual(data['cursor'], ChangeLog.objects.latest('id').id)
+        self.assertEqual(self.changes(data['cursor'])['results'], [])
+
+    def test_deletes_leave_tombstones_and_log_set_null_updates(self):
+        employee_id, position_id = self.employee.id, self.position.id
+        self.position.delete()
+        self.employee.delete()
+
+        results = self.changes()['results']
+        self.assertEqual(
+            [(entry['model'], entry['id'], entry['deleted']) for entry in results],
+            [('position', position_id, True),
+             ('department', self.department.id, False),
+             ('employee', employee_id, True)],
+        )
+        self.assertIsNone(results[1]['data']['manager'])
+        self.assertIsNone(results[2]['data'])
+
+    def test_bulk_writes_are_logged(self):
+        response = self.client.post(reverse('employee-bulk'), [
+            {'name': f'Bulk {i}', 'address': 'Bangkok', 'status_id': self.status.id,
+             'position_id': self.position.id, 'department_id': self.department.id}
+            for i in range(3)
+        ], format='json')
+        ids = [row['id'] for row in response.data['results']]
+        self.client.delete(reverse('employee-bulk'), ids[:1], format='json')
+
+        results = self.changes(model='employee')['results']
+        self.assertEqual([(entry['id'], entry['deleted']) for entry in results],
+                         [(ids[1], False), (ids[2], False), (ids[0], True)])
+
+    def test_pages_follow_limit_and_model(self):
+        for i in range(5):
+            Position.objects.create(name=f'Position {i}', salary=i)
+        Department.objects.create(name='Sales')
+        data = self.changes(limit=2, model='position')
+        self.assertTrue(data['has_more'])
+        self.assertEqual([entry['data']['name'] for entry in data['results']],
+                         ['Position 0', 'Position 1'])
+        data = self.changes(data['cursor'], limit=10, model='position')
+        self.assertFalse(data['has_more'])
+        self.assertEqual(len(data['results']), 3)
+
+    def test_cost_follows_the_changes_not_the_table(self):
+        Employee.objects.bulk_create([
+            Employee(name=f'Employee {i}', address='Bangkok', status=self.status) for i in range(50)
+        ])
+        self.employee.name = 'Anan K.'
+        self.employee.save()
+        self.status.name = 'active'
+        self.status.save()
+        self.client.get(reverse('api-root'))
+        # The log, one query per model that changed, and the expiry check.
+        with self.assertNumQueries(4):
+            results = self.changes()['results']
+        self.assertEqual(len(results), 2)
+
+    @override_settings(CHANGE_FEED_DELAY=60)
+    def test_recent_changes_wait_for_the_delay(self):
+        self.employee.save()
+        data = self.changes()
+        self.assertEqual(data['results'], [])
+        self.assertEqual(data['cursor'], self.cursor)
+        self.assertTrue(data['has_more'])
+
+    @override_settings(CHANGE_FEED_DELAY=60)
+    def test_entries_wait_for_older_transactions(self):
+        self.employee.save()
+        self.department.save()
+        *served, held = ChangeLog.objects.filter(id__gt=self.cursor).order_by('id')
+        ChangeLog.objects.filter(pk__in=[entry.pk for entry in served]).update(xid_horizon=100)
+        ChangeLog.objects.filter(pk=held.pk).update(xid_horizon=101)
+
+        # Where the oldest running transaction is known, the delay is not needed.
+        with mock.patch('employee.changes.snapshot_xmin', return_value=Value(100)):
+            data = self.changes()
+            start = self.client.get(reverse('changes-list')).data['cursor']
+        self.assertEqual([result['model'] for result in data['results']], ['employee'])
+        self.assertEqual(data['cursor'], served[-1].pk)
+        self.assertTrue(data['has_more'])
+        self.assertEqual(start, served[-1].pk)
+
+    def test_feed_reads_from_the_primary(self):
+        reads = []
+
+        def db_for_read(router, model, **hints):
+            reads.append((model, routers.use_replica.get()))
+            return 'default'
+
+        self.employee.save()
+        token_cache.clear()
+        with self.settings(DATABASE_REPLICAS=['replica_1']), \
+                mock.patch.object(routers.PrimaryReplicaRouter, 'db_for_read', db_for_read):
+            self.assertEqual(len(self.changes()['results']), 1)
+        self.assertIn((Token, True), reads)
+        self.assertIn((ChangeLog, False), reads)
+        self.assertNotIn((ChangeLog, True), reads)
+        self.assertNotIn((Employee, True), reads)
+
+    def test_pruned_cursors_expire(self):
+        ChangeLog.objects.update(changed_at=timezone.now() - timedelta(days=40))
+        self.employee.save()
+        call_command('prune_changes', days=30, stdout=StringIO())
+        response = self.client.get(reverse('changes-list'), {'since': 0})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertEqual(len(self.changes()['results']), 1)
+
+    def test_invalid_parameters(self):
+        for params in ({'since': 'x'}, {'since': -1}, {'since': 0, 'model': 'user'}):
+            response = self.client.get(reverse('changes-list'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from django.db import connections, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase
+
+
+class SQLiteConcurrencyTests(SimpleTestCase):
+    databases = {'default'}
+    workers = 8
+    writes_per_worker = 25
+
+    def setUp(self):
+        if connections['default'].vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.settings_dict = {
+            **connections['default'].settings_dict,
+            'NAME': os.path.join(directory, 'concurrency.sqlite3'),
+        }
+        with self.connect() as cursor:
+            cursor.execute('CREATE TABLE counter (id INTEGER PRIMARY KEY, seen INTEGER)')
+
+    def connect(self):
+        return DatabaseWrapper(self.settings_dict, alias='concurrency').cursor()
+
+    def test_connections_use_wal(self):
+        with self.connect() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+
+    def test_concurrent_read_then_write_transactions(self):
+        # Each transaction reads and then writes, the pattern that makes
+        # deferred SQLite transactions fail with "database is locked".
+        errors = []
+        barrier = threading.Barrier(self.workers)
+
+        def work():
+            # Connections are per thread, like in a threaded server.
+            connection = DatabaseWrapper(self.settings_dict, alias='concurrency')
+            connections['concurrency'] = connection
+            try:
+                barrier.wait()
+                for _ in range(self.writes_per_worker):
+                    with transaction.atomic(using='concurrency'), connection.cursor() as cursor:
+                        cursor.execute('SELECT COUNT(*) FROM counter')
+                        seen = cursor.fetchone()[0]
+                        cursor.execute('INSERT INTO counter (seen) VALUES (%s)', [seen])
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        with self.connect() as cursor:
+            cursor.execute('SELECT COUNT(*), COUNT(DISTINCT seen) FROM counter')
+            total, distinct = cursor.fetchone()
+        # Every transaction saw the writes committed before it.
+        self.assertEqual(total, self.workers * self.writes_per_worker)
+        self.assertEqual(distinct, total)
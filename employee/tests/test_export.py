@@ -0,0 +1,65 @@
+import csv
+import json
+from io import StringIO
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import status
+
+from employee.models import Status, Employee
+from employee.tests.test_api import APITestSetup
+from employee.views import EmployeeViewSet
+
+
+class EmployeeExportTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        self.resigned = Status.objects.create(name="resigned")
+        for i in range(5):
+            Employee.objects.create(
+                name=f"Export {i}",
+                address="Chiang Mai",
+                position=self.position,
+                status=self.resigned,
+                department=self.department,
+            )
+
+    def export(self, params=None):
+        response = self.client.get(reverse('employee-export'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], list(
+            Employee.objects.order_by('id').values_list('id', flat=True)
+        ))
+        self.assertEqual(rows[-1]['status']['name'], "resigned")
+        self.assertEqual(rows[-1]['department']['name'], "Information Technology")
+
+    def test_csv_export(self):
+        response, body = self.export({'format': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]['name'], "Anan Krahan")
+        self.assertEqual(rows[0]['position.salary'], "50000.00")
+        self.assertEqual(rows[0]['department.name'], "")
+        self.assertEqual(rows[1]['department.name'], "Information Technology")
+
+    def test_export_honours_filters_and_search(self):
+        _, body = self.export({'status': self.resigned.id})
+        self.assertEqual(len(body.splitlines()), 5)
+
+        _, body = self.export({'search': 'Anan'})
+        self.assertEqual([json.loads(line)['name'] for line in body.splitlines()], ["Anan Krahan"])
+
+    def test_export_streams_from_a_single_query(self):
+        with mock.patch.object(EmployeeViewSet, 'export_chunk_size', 2):
+            response = self.client.get(reverse('employee-export'))
+            with self.assertNumQueries(1):
+                lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual(len(lines), 6)
@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from employee.authentication import token_cache
+from employee.fastpath import compile_serializer
+from employee.models import Department, Employee, Position
+from employee.renderers import FastJSONRenderer
+from employee.serializers import EmployeeSerializer
+from employee.tests.test_api import APITestSetup
+
+
+class FastListTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        self.employee.department = self.department
+        self.employee.save()
+        Employee.objects.filter(id=self.employee.id).update(
+            image='employee_images/anan.jpg',
+            image_variants={'thumbnail': {'webp': 'employee_images/variants/anan_thumbnail.webp'}},
+        )
+        other = Department.objects.create(name='ฝ่ายขาย "Sales"')
+        Employee.objects.create(name='สมชาย ใจดี', address='Line\u2028separator\\ "quoted"\ttab',
+                                status=self.status, department=other)
+        Employee.objects.create(name='Kanya Srisuk', address='Krabi', status=None,
+                                position=Position.objects.create(name='Lead', salary=Decimal('1.5')))
+        Employee.objects.create(name='Anan Thongdee', address='Chiang Mai', status=self.status,
+                                position=self.position, is_manager=True)
+
+    def assertSameAsSerializer(self, params=None, url=None):
+        url = url or reverse('employee-list')
+        fast = self.client.get(url, params)
+        with override_settings(API_FAST_LIST=False):
+            slow = self.client.get(url, params)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+        self.assertEqual(fast.content, JSONRenderer().render(slow.data))
+        return fast
+
+    def test_output_is_byte_identical(self):
+        self.assertSameAsSerializer()
+        self.assertSameAsSerializer({'ordering': '-name'})
+        self.assertSameAsSerializer({'status': self.status.id})
+        self.assertSameAsSerializer({'search': 'anan'})
+        self.assertSameAsSerializer({'fields': 'id,name,image', 'expand': ''})
+        self.assertSameAsSerializer({'fields': 'id,position,department', 'expand': 'department'})
+
+    def test_cursor_pages_are_byte_identical(self):
+        for ordering in ('id', 'status', '-name'):
+            response = self.assertSameAsSerializer({'ordering': ordering, 'page_size': 2})
+            while response.data['next']:
+                response = self.assertSameAsSerializer(url=response.data['next'])
+            self.assertSameAsSerializer(url=response.data['previous'])
+
+    def test_fast_path_keeps_the_query_budget(self):
+        self.client.get(reverse('api-root'))
+        with self.assertNumQueries(1):
+            self.client.get(reverse('employee-list'))
+
+    def test_employee_serializer_compiles(self):
+        plan = compile_serializer(EmployeeSerializer(), Employee)
+        self.assertIn('status__name', plan.paths)
+        self.assertIn('department__manager', plan.paths)
+
+
+class CompileSerializerTests(SimpleTestCase):
+    def test_fields_needing_the_instance_are_not_compiled(self):
+        class WithMethod(serializers.ModelSerializer):
+            initials = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Employee
+                fields = ['id', 'initials']
+
+            def get_initials(self, obj):
+                return obj.name[:1]
+
+        class WithReverse(serializers.ModelSerializer):
+            class Meta:
+                model = Employee
+                fields = ['id', 'managed_departments']
+
+        self.assertIsNone(compile_serializer(WithMethod(), Employee))
+        self.assertIsNone(compile_serializer(WithReverse(), Employee))
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_matches_the_stdlib_renderer(self):
+        data = {
+            'text': 'ไทย\u2028\u2029 "q" \\ / \x00\x1f\x7f 😀',
+            'decimal': Decimal('12.50'), 'none': None, 'flag': True, 'ints': [0, -1, 2 ** 62],
+            'nested': [{'a': {}}, []],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_falls_back_for_what_orjson_rejects(self):
+        for data in ({1: 'non-string key'}, {'big': 2 ** 70}):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            FastJSONRenderer().render({'a': 1}, 'application/json; indent=2'),
+            JSONRenderer().render({'a': 1}, 'application/json; indent=2'),
+        )
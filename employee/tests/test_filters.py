@@ -0,0 +1,102 @@
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from employee.models import Status, Position, Department, Employee
+from employee.tests.test_api import APITestSetup
+
+
+class EmployeeFilterAPITests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        self.resigned = Status.objects.create(name="resigned")
+        self.senior = Position.objects.create(name="Senior Developer", salary=90000)
+        self.hr = Department.objects.create(name="Human Resources")
+        self.hr_staff = Employee.objects.create(
+            name="Wanida Chai", address="Bangkok", status=self.resigned,
+            position=self.senior, department=self.hr,
+        )
+        self.it_staff = Employee.objects.create(
+            name="Chaiya Dee", address="Bangkok", status=self.status,
+            position=self.position, department=self.department,
+        )
+
+    def filter(self, **params):
+        response = self.client.get(reverse('employee-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {row['id'] for row in response.data['results']}
+
+    def test_status_and_department_in(self):
+        self.assertEqual(
+            self.filter(status__in=f'{self.status.id},{self.resigned.id}'),
+            {self.employee.id, self.hr_staff.id, self.it_staff.id},
+        )
+        self.assertEqual(self.filter(department__in=str(self.hr.id)), {self.hr_staff.id})
+
+    def test_department_and_status(self):
+        self.assertEqual(
+            self.filter(department=self.department.id, status=self.status.id), {self.it_staff.id}
+        )
+
+    def test_is_manager(self):
+        self.assertEqual(self.filter(is_manager='true'), {self.employee.id})
+        self.assertEqual(self.filter(is_manager='false'), {self.hr_staff.id, self.it_staff.id})
+
+    def test_salary_range(self):
+        self.assertEqual(self.filter(salary_min=60000), {self.hr_staff.id})
+        self.assertEqual(
+            self.filter(salary_min=40000, salary_max=60000), {self.employee.id, self.it_staff.id}
+        )
+
+    def test_order_by_name(self):
+        response = self.client.get(reverse('employee-list'), {'ordering': 'name'})
+        names = [row['name'] for row in response.data['results']]
+        self.assertEqual(names, sorted(names))
+
+
+class EmployeeIndexUsageTests(TestCase):
+    """
+    Check the planner picks the composite indexes for the filter shapes the
+    API generates, including the keyset ``ORDER BY id``.
+    """
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            # Empty test tables would make a sequential scan cheapest.
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index):
+        plan = self.explain(queryset)
+        self.assertIn(index, plan)
+        self.assertNotIn('TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_status_filter(self):
+        self.assertUsesIndex(
+            Employee.objects.filter(status=1).order_by('id')[:50], 'employee_status_idx'
+        )
+
+    def test_department_filter(self):
+        self.assertUsesIndex(
+            Employee.objects.filter(department=1).order_by('id')[:50], 'employee_department_idx'
+        )
+
+    def test_department_and_status_filter(self):
+        self.assertUsesIndex(
+            Employee.objects.filter(department=1, status=2).order_by('id')[:50],
+            'employee_dept_status_idx',
+        )
+
+    def test_is_manager_filter(self):
+        self.assertUsesIndex(
+            Employee.objects.filter(is_manager=True).order_by('id')[:50], 'employee_manager_idx'
+        )
+
+    def test_name_ordering(self):
+        self.assertUsesIndex(Employee.objects.order_by('name', 'id')[:50], 'employee_name_idx')
+
+    def test_salary_range(self):
+        plan = self.explain(Position.objects.filter(salary__gte=1000, salary__lte=2000))
+        self.assertIn('employee_position_salary', plan)
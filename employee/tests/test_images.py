@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+
+from employee import images
+from employee.models import Employee
+from employee.tests.test_api import APITestSetup
+
+
+def generate_photo(size=(1200, 800), image_format='JPEG', exif=True):
+    image = Image.new('RGB', size, color='green')
+    options = {}
+    if exif:
+        metadata = Image.Exif()
+        metadata[0x010F] = 'Test Camera'
+        options['exif'] = metadata
+    byte_io = BytesIO()
+    image.save(byte_io, image_format, **options)
+    return SimpleUploadedFile('photo.jpg', byte_io.getvalue(), content_type='image/jpeg')
+
+
+class EmployeeImagePipelineTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        overrides = override_settings(MEDIA_ROOT=self.media_root, EMPLOYEE_IMAGE_ASYNC=False)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def upload(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse('employee-detail', args=[self.employee.id]), {'image': image},
+                format='multipart',
+            )
+        return response
+
+    def test_upload_builds_variants(self):
+        response = self.upload(generate_photo())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.employee.refresh_from_db()
+        self.assertEqual(set(self.employee.image_variants), {'thumbnail', 'small', 'medium'})
+        with default_storage.open(self.employee.image_variants['thumbnail']['webp']) as thumbnail:
+            img = Image.open(thumbnail)
+            self.assertEqual(img.format, 'WEBP')
+            self.assertEqual(img.size, (64, 43))
+        with default_storage.open(self.employee.image_variants['medium']['jpeg']) as medium:
+            self.assertEqual(Image.open(medium).size, (768, 512))
+
+    def test_exif_is_stripped(self):
+        self.upload(generate_photo())
+        self.employee.refresh_from_db()
+        with self.employee.image.open('rb') as original:
+            self.assertEqual(dict(Image.open(original).getexif()), {})
+
+    def test_serializer_exposes_variant_urls(self):
+        self.upload(generate_photo())
+        response = self.client.get(reverse('employee-detail', args=[self.employee.id]))
+        url = response.data['image_variants']['small']['webp']
+        self.assertTrue(url.startswith('http://testserver/'))
+        self.assertTrue(url.endswith('-small.webp'))
+
+    def test_replacing_image_removes_old_variants(self):
+        self.upload(generate_photo())
+        self.employee.refresh_from_db()
+        old = self.employee.image_variants['thumbnail']['jpeg']
+
+        self.upload(generate_photo(size=(300, 300), exif=False))
+        self.employee.refresh_from_db()
+        self.assertNotEqual(self.employee.image_variants['thumbnail']['jpeg'], old)
+        self.assertFalse(default_storage.exists(old))
+
+    def test_stripped_original_replaces_the_upload(self):
+        executor = mock.Mock()
+        with self.settings(EMPLOYEE_IMAGE_ASYNC=True), \
+                mock.patch.object(images, 'get_executor', return_value=executor):
+            self.upload(generate_photo())
+        uploaded = Employee.objects.get(id=self.employee.id).image.name
+
+        images.process_employee_image(self.employee.id)
+        self.employee.refresh_from_db()
+        self.assertNotEqual(self.employee.image.name, uploaded)
+        self.assertTrue(default_storage.exists(self.employee.image.name))
+        self.assertFalse(default_storage.exists(uploaded))
+
+    def test_replaced_upload_keeps_its_files(self):
+        executor = mock.Mock()
+        with self.settings(EMPLOYEE_IMAGE_ASYNC=True), \
+                mock.patch.object(images, 'get_executor', return_value=executor):
+            self.upload(generate_photo())
+        uploaded = Employee.objects.get(id=self.employee.id).image.name
+        build_variants = images.build_variants
+
+        def replaced_meanwhile(source):
+            Employee.objects.filter(id=self.employee.id).update(image='employee_images/newer.jpg')
+            return build_variants(source)
+
+        with mock.patch.object(images, 'build_variants', side_effect=replaced_meanwhile):
+            images.process_employee_image(self.employee.id)
+        stored = [
+            os.path.relpath(os.path.join(directory, name), self.media_root)
+            for directory, _, names in os.walk(self.media_root) for name in names
+        ]
+        self.assertEqual(stored, [uploaded])
+        self.assertEqual(Employee.objects.get(id=self.employee.id).image_variants, {})
+
+    def test_rejects_oversized_files(self):
+        with self.settings(EMPLOYEE_IMAGE_MAX_BYTES=1024):
+            response = self.upload(generate_photo())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('image', response.data)
+
+    def test_rejects_oversized_dimensions(self):
+        with self.settings(EMPLOYEE_IMAGE_MAX_PIXELS=100 * 100):
+            response = self.upload(generate_photo(size=(200, 200)))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_processing_runs_on_the_worker_pool(self):
+        executor = mock.Mock()
+        with self.settings(EMPLOYEE_IMAGE_ASYNC=True), \
+                mock.patch.object(images, 'get_executor', return_value=executor):
+            response = self.upload(generate_photo())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        executor.submit.assert_called_once_with(images._run, self.employee.id)
+        self.assertEqual(Employee.objects.get(id=self.employee.id).image_variants, {})
@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from employee.models import Department, Employee, ImportCheckpoint, PayrollSummary, Position, Status
+from employee.signals import post_bulk_save
+from employee.summary import verify_summary
+
+
+class ImportEmployeesTests(TestCase):
+    def setUp(self):
+        self.status = Status.objects.create(name="normal")
+        self.position = Position.objects.create(name="Developer", salary=50000)
+        self.department = Department.objects.create(name="Engineering")
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as source:
+            source.write(content)
+        return path
+
+    def run_import(self, *args, **options):
+        out, err = StringIO(), StringIO()
+        call_command('import_employees', *args, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def csv_rows(self, count, start=0):
+        lines = ['name,address,status,position,department,is_manager']
+        lines += [f'Employee {i},Bangkok,normal,Developer,Engineering,{i % 2}'
+                  for i in range(start, start + count)]
+        return '\n'.join(lines) + '\n'
+
+    def test_csv_import_in_batches(self):
+        path = self.write('staff.csv', self.csv_rows(25))
+        with CaptureQueriesContext(connection) as queries:
+            out, err = self.run_import(path, batch_size=10)
+        self.assertEqual(err, '')
+        # Names are resolved once, then served from the in-memory cache.
+        self.assertEqual(sum('FROM "employee_status"' in q['sql'] for q in queries), 1)
+        self.assertEqual(sum('INSERT INTO "employee_employee"' in q['sql'] for q in queries), 3)
+        self.assertIn('25 rows imported', out)
+        employee = Employee.objects.get(name="Employee 3")
+        self.assertEqual(
+            (employee.status, employee.position, employee.department, employee.is_manager),
+            (self.status, self.position, self.department, True),
+        )
+        self.assertEqual(verify_summary(), {})
+        self.assertEqual(PayrollSummary.objects.get(dimension='status', key=self.status.id).headcount, 25)
+
+    def test_jsonl_with_invalid_rows(self):
+        rows = [
+            json.dumps({"name": "Good", "address": "Phuket", "status": "normal"}),
+            json.dumps({"name": "", "address": "Phuket"}),
+            '{not json',
+            json.dumps({"name": "Unknown", "address": "Phuket", "department": "Sales"}),
+            json.dumps({"name": "Bad flag", "address": "Phuket", "is_manager": "maybe"}),
+        ]
+        path = self.write('staff.jsonl', '\n'.join(rows) + '\n')
+        out, err = self.run_import(path)
+        self.assertIn('1 rows imported, 4 skipped', out)
+        self.assertIn('Row 2: name:', err)
+        self.assertIn('Row 3: invalid JSON', err)
+        self.assertIn("Row 4: department: 'Sales' does not exist", err)
+        self.assertIn('Row 5: is_manager:', err)
+        self.assertTrue(Employee.objects.filter(name="Good", position=None).exists())
+
+    def test_create_missing_lookups(self):
+        path = self.write('staff.jsonl', '\n'.join(json.dumps(row) for row in [
+            {"name": "A", "address": "Krabi", "department": "Sales", "position": "Clerk",
+             "salary": "18000"},
+            {"name": "B", "address": "Krabi", "department": "Sales", "position": "Clerk"},
+            {"name": "C", "address": "Krabi", "position": "Driver"},
+        ]))
+        out, err = self.run_import(path, create_missing=True)
+        self.assertIn('2 rows imported, 1 skipped', out)
+        self.assertIn('salary', err)
+        self.assertEqual(Department.objects.filter(name="Sales").count(), 1)
+        self.assertEqual(Employee.objects.filter(position__name="Clerk").count(), 2)
+
+    def test_dry_run_writes_nothing(self):
+        path = self.write('staff.csv', self.csv_rows(3).replace('Engineering', 'Research'))
+        out, _ = self.run_import(path, dry_run=True, create_missing=True)
+        self.assertIn('3 rows validated', out)
+        self.assertIn('Would create 1 department rows: Research', out)
+        self.assertFalse(Employee.objects.exists())
+        self.assertFalse(Department.objects.filter(name="Research").exists())
+
+    def test_resume_from_checkpoint(self):
+        ImportCheckpoint.objects.create(name='staff', position=20)
+        path = self.write('staff.csv', self.csv_rows(25))
+        out, _ = self.run_import(path, checkpoint='staff', batch_size=10)
+        self.assertIn('Resuming after input row 20.', out)
+        self.assertEqual(
+            sorted(Employee.objects.values_list('name', flat=True)),
+            [f'Employee {i}' for i in range(20, 25)],
+        )
+        self.assertEqual(ImportCheckpoint.objects.get(name='staff').position, 25)
+
+    def test_checkpoint_commits_with_its_batch(self):
+        path = self.write('staff.csv', self.csv_rows(25))
+        send = post_bulk_save.send
+        calls = []
+
+        def crash_on_second_batch(*args, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 2:
+                raise RuntimeError('worker killed')
+            return send(*args, **kwargs)
+
+        with mock.patch.object(post_bulk_save, 'send', side_effect=crash_on_second_batch), \
+                self.assertRaises(RuntimeError):
+            self.run_import(path, checkpoint='staff', batch_size=10)
+        self.assertEqual(ImportCheckpoint.objects.get(name='staff').position, 10)
+
+        self.run_import(path, checkpoint='staff', batch_size=10)
+        self.assertEqual(Employee.objects.count(), 25)
+        self.assertEqual(Employee.objects.values('name').distinct().count(), 25)
+
+    def test_reads_stdin(self):
+        out, _ = self.run_import('-', format='csv', stdin=StringIO(self.csv_rows(2)))
+        self.assertIn('2 rows imported', out)
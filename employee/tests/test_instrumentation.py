@@ -0,0 +1,97 @@
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from employee.authentication import token_cache
+from employee.instrumentation import Recorder, phase
+from employee.tests.test_api import APITestSetup
+
+
+def parse_record(log_record):
+    message = log_record.getMessage()
+    return json.loads(message[message.index('{'):])
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+@override_settings(PERF_SAMPLE_RATE=1, PERF_SLOW_REQUEST_MS=60000)
+class PerformanceMiddlewareTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+
+    def test_server_timing_and_log_record(self):
+        with self.assertLogs('employee.performance', 'INFO') as logs, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('employee-list'))
+
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(set(metrics), {'db', 'auth', 'queryset', 'serializer', 'render', 'total'})
+        self.assertEqual(metrics['db']['desc'], f'"{len(queries)} queries"')
+        self.assertLessEqual(
+            sum(float(metric['dur']) for name, metric in metrics.items() if name != 'total'),
+            float(metrics['total']['dur']),
+        )
+
+        [line] = logs.records
+        self.assertEqual(line.levelname, 'INFO')
+        record = parse_record(line)
+        self.assertEqual(record['path'], reverse('employee-list'))
+        self.assertEqual(record['status'], 200)
+        self.assertEqual(record['db_queries'], len(queries))
+        self.assertEqual(record['response_bytes'], len(response.content))
+        self.assertNotIn('slow_sql', record)
+
+    @override_settings(PERF_SLOW_REQUEST_MS=0, PERF_SLOW_SQL_LIMIT=1)
+    def test_slow_requests_log_their_sql(self):
+        with self.assertLogs('employee.performance', 'WARNING') as logs:
+            self.client.get(reverse('employee-detail', args=[self.employee.id]))
+        record = parse_record(logs.records[0])
+        self.assertEqual(len(record['slow_sql']), 1)
+        self.assertIn('SELECT', record['slow_sql'][0]['sql'])
+
+    @override_settings(PERF_SERVER_TIMING=False)
+    def test_server_timing_header_can_be_disabled(self):
+        with self.assertLogs('employee.performance', 'INFO'):
+            response = self.client.get(reverse('status-list'))
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(PERF_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_untouched(self):
+        with self.assertNoLogs('employee.performance'):
+            response = self.client.get(reverse('employee-list'))
+        self.assertNotIn('Server-Timing', response)
+
+    async def test_async_endpoints_are_timed(self):
+        with self.assertLogs('employee.performance', 'INFO'):
+            response = await self.async_client.get(
+                reverse('async-employee-list'), headers={'Authorization': 'Token ' + self.token.key}
+            )
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(set(metrics), {'db', 'auth', 'queryset', 'serializer', 'render', 'total'})
+        self.assertNotEqual(metrics['db']['desc'], '"0 queries"')
+
+
+class RecorderTests(APITestSetup):
+    def test_phases_exclude_nested_phases_and_sql(self):
+        with Recorder().activate() as recorder:
+            with phase('outer'):
+                with phase('inner'):
+                    list(self.user.__class__.objects.all())
+        self.assertEqual(set(recorder.phases), {'outer', 'inner'})
+        self.assertEqual(len(recorder.queries), 1)
+        self.assertGreater(recorder.db_time, 0)
+        self.assertLessEqual(sum(recorder.phases.values()) + recorder.db_time, recorder.elapsed())
+
+    def test_phase_is_a_no_op_outside_a_sampled_request(self):
+        with phase('outer'):
+            pass
@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from employee.models import Department, Employee
+from employee.tests.test_api import APITestSetup
+
+
+class OrgChartTests(APITestSetup):
+    url = reverse('department-org-chart')
+
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+        # Information Technology (managed by Anan, who works there)
+        #   Platform (managed by Somchai, who works in IT)
+        #     Infrastructure (managed by Malee, who works in Platform)
+        self.employee.department = self.department
+        self.employee.save()
+        self.platform_lead = Employee.objects.create(
+            name="Somchai", address="Bangkok", department=self.department, status=self.status
+        )
+        self.platform = Department.objects.create(name="Platform", manager=self.platform_lead)
+        self.infra_lead = Employee.objects.create(
+            name="Malee", address="Bangkok", department=self.platform, status=self.status
+        )
+        self.infra = Department.objects.create(name="Infrastructure", manager=self.infra_lead)
+        self.client.get(reverse('api-root'))
+
+    def names(self, nodes):
+        return [(node['name'], self.names(node['children'])) for node in nodes]
+
+    def test_tree(self):
+        # The cache versions and the chart.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.names(response.data['results']), [
+            ("Information Technology", [("Platform", [("Infrastructure", [])])]),
+        ])
+        self.assertEqual(response.data['results'][0]['manager'],
+                         {"id": self.employee.id, "name": "Anan Krahan"})
+        self.assertEqual(response.data['cycles'], [])
+
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_root_and_depth(self):
+        response = self.client.get(self.url, {'root': self.platform.id})
+        self.assertEqual(self.names(response.data['results']), [
+            ("Platform", [("Infrastructure", [])]),
+        ])
+
+        response = self.client.get(self.url, {'depth': 1})
+        root = response.data['results'][0]
+        self.assertEqual(self.names([root]), [("Information Technology", [("Platform", [])])])
+        self.assertEqual(root['children'][0]['child_count'], 1)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {'root': 9999}).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(self.url, {'depth': 'x'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+    def test_cycles_are_reported_and_broken(self):
+        # IT's manager now works in Infrastructure: IT -> Infra -> Platform -> IT
+        self.employee.department = self.infra
+        self.employee.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['cycles'],
+                         [[self.department.id, self.infra.id, self.platform.id]])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['id'], self.department.id)
+
+    def test_manager_changes_invalidate(self):
+        self.client.get(self.url)
+        self.infra.manager = self.employee
+        self.infra.save()
+        response = self.client.get(self.url)
+        self.assertEqual(self.names(response.data['results']), [
+            ("Information Technology", [("Infrastructure", []), ("Platform", [])]),
+        ])
+
+        self.infra_lead.name = "Malee S."
+        self.infra_lead.save()
+        self.platform.manager = self.infra_lead
+        self.platform.save()
+        response = self.client.get(self.url, {'root': self.platform.id})
+        self.assertEqual(response.data['results'][0]['manager']['name'], "Malee S.")
+
+    def test_moving_a_manager_invalidates(self):
+        self.client.get(self.url)
+        self.client.patch(reverse('employee-detail', args=[self.infra_lead.id]),
+                          {"department_id": self.department.id}, format='json')
+        response = self.client.get(self.url)
+        self.assertEqual(self.names(response.data['results']), [
+            ("Information Technology", [("Infrastructure", []), ("Platform", [])]),
+        ])
+
+    def test_other_employee_changes_keep_cache(self):
+        self.client.get(self.url)
+        Employee.objects.create(name="New hire", address="Krabi", department=self.platform)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
@@ -0,0 +1,93 @@
+from django.urls import reverse
+from rest_framework import status
+
+from employee.models import Status, Employee
+from employee.tests.test_api import APITestSetup
+
+
+class KeysetPaginationTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        self.other_status = Status.objects.create(name="resigned")
+        statuses = [self.status, self.other_status, None]
+        for i in range(11):
+            Employee.objects.create(
+                name=f"Employee {i:02d}",
+                address="Bangkok",
+                status=statuses[i % 3],
+            )
+        self.expected = list(Employee.objects.order_by('id').values_list('id', flat=True))
+
+    def collect(self, params, direction='next'):
+        ids = []
+        response = self.client.get(reverse('employee-list'), params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row['id'] for row in response.data['results'])
+            if not response.data[direction]:
+                return ids, response
+            response = self.client.get(response.data[direction])
+
+    def test_response_envelope(self):
+        response = self.client.get(reverse('employee-list'), {'page_size': 5})
+        self.assertEqual(set(response.data), {'next', 'previous', 'results'})
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNone(response.data['previous'])
+        self.assertIsNotNone(response.data['next'])
+
+    def test_walks_every_row_once_in_id_order(self):
+        ids, _ = self.collect({'page_size': 4})
+        self.assertEqual(ids, self.expected)
+
+    def test_walks_back_with_previous_links(self):
+        _, last_page = self.collect({'page_size': 4})
+        pages = [[row['id'] for row in last_page.data['results']]]
+        response = last_page
+        while response.data['previous']:
+            response = self.client.get(response.data['previous'])
+            pages.insert(0, [row['id'] for row in response.data['results']])
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+
+    def test_orders_by_nullable_filterset_field(self):
+        ids, _ = self.collect({'page_size': 3, 'ordering': 'status'})
+        expected = sorted(
+            Employee.objects.values_list('status_id', 'id'),
+            key=lambda row: (row[0] is None, row[0] or 0, row[1]),
+        )
+        self.assertEqual(ids, [pk for _, pk in expected])
+
+    def test_orders_descending(self):
+        ids, _ = self.collect({'page_size': 3, 'ordering': '-status'})
+        expected = sorted(
+            Employee.objects.values_list('status_id', 'id'),
+            key=lambda row: (row[0] is not None, -(row[0] or 0), row[1]),
+        )
+        self.assertEqual(ids, [pk for _, pk in expected])
+
+    def test_ignores_unknown_ordering(self):
+        ids, _ = self.collect({'page_size': 4, 'ordering': 'address'})
+        self.assertEqual(ids, self.expected)
+
+    def test_page_size_is_capped(self):
+        with self.settings(API_MAX_PAGE_SIZE=2):
+            response = self.client.get(reverse('employee-list'), {'page_size': 1000})
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('employee-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deep_page_costs_the_same_as_first(self):
+        url = reverse('employee-list')
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'page_size': 2})
+        while response.data['next']:
+            next_url = response.data['next']
+            with self.assertNumQueries(1):
+                response = self.client.get(next_url)
+
+    def test_lookup_endpoints_are_paginated(self):
+        for name in ('status-list', 'position-list', 'department-list'):
+            response = self.client.get(reverse(name))
+            self.assertIn('results', response.data)
@@ -0,0 +1,67 @@
+from django.urls import reverse
+from rest_framework import status
+
+from employee.models import Status, Position, Department, Employee
+from employee.tests.test_api import APITestSetup
+
+
+class EmployeeQueryBudgetTests(APITestSetup):
+    # One query loads the employees with their status, position and
+    # department joined in; the token comes from the authentication cache.
+    LIST_QUERIES = 1
+    # Filtering on a foreign key also validates the chosen object.
+    FILTER_QUERIES = 2
+
+    def setUp(self):
+        super().setUp()
+        self.client.get(reverse('api-root'))
+
+    def create_employees(self, count):
+        for i in range(count):
+            employee_status = Status.objects.create(name=f"status {i}")
+            position = Position.objects.create(name=f"position {i}", salary=1000 + i)
+            department = Department.objects.create(name=f"department {i}", manager=self.employee)
+            Employee.objects.create(
+                name=f"Employee {i}",
+                address=f"{i} Rama IX Road, Bangkok",
+                position=position,
+                status=employee_status,
+                department=department,
+            )
+
+    def assert_constant_queries(self, expected, url, params=None):
+        for count in (1, 10):
+            self.create_employees(count)
+            with self.assertNumQueries(expected):
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_query_count(self):
+        self.assert_constant_queries(self.LIST_QUERIES, reverse('employee-list'))
+
+    def test_retrieve_query_count(self):
+        self.employee.department = self.department
+        self.employee.save()
+        self.assert_constant_queries(
+            self.LIST_QUERIES, reverse('employee-detail', args=[self.employee.id])
+        )
+
+    def test_filter_query_count(self):
+        self.assert_constant_queries(
+            self.FILTER_QUERIES, reverse('employee-list'), {'status': self.status.id}
+        )
+
+    def test_search_query_count(self):
+        self.assert_constant_queries(
+            self.LIST_QUERIES, reverse('employee-list'), {'search': 'Employee'}
+        )
+
+    def test_list_renders_related_objects(self):
+        self.create_employees(3)
+        response = self.client.get(reverse('employee-list'))
+        rows = [row for row in response.data['results'] if row['name'].startswith('Employee')]
+        self.assertEqual(len(rows), 3)
+        for row in rows:
+            self.assertTrue(row['status']['name'].startswith('status'))
+            self.assertTrue(row['position']['name'].startswith('position'))
+            self.assertEqual(row['department']['manager'], self.employee.id)
@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework import status
+
+from employee import summary
+from employee.authentication import token_cache
+from employee.models import ChangeLog, Department, Employee, Position
+from employee.tests.test_api import APITestSetup
+
+
+class RevaluationTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        self.url = reverse('position-revalue')
+        self.sales = Department.objects.create(name='Sales')
+        self.clerk = Position.objects.create(name='Clerk', salary=Decimal('20000.00'))
+        self.employee.department = self.department
+        self.employee.save()
+        Employee.objects.create(name='Kanya', address='Krabi', status=self.status,
+                                position=self.clerk, department=self.sales)
+        Employee.objects.create(name='Niran', address='Phuket', status=self.status,
+                                position=self.clerk, department=self.sales)
+
+    def salaries(self):
+        return dict(Position.objects.values_list('name', 'salary'))
+
+    def test_dry_run_projects_without_writing(self):
+        response = self.client.post(self.url, {'percent': '10', 'dry_run': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['positions'], 2)
+        self.assertEqual(response.data['employees'], 3)
+        self.assertEqual(response.data['spill_over'], 0)
+        self.assertEqual(response.data['payroll_before'], '90000.00')
+        self.assertEqual(response.data['payroll_after'], '99000.00')
+        self.assertEqual(response.data['difference'], '9000.00')
+        self.assertEqual(response.data['departments'], [
+            {'id': self.department.id, 'headcount': 1,
+             'payroll_before': '50000.00', 'payroll_after': '55000.00'},
+            {'id': self.sales.id, 'headcount': 2,
+             'payroll_before': '40000.00', 'payroll_after': '44000.00'},
+        ])
+        self.assertEqual(self.salaries()['Clerk'], Decimal('20000.00'))
+
+    def test_applies_one_update_filtered_by_holders(self):
+        cursor = ChangeLog.objects.latest('id').id
+        detail = reverse('position-detail', args=[self.clerk.id])
+        self.assertEqual(self.client.get(detail).data['salary'], '20000.00')
+        response = self.client.post(self.url, {'amount': '1500', 'department_id': self.sales.id},
+                                    format='json')
+        self.assertEqual(response.data['difference'], '3000.00')
+        self.assertEqual(self.salaries(), {
+            'Software Developer': Decimal('50000.00'), 'Clerk': Decimal('21500.00'),
+        })
+        self.assertEqual(summary.verify_summary(), {})
+        self.assertEqual(self.client.get(detail).data['salary'], '21500.00')
+        self.assertEqual(
+            list(ChangeLog.objects.filter(id__gt=cursor).values_list('model', 'object_id')),
+            [('position', self.clerk.id)],
+        )
+
+    def test_spill_over_counts_holders_outside_the_filter(self):
+        Employee.objects.create(name='Malee', address='Trang', status=self.status,
+                                position=self.clerk, department=self.department)
+        Employee.objects.create(name='Somchai', address='Satun', status=self.status,
+                                position=self.clerk)
+        response = self.client.post(self.url, {'percent': '5', 'department_id': self.sales.id,
+                                               'dry_run': True}, format='json')
+        self.assertEqual((response.data['employees'], response.data['spill_over']), (4, 2))
+
+        response = self.client.post(self.url, {'percent': '5', 'status_id': self.status.id,
+                                               'dry_run': True}, format='json')
+        self.assertEqual((response.data['employees'], response.data['spill_over']), (5, 0))
+
+    def test_query_count_does_not_depend_on_positions(self):
+        for i in range(10):
+            Position.objects.create(name=f'Extra {i}', salary=1000)
+        self.client.get(reverse('api-root'))
+        # Savepoint, lock, three projection aggregates, two summary groups,
+        # one update per summary row touched, the UPDATE, the change log,
+        # the cache version and the release.
+        with self.assertNumQueries(14):
+            self.client.post(self.url, {'percent': '2.5'}, format='json')
+        self.assertEqual(Position.objects.get(name='Extra 3').salary, Decimal('1025.00'))
+        self.assertEqual(summary.verify_summary(), {})
+
+    def test_salaries_are_rounded_and_floored(self):
+        self.client.post(self.url, {'percent': '3.333', 'position_ids': [self.clerk.id]},
+                         format='json')
+        self.assertEqual(self.salaries()['Clerk'], Decimal('20666.60'))
+        self.client.post(self.url, {'amount': '-99999', 'position_ids': [self.clerk.id]},
+                         format='json')
+        self.assertEqual(self.salaries()['Clerk'], Decimal('0.00'))
+        self.assertEqual(summary.verify_summary(), {})
+
+    def test_invalid_adjustments(self):
+        for data in ({}, {'percent': '1', 'amount': '1'}, {'percent': '-150'},
+                     {'amount': '99999999'}):
+            response = self.client.post(self.url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, data)
+        self.assertEqual(self.salaries()['Software Developer'], Decimal('50000.00'))
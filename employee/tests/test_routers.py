@@ -0,0 +1,165 @@
+import unittest
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITransactionTestCase
+
+from employee import routers
+from employee.middleware import ReplicaRoutingMiddleware
+from employee.models import Department, Employee, Position, Status
+from employee.routers import PrimaryReplicaRouter, use_replica
+
+# Set when SQLITE_REPLICA_PATH gives the tests a replica database of its own.
+SEPARATE_REPLICA = (
+    'replica_1' in settings.DATABASES
+    and settings.DATABASES['replica_1'].get('TEST', {}).get('MIRROR') is None
+)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        routers.reset_health()
+        self.router = PrimaryReplicaRouter()
+        token = use_replica.set(True)
+        self.addCleanup(use_replica.reset, token)
+
+    def test_reads_go_to_healthy_replica(self):
+        with mock.patch.object(routers, 'is_healthy', return_value=True):
+            self.assertEqual(self.router.db_for_read(Employee), 'replica_1')
+        self.assertEqual(self.router.db_for_write(Employee), 'default')
+
+    def test_reads_outside_replica_requests_use_primary(self):
+        use_replica.set(False)
+        self.assertEqual(self.router.db_for_read(Employee), 'default')
+
+    def test_falls_back_to_primary_when_replica_is_down(self):
+        with mock.patch.object(routers, 'is_healthy', return_value=False):
+            self.assertEqual(self.router.db_for_read(Employee), 'default')
+
+    def test_transactions_read_from_primary(self):
+        primary = mock.Mock(in_atomic_block=True)
+        with mock.patch.object(routers, 'is_healthy', return_value=True), \
+                mock.patch.object(routers, 'connections', {'default': primary}):
+            self.assertEqual(self.router.db_for_read(Employee), 'default')
+
+
+class ReplicaHealthTests(SimpleTestCase):
+    def setUp(self):
+        routers.reset_health()
+        self.addCleanup(routers.reset_health)
+
+    def test_failed_check_is_remembered(self):
+        connection = mock.Mock()
+        connection.ensure_connection.side_effect = OperationalError('down')
+        with mock.patch.object(routers, 'connections', {'replica_1': connection}), \
+                self.assertLogs('employee.routers', 'WARNING'):
+            self.assertFalse(routers.is_healthy('replica_1'))
+            self.assertFalse(routers.is_healthy('replica_1'))
+        self.assertEqual(connection.ensure_connection.call_count, 1)
+
+    def test_replica_is_checked_again_after_interval(self):
+        connection = mock.Mock()
+        with mock.patch.object(routers, 'connections', {'replica_1': connection}), \
+                self.settings(DATABASE_REPLICA_CHECK_INTERVAL=0):
+            self.assertTrue(routers.is_healthy('replica_1'))
+            self.assertTrue(routers.is_healthy('replica_1'))
+        self.assertEqual(connection.ensure_connection.call_count, 2)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = ReplicaRoutingMiddleware(self.record)
+        self.routed = []
+
+    def record(self, request):
+        self.routed.append(use_replica.get())
+        return HttpResponse()
+
+    def get(self, response=None, **headers):
+        request = self.factory.get('/api/employee/', **headers)
+        if response is not None:
+            request.COOKIES = {name: morsel.value for name, morsel in response.cookies.items()}
+        return self.middleware(request)
+
+    def test_clients_read_their_own_writes(self):
+        self.get()
+        written = self.middleware(self.factory.post('/api/employee/'))
+        # The next read may land on any worker; the cookie travels with it.
+        self.get(written)
+        self.get()
+        self.assertEqual(self.routed, [True, False, False, True])
+        self.assertFalse(use_replica.get())
+
+    def test_forged_pin_is_ignored(self):
+        request = self.factory.get('/api/employee/')
+        request.COOKIES = {'replica_pin': 'forged'}
+        self.middleware(request)
+        self.assertEqual(self.routed, [True])
+
+    def test_pin_expires(self):
+        with self.settings(DATABASE_REPLICA_PIN_SECONDS=-1):
+            written = self.middleware(self.factory.post('/api/employee/'))
+            self.get(written)
+        self.assertEqual(self.routed, [False, True])
+
+    def test_shared_cache_pins_tokens(self):
+        alice = {'HTTP_AUTHORIZATION': 'Token alice'}
+        bob = {'HTTP_AUTHORIZATION': 'Token bob'}
+        cache.clear()
+        with mock.patch('employee.middleware.is_shared', return_value=True):
+            self.middleware(self.factory.post('/api/employee/', **alice))
+            self.get(**alice)
+            self.get(**bob)
+        self.assertEqual(self.routed, [False, False, True])
+
+    def test_clients_behind_one_address_are_not_pinned_together(self):
+        self.middleware(self.factory.post('/api/employee/', HTTP_AUTHORIZATION='Token alice'))
+        self.get(HTTP_AUTHORIZATION='Token bob')
+        self.assertEqual(self.routed, [False, True])
+
+    def test_without_replicas_nothing_is_routed(self):
+        with self.settings(DATABASE_REPLICAS=[]):
+            self.middleware(self.factory.get('/api/employee/'))
+        self.assertEqual(self.routed, [False])
+
+
+@unittest.skipUnless(
+    SEPARATE_REPLICA, 'Run with SQLITE_REPLICA_PATH set to test against a separate replica.'
+)
+class ReplicaRoutingIntegrationTests(APITransactionTestCase):
+    databases = {'default', 'replica_1'} if SEPARATE_REPLICA else {'default'}
+
+    def setUp(self):
+        # Not a TestCase: its per-test transaction would keep reads on the primary.
+        cache.clear()
+        routers.reset_health()
+        for alias in ('default', 'replica_1'):
+            user = User.objects.db_manager(alias).create_user(username='reader', password='x')
+            Token.objects.using(alias).create(user=user, key='a' * 40)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + 'a' * 40)
+        # Rows only the replica has show which database answered.
+        Employee.objects.using('replica_1').create(name="Replica Only", address="Nowhere")
+        self.status = Status.objects.create(name="normal")
+        self.position = Position.objects.create(name="Developer", salary=50000)
+        self.department = Department.objects.create(name="Engineering")
+
+    def names(self):
+        return [row['name'] for row in self.client.get(reverse('employee-list')).data['results']]
+
+    def test_reads_use_replica_until_client_writes(self):
+        self.assertEqual(self.names(), ["Replica Only"])
+        self.client.post(reverse('employee-list'), {
+            "name": "New hire", "address": "Krabi", "status_id": self.status.id,
+            "position_id": self.position.id, "department_id": self.department.id,
+        })
+        self.assertEqual(self.names(), ["New hire"])
@@ -0,0 +1,91 @@
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from employee.models import Employee
+from employee.search import FTS_TABLE, TABLE, get_search_backend
+from employee.tests.test_api import APITestSetup
+
+
+class FullTextSearchTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        self.by_address = Employee.objects.create(
+            name="Malee Suksai", address="Krahan Tower, Silom", status=self.status
+        )
+        self.unrelated = Employee.objects.create(
+            name="Preecha Wong", address="Nimman Road, Chiang Mai", status=self.status
+        )
+
+    def search(self, term, **params):
+        response = self.client.get(reverse('employee-list'), {'search': term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['id'] for row in response.data['results']]
+
+    def test_matches_word_prefixes(self):
+        self.assertEqual(self.search('Ana'), [self.employee.id])
+        self.assertEqual(self.search('chiang'), [self.unrelated.id])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.search('anan krahan'), [self.employee.id])
+        self.assertEqual(self.search('anan nimman'), [])
+
+    def test_ranks_name_matches_above_address_matches(self):
+        self.assertEqual(self.search('krahan'), [self.employee.id, self.by_address.id])
+
+    def test_ranked_results_paginate(self):
+        for i in range(5):
+            Employee.objects.create(name=f"Krahan {i}", address="Bangkok", status=self.status)
+        ids, response = [], self.client.get(reverse('employee-list'), {'search': 'krahan', 'page_size': 2})
+        while True:
+            ids.extend(row['id'] for row in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(len(set(ids)), 7)
+        self.assertEqual(ids[-1], self.by_address.id)
+
+    def test_index_follows_writes(self):
+        self.unrelated.name = "Somsri Jaidee"
+        self.unrelated.save()
+        self.assertEqual(self.search('somsri'), [self.unrelated.id])
+        self.assertEqual(self.search('preecha'), [])
+
+        self.unrelated.delete()
+        self.assertEqual(self.search('somsri'), [])
+
+        Employee.objects.bulk_create([Employee(name="Kittipong Bulk", address="Rayong")])
+        Employee.objects.filter(name="Kittipong Bulk").update(address="Pattaya")
+        self.assertEqual(len(self.search('pattaya')), 1)
+
+    def test_punctuation_only_search_is_empty(self):
+        self.assertEqual(self.search('%%'), [])
+
+    @skipUnless(connection.vendor == 'sqlite', "FTS5 query plan")
+    def test_search_uses_the_index(self):
+        plan = get_search_backend('default').search(Employee.objects.all(), ['anan']).explain()
+        self.assertIn(f'SCAN {FTS_TABLE} VIRTUAL TABLE', plan)
+        self.assertNotRegex(plan, re.compile(rf'SCAN {Employee._meta.db_table}$', re.M))
+
+    @skipUnless(connection.vendor == 'postgresql', "tsvector column from migration 0009")
+    def test_search_vector_is_kept_by_the_trigger(self):
+        self.unrelated.address = 'Sathorn Square'
+        self.unrelated.save()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT search_vector::text FROM {TABLE} WHERE id = %s', [self.unrelated.id])
+            vector = cursor.fetchone()[0]
+            constraints = connection.introspection.get_constraints(cursor, TABLE)
+        self.assertIn("'sathorn':", vector)
+        self.assertIn("'preecha':", vector)
+        self.assertEqual(constraints[f'{TABLE}_search_vector_gin']['type'], 'gin')
+        self.assertEqual(self.search('sathorn'), [self.unrelated.id])
+
+    @skipUnless(connection.vendor == 'sqlite', "FTS5 table")
+    def test_postgresql_schema_is_not_applied(self):
+        with connection.cursor() as cursor:
+            columns = [column.name for column in connection.introspection.get_table_description(cursor, TABLE)]
+        self.assertNotIn('search_vector', columns)
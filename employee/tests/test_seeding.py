@@ -0,0 +1,104 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import SimpleTestCase, TestCase
+
+from employee import cache
+from employee.management.commands.benchmark_api import compare_results
+from employee.management.commands.seed_data import parse_scale
+from employee.models import ChangeLog, Department, Employee, Position, Status
+from employee.seeding import seed_database
+from employee.summary import verify_summary
+
+
+class SeedDataTests(TestCase):
+    def snapshot(self):
+        return list(Employee.objects.order_by('id').values_list(
+            'name', 'address', 'status__name', 'position__name', 'department__name', 'is_manager',
+        ))
+
+    def test_same_seed_gives_same_rows(self):
+        counts = seed_database(250, seed=7, batch_size=100)
+        self.assertEqual(counts['employees'], 250)
+        first = self.snapshot()
+
+        Department.objects.all().delete()
+        Employee.objects.all().delete()
+        Position.objects.all().delete()
+        Status.objects.all().delete()
+        seed_database(250, seed=7, batch_size=100)
+        self.assertEqual(self.snapshot(), first)
+
+        Department.objects.all().delete()
+        Employee.objects.all().delete()
+        seed_database(250, seed=8)
+        self.assertNotEqual(self.snapshot(), first)
+
+    def test_dataset_covers_every_model(self):
+        seed_database(600, seed=1)
+        self.assertEqual(Employee.objects.count(), 600)
+        self.assertEqual(Department.objects.count(), 6)
+        self.assertEqual(Status.objects.count(), 4)
+        self.assertGreater(Position.objects.count(), 10)
+        self.assertEqual(verify_summary(), {})
+
+        # Every department has a manager; those below the root are managed
+        # from the root department, forming a tree.
+        root, *children = Department.objects.order_by('id').select_related('manager')
+        self.assertEqual(root.manager.department_id, root.id)
+        for department in children:
+            self.assertEqual(department.manager.department_id, root.id)
+            self.assertTrue(department.manager.is_manager)
+        self.assertEqual(Employee.objects.filter(is_manager=True).count(), 6)
+
+    def test_caches_and_change_feed_see_the_seed(self):
+        before = cache.get_versions(Status, Position, Department)
+        seed_database(50, seed=1)
+        after = cache.get_versions(Status, Position, Department)
+        for (old, _), (new, _) in zip(before, after):
+            self.assertNotEqual(old, new)
+        logged = dict(ChangeLog.objects.filter(action=ChangeLog.CREATE).values('model')
+                      .annotate(count=Count('id')).values_list('model', 'count'))
+        self.assertEqual(logged, {
+            'status': Status.objects.count(), 'position': Position.objects.count(),
+            'department': Department.objects.count(), 'employee': 50,
+        })
+        managers = set(Employee.objects.filter(is_manager=True).values_list('id', flat=True))
+        self.assertEqual(set(ChangeLog.objects.filter(model='employee', action=ChangeLog.UPDATE)
+                             .values_list('object_id', flat=True)), managers)
+
+    def test_command_refuses_a_populated_database(self):
+        out = StringIO()
+        call_command('seed_data', '--scale', '50', stdout=out)
+        self.assertIn('Created 50 employees', out.getvalue())
+        with self.assertRaisesMessage(CommandError, 'already has employees'):
+            call_command('seed_data', '--scale', '50', stdout=out)
+        call_command('seed_data', '--scale', '50', '--force', stdout=out)
+        self.assertEqual(Employee.objects.count(), 100)
+
+
+class BenchmarkHelperTests(SimpleTestCase):
+    def test_parse_scale(self):
+        self.assertEqual(parse_scale('large'), 100_000)
+        self.assertEqual(parse_scale('25k'), 25_000)
+        self.assertEqual(parse_scale('1M'), 1_000_000)
+        self.assertEqual(parse_scale('300'), 300)
+        with self.assertRaises(CommandError):
+            parse_scale('huge')
+
+    def test_compare_results_flags_slower_runs_and_extra_queries(self):
+        def run(p50, p95, queries):
+            return {'results': {'1000': {'list': {
+                'p50_ms': p50, 'p95_ms': p95, 'queries': queries,
+            }}}}
+
+        baseline = run(10, 20, 2)
+        self.assertEqual(compare_results(baseline, run(12, 24, 2), 0.25), [])
+        self.assertEqual(compare_results(baseline, run(13, 20, 3), 0.25), [
+            ('1000', 'list', 'p50_ms', 10, 13),
+            ('1000', 'list', 'queries', 2, 3),
+        ])
+        # Scales and endpoints missing from the baseline are not compared.
+        self.assertEqual(compare_results({'results': {}}, run(99, 99, 9), 0.25), [])
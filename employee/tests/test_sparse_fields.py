@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from employee.authentication import token_cache
+from employee.models import Employee
+from employee.tests.test_api import APITestSetup
+
+
+class SparseFieldsTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        self.employee.department = self.department
+        self.employee.save()
+        self.client.get(reverse('api-root'))
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query['sql'] for query in queries]
+
+    def test_default_output_is_unchanged(self):
+        response = self.client.get(reverse('employee-detail', args=[self.employee.id]))
+        self.assertEqual(response.data['status'], {'id': self.status.id, 'name': 'normal'})
+        self.assertIn('address', response.data)
+        self.assertIn('image_variants', response.data)
+
+    def test_fields_narrow_the_output_and_the_columns(self):
+        response, [sql] = self.get(reverse('employee-list'), {'fields': 'id,name'})
+        self.assertEqual(response.data['results'], [{'id': self.employee.id, 'name': 'Anan Krahan'}])
+        self.assertNotIn('address', sql)
+        self.assertNotIn('JOIN', sql)
+
+    def test_only_expanded_relations_are_nested_and_joined(self):
+        response, [sql] = self.get(
+            reverse('employee-detail', args=[self.employee.id]),
+            {'fields': 'id,status,position,department', 'expand': 'status'},
+        )
+        self.assertEqual(response.data, {
+            'id': self.employee.id,
+            'status': {'id': self.status.id, 'name': 'normal'},
+            'position': self.position.id,
+            'department': self.department.id,
+        })
+        self.assertIn('employee_status', sql)
+        self.assertNotIn('employee_position', sql)
+        self.assertNotIn('employee_department', sql)
+
+    def test_expand_alone_keeps_every_field(self):
+        response = self.client.get(reverse('employee-detail', args=[self.employee.id]),
+                                   {'expand': 'department'})
+        self.assertEqual(response.data['department']['name'], 'Information Technology')
+        self.assertEqual(response.data['status'], self.status.id)
+        self.assertIn('image_variants', response.data)
+
+    def test_cursor_pages_do_not_load_deferred_columns(self):
+        for i in range(3):
+            Employee.objects.create(name=f'Employee {i}', address='Bangkok', status=self.status)
+        response, queries = self.get(reverse('employee-list'),
+                                     {'fields': 'id', 'ordering': 'name', 'page_size': 2})
+        self.assertEqual(len(queries), 1)
+        response, queries = self.get(response.data['next'], None)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(list(response.data['results'][0]), ['id'])
+
+    def test_writes_keep_their_input_fields(self):
+        response = self.client.post(f'{reverse("employee-list")}?fields=id,name', {
+            'name': 'New hire', 'address': 'Krabi', 'status_id': self.status.id,
+            'position_id': self.position.id, 'department_id': self.department.id,
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(response.data), {'id', 'name'})
+        self.assertEqual(Employee.objects.get(id=response.data['id']).address, 'Krabi')
+
+    def test_lookups_and_reports_support_fields(self):
+        response, _ = self.get(reverse('status-list'), {'fields': 'name'})
+        self.assertEqual(response.data['results'], [{'name': 'normal'}])
+        response, _ = self.get(reverse('department-list'), {'fields': 'id,manager'})
+        self.assertEqual(response.data['results'][0],
+                         {'id': self.department.id, 'manager': self.employee.id})
+        response, _ = self.get(reverse('payroll-department'), {'fields': 'name,headcount'})
+        self.assertEqual(response.data['total'], {'name': None, 'headcount': 1})
+
+    async def test_async_endpoints_support_fields(self):
+        response = await self.async_client.get(
+            reverse('async-employee-list'), {'fields': 'id,status', 'expand': 'status'},
+            headers={'Authorization': 'Token ' + self.token.key},
+        )
+        self.assertEqual(response.json()['results'], [
+            {'id': self.employee.id, 'status': {'id': self.status.id, 'name': 'normal'}},
+        ])
@@ -0,0 +1,52 @@
+import os
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from employee.models import Employee, Status
+from employee.typeahead import employee_typeahead
+from employee.warmup import warm_caches
+
+
+@mock.patch.dict(os.environ, {'DJANGO_NORMAL_USERNAME': 'operator',
+                              'DJANGO_NORMAL_PASSWORD': 'operatorpass'})
+class BootstrapTests(TestCase):
+    def bootstrap(self, *args):
+        output = StringIO()
+        call_command('bootstrap', *args, stdout=output)
+        return output.getvalue()
+
+    def test_skips_migrate_and_creates_the_user_once(self):
+        output = self.bootstrap()
+        self.assertIn('No migrations to apply.', output)
+        self.assertIn('Created user operator.', output)
+        self.assertTrue(User.objects.get(username='operator').check_password('operatorpass'))
+
+        # Two for the migration state and one for the user.
+        with self.assertNumQueries(3):
+            self.assertIn('User operator already exists.', self.bootstrap())
+
+    def test_skip_user(self):
+        self.bootstrap('--skip-user')
+        self.assertFalse(User.objects.filter(username='operator').exists())
+
+    def test_migrations_are_committed(self):
+        # Containers no longer run makemigrations on start.
+        call_command('makemigrations', '--check', '--dry-run', stdout=StringIO())
+
+
+class WarmupTests(TestCase):
+    def tearDown(self):
+        employee_typeahead.reset()
+
+    def test_typeahead_is_served_without_queries(self):
+        Employee.objects.create(name='Anan Krahan', address='Bangkok',
+                                status=Status.objects.create(name='normal'))
+        employee_typeahead.reset()
+        warm_caches()
+        with self.settings(TYPEAHEAD_CHECK_INTERVAL=60), self.assertNumQueries(0):
+            self.assertEqual([name for _, name in employee_typeahead.search('kra', 10)],
+                             ['Anan Krahan'])
@@ -0,0 +1,148 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db.models import QuerySet
+from django.urls import reverse
+from rest_framework import status
+
+from employee.models import Department, Employee, PayrollSummary, Position, Status
+from employee.summary import verify_summary
+from employee.tests.test_api import APITestSetup
+
+
+class PayrollSummaryTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        self.employee.department = self.department
+        self.employee.save()
+        self.junior = Position.objects.create(name="Junior Developer", salary=30000)
+
+    def summary(self, dimension, key):
+        row = PayrollSummary.objects.get(dimension=dimension, key=key)
+        return row.headcount, row.salary_total
+
+    def assertSummaryConsistent(self):
+        self.assertEqual(verify_summary(), {})
+
+    def test_create_update_and_delete(self):
+        other = Employee.objects.create(name="Second", address="Phuket", status=self.status,
+                                        department=self.department, position=self.junior)
+        self.assertEqual(self.summary('department', self.department.id), (2, Decimal('80000')))
+
+        resigned = Status.objects.create(name="resigned")
+        other.status = resigned
+        other.save()
+        self.assertEqual(self.summary('status', self.status.id), (1, Decimal('50000')))
+        self.assertEqual(self.summary('status', resigned.id), (1, Decimal('30000')))
+
+        Employee.objects.get(id=other.id).delete()
+        self.assertEqual(self.summary('status', resigned.id), (0, Decimal('0')))
+        self.assertSummaryConsistent()
+
+    def test_unrelated_changes_do_not_touch_the_summary(self):
+        employee = Employee.objects.get(id=self.employee.id)
+        employee.address = "Chiang Mai"
+        # The row lock, the update and its change log entry.
+        with self.assertNumQueries(3):
+            employee.save()
+        with self.assertNumQueries(2):
+            employee.save(update_fields=['address'])
+
+    def test_stale_instances_do_not_skew_the_summary(self):
+        # Two requests load the employee, then save one after the other.
+        first = Employee.objects.get(id=self.employee.id)
+        second = Employee.objects.get(id=self.employee.id)
+        first.department = Department.objects.create(name="Sales")
+        first.save()
+        second.status = Status.objects.create(name="resigned")
+        second.save()
+        self.assertSummaryConsistent()
+
+        stale = Employee.objects.get(id=self.employee.id)
+        Employee.objects.get(id=self.employee.id).delete()
+        stale.delete()
+        self.assertSummaryConsistent()
+
+    def test_salary_change_updates_totals(self):
+        Employee.objects.create(name="Second", address="Phuket", status=self.status,
+                                position=self.position)
+        self.position.salary = Decimal('55000')
+        self.position.save()
+        self.assertEqual(self.summary('status', self.status.id), (2, Decimal('110000')))
+        self.assertEqual(self.summary('department', 0), (1, Decimal('55000')))
+        self.assertSummaryConsistent()
+
+    def test_stale_positions_do_not_skew_the_summary(self):
+        Employee.objects.create(name="Second", address="Phuket", status=self.status,
+                                position=self.position)
+        # Two requests load the position, then save one after the other.
+        first = Position.objects.get(id=self.position.id)
+        second = Position.objects.get(id=self.position.id)
+        first.salary = Decimal('60000')
+        first.save()
+        second.salary = Decimal('55000')
+        with mock.patch.object(QuerySet, 'select_for_update', autospec=True,
+                               side_effect=QuerySet.select_for_update) as select_for_update:
+            second.save()
+        self.assertTrue(select_for_update.called)
+        self.assertEqual(self.summary('status', self.status.id), (2, Decimal('110000')))
+        self.assertSummaryConsistent()
+
+    def test_deleting_lookups(self):
+        Position.objects.get(id=self.position.id).delete()
+        self.assertEqual(self.summary('department', self.department.id), (1, Decimal('0')))
+
+        self.department.delete()
+        self.status.delete()
+        self.assertEqual(self.summary('department', 0), (1, Decimal('0')))
+        self.assertFalse(PayrollSummary.objects.filter(key=self.department.id,
+                                                      dimension='department').exists())
+        self.assertSummaryConsistent()
+
+    def test_bulk_api_writes_update_summary(self):
+        url = reverse('employee-bulk')
+        self.client.post(url, [{
+            "name": f"Onboarded {i}", "address": "Khon Kaen", "status_id": self.status.id,
+            "position_id": self.junior.id, "department_id": self.department.id,
+        } for i in range(3)], format='json')
+        self.assertEqual(self.summary('department', self.department.id), (4, Decimal('140000')))
+
+        self.client.patch(url, [{"id": self.employee.id, "position_id": self.junior.id}],
+                          format='json')
+        self.assertEqual(self.summary('department', self.department.id), (4, Decimal('120000')))
+        self.assertSummaryConsistent()
+
+    def test_report_endpoint(self):
+        Employee.objects.create(name="Floating", address="Krabi", status=self.status)
+        self.client.get(reverse('api-root'))
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('payroll-department'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {"id": self.department.id, "name": "Information Technology", "headcount": 1,
+             "salary_total": "50000.00", "salary_average": "50000.00"},
+            {"id": None, "name": None, "headcount": 1,
+             "salary_total": "0.00", "salary_average": None},
+        ])
+        self.assertEqual(response.data['total']['headcount'], 2)
+
+        response = self.client.get(reverse('payroll-status'))
+        self.assertEqual(response.data['results'][0]['salary_average'], "50000.00")
+
+    def test_rebuild_command(self):
+        PayrollSummary.objects.filter(dimension='status').update(headcount=99)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_payroll_summary', '--check', stdout=StringIO(), stderr=StringIO())
+
+        out = StringIO()
+        call_command('rebuild_payroll_summary', stdout=out)
+        self.assertIn('up to date', out.getvalue())
+        self.assertEqual(self.summary('status', self.status.id), (1, Decimal('50000')))
+
+    def test_department_without_summary_row_is_listed(self):
+        Department.objects.create(name="Finance")
+        response = self.client.get(reverse('payroll-department'))
+        self.assertEqual(response.data['results'][1]['headcount'], 0)
+        self.assertIsNone(response.data['results'][1]['salary_average'])
@@ -0,0 +1,91 @@
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from employee.authentication import token_cache
+from employee.models import ChangeLog, Employee
+from employee.tests.test_api import APITestSetup
+from employee.typeahead import EmployeeTypeahead, PrefixIndex, employee_typeahead, normalize
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize('  Ánan   KRAHAN '), 'anan krahan')
+
+    def test_matches_word_prefixes(self):
+        index = PrefixIndex([(1, 'Anan Krahan'), (2, 'Kanya Srisuk'), (3, 'Krit Anan')])
+        self.assertEqual(index.search('kr', 10), [(3, 'Krit Anan'), (1, 'Anan Krahan')])
+        self.assertEqual(index.search('anan k', 10), [(1, 'Anan Krahan')])
+        self.assertEqual(index.search('an', 1), [(1, 'Anan Krahan')])
+        self.assertEqual(index.search('', 10), [])
+
+    def test_add_and_remove(self):
+        index = PrefixIndex([(1, 'Anan Krahan')])
+        index.add(1, 'Anan Thongdee')
+        index.add(2, 'Malee Krahan')
+        self.assertEqual(index.search('krahan', 10), [(2, 'Malee Krahan')])
+        index.remove(2)
+        index.remove(5)
+        self.assertEqual(index.search('krahan', 10), [])
+        self.assertEqual((len(index.leading), len(index.inner)), (1, 1))
+
+
+@override_settings(CHANGE_FEED_DELAY=0, TYPEAHEAD_CHECK_INTERVAL=0)
+class TypeaheadTests(APITestSetup):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        employee_typeahead.reset()
+        self.url = reverse('employee-typeahead')
+
+    def names(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        return [row['name'] for row in response.data['results']]
+
+    def test_endpoint(self):
+        Employee.objects.create(name='Kanya Srisuk', address='Krabi', status=self.status)
+        self.assertEqual(self.names('KRA'), ['Anan Krahan'])
+        self.assertEqual(self.names('s'), ['Kanya Srisuk'])
+        response = self.client.get(self.url, {'q': 'a'})
+        self.assertEqual(response.data['results'][0], {'id': self.employee.id, 'name': 'Anan Krahan'})
+        self.assertEqual(len(self.names('', limit=5)), 0)
+        self.assertEqual(self.names('a', limit=0), [])
+
+    @override_settings(TYPEAHEAD_CHECK_INTERVAL=60)
+    def test_served_from_memory(self):
+        self.names('an')
+        self.client.get(reverse('api-root'))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names('an'), ['Anan Krahan'])
+
+    def test_searches_do_not_wait_for_a_refresh(self):
+        self.assertEqual(self.names('an'), ['Anan Krahan'])
+        employee_typeahead.mark_stale()
+        # Another thread is catching up: serve the current index meanwhile.
+        with employee_typeahead._lock, self.assertNumQueries(0):
+            self.assertEqual([name for _, name in employee_typeahead.search('an', 10)],
+                             ['Anan Krahan'])
+        self.assertTrue(employee_typeahead.stale)
+
+    def test_writes_reach_other_workers(self):
+        other = EmployeeTypeahead()
+        self.assertEqual(other.search('kanya', 10), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            kanya = Employee.objects.create(name='Kanya Srisuk', address='Krabi', status=self.status)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.name = 'Anan Thongdee'
+            self.employee.save()
+        self.assertEqual(self.names('kanya'), ['Kanya Srisuk'])
+        self.assertEqual([name for _, name in other.search('kanya', 10)], ['Kanya Srisuk'])
+        self.assertEqual(other.search('krahan', 10), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            kanya.delete()
+        self.assertEqual(other.search('kanya', 10), [])
+
+    def test_catch_up_falls_back_to_a_rebuild(self):
+        self.names('an')
+        ChangeLog.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            Employee.objects.create(name='Anong Saelim', address='Krabi', status=self.status)
+        self.assertEqual(self.names('ano'), ['Anong Saelim'])
@@ -0,0 +1,227 @@
+import threading
+import time
+import unicodedata
+import uuid
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import transaction
+
+from . import cache, changes
+from .models import ChangeLog, Employee
+from .routers import primary
+
+VERSION_KEY = 'typeahead:employee:version'
+# Separates the normalised key from the id inside an index entry; sorts
+# before every character a key can contain.
+SEPARATOR = '\x00'
+
+
+def normalize(text):
+    """Casefold ``text``, strip accents and marks and collapse whitespace."""
+    text = unicodedata.normalize('NFKD', text.casefold())
+    return ' '.join(''.join(char for char in text if not unicodedata.combining(char)).split())
+
+
+def index_keys(name):
+    """
+    ``(leading, inner)``: the normalised name, and the rest of it from each
+    later word on, e.g. ``anan krahan`` and ``{'krahan'}``.
+    """
+    words = normalize(name).split(' ')
+    return ' '.join(words), {' '.join(words[start:]) for start in range(1, len(words))}
+
+
+class PrefixIndex:
+    """
+    Two sorted lists of ``key + SEPARATOR + id`` strings, searched with
+    ``bisect``: the whole names, and the names from their second, third...
+    word on, so that names starting with the query rank first. Not
+    thread-safe by itself.
+    """
+
+    def __init__(self, rows=()):
+        self.names = dict(rows)
+        self.leading, self.inner = [], []
+        for pk, name in self.names.items():
+            leading, inner = index_keys(name)
+            self.leading.append(f'{leading}{SEPARATOR}{pk}')
+            self.inner.extend(f'{key}{SEPARATOR}{pk}' for key in inner)
+        self.leading.sort()
+        self.inner.sort()
+
+    def __len__(self):
+        return len(self.names)
+
+    def copy(self):
+        index = PrefixIndex()
+        index.names = dict(self.names)
+        index.leading, index.inner = list(self.leading), list(self.inner)
+        return index
+
+    def add(self, pk, name):
+        self.remove(pk)
+        self.names[pk] = name
+        leading, inner = index_keys(name)
+        insort(self.leading, f'{leading}{SEPARATOR}{pk}')
+        for key in inner:
+            insort(self.inner, f'{key}{SEPARATOR}{pk}')
+
+    def remove(self, pk):
+        name = self.names.pop(pk, None)
+        if name is None:
+            return
+        leading, inner = index_keys(name)
+        _discard(self.leading, f'{leading}{SEPARATOR}{pk}')
+        for key in inner:
+            _discard(self.inner, f'{key}{SEPARATOR}{pk}')
+
+    def search(self, query, limit):
+        """
+        Return up to ``limit`` ``(id, name)`` pairs with a word starting with
+        ``query``: names starting with it first, each group in name order.
+        """
+        prefix = normalize(query)
+        found = {}
+        if not prefix:
+            return []
+        for entries in (self.leading, self.inner):
+            position = bisect_left(entries, prefix)
+            while position < len(entries) and len(found) < limit:
+                entry = entries[position]
+                if not entry.startswith(prefix):
+                    break
+                pk = int(entry[entry.rindex(SEPARATOR) + 1:])
+                found.setdefault(pk, self.names[pk])
+                position += 1
+        return list(found.items())
+
+
+def _discard(entries, entry):
+    position = bisect_left(entries, entry)
+    if position < len(entries) and entries[position] == entry:
+        del entries[position]
+
+
+class EmployeeTypeahead:
+    """
+    Per-process ``PrefixIndex`` over employee names, built on first use.
+
+    Saves and deletes bump a version in the shared cache once committed
+    (see ``employee.signals``). At most every ``TYPEAHEAD_CHECK_INTERVAL``
+    seconds a search compares it with the version the index was brought up
+    to, and on a change applies the employee entries of the change log
+    since its cursor, so every worker converges without rebuilding.
+
+    One thread at a time updates a copy of the index and swaps it in;
+    searches meanwhile keep reading the current one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.index = None
+            self.cursor = 0
+            self.version = None
+            self.checked_at = 0
+            self.stale = False
+            self.pending = False
+
+    def load(self):
+        """Build the index now rather than on the first search."""
+        with self._lock:
+            self.rebuild()
+
+    def mark_stale(self):
+        self.stale = True
+
+    def search(self, query, limit):
+        self.refresh()
+        return self.index.search(query, limit)
+
+    def is_due(self):
+        interval = getattr(settings, 'TYPEAHEAD_CHECK_INTERVAL', 1)
+        return self.stale or time.monotonic() - self.checked_at >= interval
+
+    def refresh(self):
+        if self.index is not None and not self.is_due():
+            return
+        # Only the first search waits for the index to be built.
+        if not self._lock.acquire(blocking=self.index is None):
+            return
+        try:
+            # The cursor must not move past entries a replica has not seen.
+            with primary():
+                self.update()
+        finally:
+            self._lock.release()
+
+    def update(self):
+        if self.index is None:
+            self.rebuild()
+            return
+        if not self.is_due():
+            return
+        self.checked_at = time.monotonic()
+        version = cache.get_cache().get(VERSION_KEY)
+        if self.stale or self.pending or version is None or version != self.version:
+            self.version = version
+            self.stale = False
+            self.catch_up()
+
+    def rebuild(self):
+        # The cursor is taken first: changes made while the names are read
+        # are applied again by the next catch-up, which is harmless.
+        self.version = cache.get_cache().get(VERSION_KEY)
+        self.cursor = changes.current_cursor()
+        self.index = PrefixIndex(Employee.objects.values_list('pk', 'name').iterator(chunk_size=5000))
+        self.checked_at = time.monotonic()
+        self.stale = self.pending = False
+
+    def catch_up(self):
+        if changes.is_expired(self.cursor):
+            self.rebuild()
+            return
+        limit = getattr(settings, 'TYPEAHEAD_MAX_CATCH_UP', 5000)
+        entries = list(changes.annotate_settled(
+            ChangeLog.objects.filter(model=Employee._meta.model_name, id__gt=self.cursor)
+        ).order_by('id').values_list('id', 'object_id', 'settled')[:limit + 1])
+        if len(entries) > limit:
+            self.rebuild()
+            return
+
+        ids = {object_id for _, object_id, _ in entries}
+        names = dict(Employee.objects.filter(pk__in=ids).values_list('pk', 'name')) if ids else {}
+        if ids:
+            index = self.index.copy()
+            for pk in ids:
+                if pk in names:
+                    index.add(pk, names[pk])
+                else:
+                    index.remove(pk)
+            self.index = index
+
+        # Only move the cursor over settled entries, as /api/changes/ does;
+        # later ones are read again until they settle.
+        self.pending = False
+        for entry_id, _, settled in entries:
+            if not settled:
+                self.pending = True
+                break
+            self.cursor = entry_id
+
+
+employee_typeahead = EmployeeTypeahead()
+
+
+def _bump():
+    cache.get_cache().set(VERSION_KEY, uuid.uuid4().hex, None)
+    employee_typeahead.mark_stale()
+
+
+def invalidate():
+    """Have every worker's index catch up once the current transaction commits."""
+    transaction.on_commit(_bump)
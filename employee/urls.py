@@ -1,12 +1,15 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
+    ChangeFeedViewSet,
     EmployeeViewSet,
     DepartmentViewSet,
+    PayrollSummaryViewSet,
     PositionViewSet,
     StatusViewSet
 )
 from rest_framework.authtoken.views import obtain_auth_token
+from .async_views import AsyncReadOnlyView
 
 
 router = DefaultRouter()
@@ -14,8 +17,24 @@ router.register(r'employee', EmployeeViewSet)
 router.register(r'department', DepartmentViewSet)
 router.register(r'position', PositionViewSet)
 router.register(r'status', StatusViewSet)
+router.register(r'payroll', PayrollSummaryViewSet, basename='payroll')
+router.register(r'changes', ChangeFeedViewSet, basename='changes')
+
+async_urlpatterns = []
+for prefix, viewset in [
+    ('employee', EmployeeViewSet),
+    ('department', DepartmentViewSet),
+    ('position', PositionViewSet),
+    ('status', StatusViewSet),
+]:
+    view = AsyncReadOnlyView.as_view(viewset_class=viewset)
+    async_urlpatterns += [
+        path(f'{prefix}/', view, name=f'async-{prefix}-list'),
+        path(f'{prefix}/<str:pk>/', view, name=f'async-{prefix}-detail'),
+    ]
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('async/', include(async_urlpatterns)),
     path('login/', obtain_auth_token, name='api_token_auth'),
 ]
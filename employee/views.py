@@ -1,40 +1,228 @@
-from rest_framework import viewsets, filters
+from django.http import StreamingHttpResponse
+from django.conf import settings
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotFound, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
 
-from .models import Employee, Position, Department, Status
+from . import changes, orgchart, revaluation, summary
+from .archive import ArchiveMixin
+from .bulk import BulkWriteMixin
+from .cache import CachedLookupMixin
+from .fastpath import FastListMixin
+from .filters import EmployeeFilter, EmployeeRecordFilter
+from .instrumentation import InstrumentedViewMixin
+from .mixins import EagerLoadingMixin
+from .models import Employee, PayrollSummary, Position, Department, Status
+from .search import FullTextSearchFilter
+from .renderers import CSVRenderer, FastJSONRenderer, NDJSONRenderer, serializer_columns
+from .routers import primary
 from .serializers import (
     EmployeeSerializer,
+    PayrollSummarySerializer,
     PositionSerializer,
     DepartmentSerializer,
+    RevaluationProjectionSerializer,
+    RevaluationSerializer,
     StatusSerializer
 )
+from .typeahead import employee_typeahead
 
 
-class StatusViewSet(viewsets.ModelViewSet):
+class IntParamMixin:
+    def get_int_param(self, name):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        try:
+            value = int(value)
+        except ValueError:
+            value = -1
+        if value < 0:
+            raise ValidationError({name: ['A non-negative integer is required.']})
+        return value
+
+
+class StatusViewSet(InstrumentedViewMixin, CachedLookupMixin, EagerLoadingMixin,
+                     viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = Status.objects.all()
     serializer_class = StatusSerializer
 
 
-class PositionViewSet(viewsets.ModelViewSet):
+class PositionViewSet(InstrumentedViewMixin, CachedLookupMixin, EagerLoadingMixin,
+                       viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = Position.objects.all()
     serializer_class = PositionSerializer
 
+    @action(detail=False, methods=['post'])
+    def revalue(self, request):
+        """
+        Raise the salaries of many positions at once by ``percent`` or a
+        fixed ``amount``, selected by the ``department_id``/``status_id`` of
+        their holders or by ``position_ids``, with one ``UPDATE``. With
+        ``dry_run`` only the before/after payroll projection is returned.
+        """
+        serializer = RevaluationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        positions = revaluation.select_positions(
+            data.get('department'), data.get('status'), data.get('position_ids'),
+        )
+        adjustment = {'percent': data.get('percent'), 'amount': data.get('amount')}
+        selection = revaluation.holder_filter(data.get('department'), data.get('status'))
+        projection = revaluation.revalue(positions, dry_run=data['dry_run'], selection=selection,
+                                         **adjustment)
+        return Response(RevaluationProjectionSerializer({**projection, 'dry_run': data['dry_run']}).data)
+
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(InstrumentedViewMixin, IntParamMixin, CachedLookupMixin, EagerLoadingMixin,
+                         viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
 
+    @action(detail=False, url_path='org-chart', url_name='org-chart')
+    def org_chart(self, request):
+        """
+        Departments nested under the department their manager belongs to.
+        ``?root=<id>`` returns that department's subtree and ``?depth=<n>``
+        limits how many levels below the roots are expanded.
+        """
+        chart = orgchart.get_chart()
+        roots = chart['roots']
+        depth = self.get_int_param('depth')
+        root = self.get_int_param('root')
+        if root is not None:
+            if root not in chart['nodes']:
+                raise NotFound('Department not found.')
+            roots = [root]
+        return Response({
+            'results': orgchart.render_tree(chart, roots, depth),
+            'cycles': chart['cycles'],
+        })
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+
+class EmployeeViewSet(InstrumentedViewMixin, IntParamMixin, FastListMixin, BulkWriteMixin,
+                      EagerLoadingMixin, ArchiveMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['status', 'position', 'department']
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
+    filterset_class = EmployeeFilter
+    archived_filterset_class = EmployeeRecordFilter
+    ordering_fields = ['status', 'position', 'department', 'name']
     search_fields = ['name', 'address']
+    export_chunk_size = 2000
+    typeahead_limit = 10
+    typeahead_max_limit = 50
+
+    @action(detail=False, methods=['get'])
+    def typeahead(self, request):
+        """
+        Employees with a word of their name starting with ``?q=``, from an
+        in-process prefix index rather than the database. ``?limit=``
+        caps the matches (default 10, at most 50).
+        """
+        limit = self.get_int_param('limit')
+        limit = self.typeahead_limit if limit is None else limit
+        matches = employee_typeahead.search(request.query_params.get('q', ''),
+                                            min(limit, self.typeahead_max_limit))
+        return Response({'results': [{'id': pk, 'name': name} for pk, name in matches]})
+
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Stream every employee matching the list filters as NDJSON or CSV
+        (``?format=csv``), reading the table through a server-side cursor.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).order_by('id')
+        serializer = self.get_serializer()
+        renderer = request.accepted_renderer
+        rows = (
+            serializer.to_representation(employee)
+            for employee in queryset.iterator(chunk_size=self.export_chunk_size)
+        )
+        response = StreamingHttpResponse(
+            renderer.render_stream(rows, columns=serializer_columns(serializer)),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = f'attachment; filename="employees.{renderer.format}"'
+        return response
+
+
+class PayrollSummaryViewSet(InstrumentedViewMixin, viewsets.GenericViewSet):
+    """
+    Headcount and salary totals per department and per status, answered
+    from the incrementally maintained ``PayrollSummary`` table.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = PayrollSummarySerializer
+    pagination_class = None
+
+    @action(detail=False, url_path='department', url_name='department')
+    def by_department(self, request):
+        return self.report(PayrollSummary.DEPARTMENT)
+
+    @action(detail=False, url_path='status', url_name='status')
+    def by_status(self, request):
+        return self.report(PayrollSummary.STATUS)
+
+    def report(self, dimension):
+        rows, total = summary.report(dimension)
+        return Response({
+            'results': self.get_serializer(rows, many=True).data,
+            'total': self.get_serializer(total).data,
+        })
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Changes after this cursor have been pruned; start again without ?since=.'
+    default_code = 'cursor_expired'
+
+
+class ChangeFeedViewSet(InstrumentedViewMixin, IntParamMixin, viewsets.GenericViewSet):
+    """
+    Employees, departments, positions and statuses changed after
+    ``?since=<cursor>``, each at its current state or as a tombstone once
+    deleted, read from the primary. Without ``?since=`` only the cursor to
+    start from is returned, to be taken before fetching a full snapshot.
+    ``?model=employee,status`` limits the feed and ``?limit=`` caps the
+    entries read per page.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+    default_limit = 500
+
+    def list(self, request):
+        # A lagging replica could show a later entry before an earlier one
+        # and move the cursor past it.
+        with primary():
+            return self.read_changes(request)
+
+    def read_changes(self, request):
+        since = self.get_int_param('since')
+        if since is None:
+            return Response({'cursor': changes.current_cursor(), 'has_more': False, 'results': []})
+        if changes.is_expired(since):
+            raise CursorExpired()
+
+        limit = self.get_int_param('limit')
+        limit = min(limit or self.default_limit, settings.API_MAX_PAGE_SIZE)
+        models = request.query_params.get('model')
+        if models is not None:
+            models = [name for name in models.split(',') if name]
+            unknown = set(models) - set(changes.FEEDS)
+            if unknown:
+                raise ValidationError({'model': [f'Unknown model: {", ".join(sorted(unknown))}.']})
+
+        results, cursor, has_more = changes.read(since, limit, models, self.get_serializer_context())
+        return Response({'cursor': cursor, 'has_more': has_more, 'results': results})
 
 # Create your views here.
@@ -0,0 +1,24 @@
+from django.db import connections
+from django.urls import reverse
+
+from . import cache
+from .models import Department, Position, Status
+from .typeahead import employee_typeahead
+
+
+def warm_caches():
+    """
+    Do the work a worker would otherwise do on its first requests: build
+    the URL resolver, seed the lookup cache versions and load the employee
+    typeahead index.
+
+    Meant for the Gunicorn master after the app is preloaded, so forked
+    workers inherit the result. Closes the database connections it opened,
+    which must not be shared with the workers.
+    """
+    try:
+        reverse('api-root')
+        cache.get_versions(Status, Position, Department)
+        employee_typeahead.load()
+    finally:
+        connections.close_all()
@@ -45,7 +45,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'employee.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'employee.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -78,14 +80,106 @@ WSGI_APPLICATION = 'employee_management_system.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# PostgreSQL from the DATABASE_* variables when DATABASE_HOST is set (the
+# docker-compose setups), SQLite in the project directory otherwise.
+
+DATABASE_ENGINE = os.environ.get(
+    'DATABASE_ENGINE', 'postgresql' if os.environ.get('DATABASE_HOST') else 'sqlite3'
+)
+
+if DATABASE_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DATABASE_NAME', 'employee_db'),
+            'USER': os.environ.get('DATABASE_USER', ''),
+            'PASSWORD': os.environ.get('DATABASE_PASSWORD', ''),
+            'HOST': os.environ.get('DATABASE_HOST', 'localhost'),
+            'PORT': os.environ.get('DATABASE_PORT', '5432'),
+            # Persistent connections, checked before each request reuses them
+            'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if os.environ.get('DATABASE_POOL', 'False').lower() in ('1', 'true', 'yes'):
+        # psycopg 3 connection pool per worker process; connections are
+        # checked as they are handed out. Pooling replaces CONN_MAX_AGE.
+        from psycopg_pool import ConnectionPool
+
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DATABASE_POOL_TIMEOUT', 10)),
+            'check': ConnectionPool.check_connection,
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Wait for the write lock instead of failing with "database
+                # is locked", and take it when the transaction begins so a
+                # read-then-write transaction cannot deadlock another one.
+                'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 20)),
+                'transaction_mode': 'IMMEDIATE',
+                # Run on every new connection. WAL lets readers proceed
+                # while a write is in progress.
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA temp_store=MEMORY;'
+                    'PRAGMA mmap_size=134217728;'
+                ),
+            },
+        }
+    }
+
+# Read replicas: DATABASE_REPLICA_HOSTS lists PostgreSQL hosts sharing the
+# primary's credentials; SQLITE_REPLICA_PATH adds a SQLite stand-in for
+# trying replica routing locally. GET/HEAD/OPTIONS requests read from a
+# healthy replica unless the client wrote within DATABASE_REPLICA_PIN_SECONDS.
+
+replica_hosts = [
+    host.strip() for host in os.environ.get('DATABASE_REPLICA_HOSTS', '').split(',') if host.strip()
+]
+if DATABASE_ENGINE == 'postgresql':
+    for index, host in enumerate(replica_hosts, 1):
+        DATABASES[f'replica_{index}'] = {
+            **DATABASES['default'],
+            'HOST': host,
+            'TEST': {'MIRROR': 'default'},
+        }
+elif os.environ.get('SQLITE_REPLICA_PATH'):
+    DATABASES['replica_1'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['SQLITE_REPLICA_PATH'],
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['employee.routers.PrimaryReplicaRouter']
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get('DATABASE_REPLICA_PIN_SECONDS', 5))
+DATABASE_REPLICA_CHECK_INTERVAL = int(os.environ.get('DATABASE_REPLICA_CHECK_INTERVAL', 30))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# cache (e.g. django.core.cache.backends.redis.RedisCache) so every worker
+# sees the same lookup versions.
 
-DATABASES = {
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
+# Seconds a cached Status/Position/Department response is kept
+LOOKUP_CACHE_TIMEOUT = int(os.environ.get('LOOKUP_CACHE_TIMEOUT', 3600))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -123,6 +217,21 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Employee image processing
+# Uploads above either limit are rejected; accepted ones get resized JPEG
+# and WebP variants (longest edge in pixels) built on a worker thread pool.
+EMPLOYEE_IMAGE_MAX_BYTES = int(os.environ.get('EMPLOYEE_IMAGE_MAX_BYTES', 5 * 1024 * 1024))
+EMPLOYEE_IMAGE_MAX_PIXELS = int(os.environ.get('EMPLOYEE_IMAGE_MAX_PIXELS', 25_000_000))
+EMPLOYEE_IMAGE_WORKERS = int(os.environ.get('EMPLOYEE_IMAGE_WORKERS', 2))
+EMPLOYEE_IMAGE_VARIANTS = {'thumbnail': 64, 'small': 256, 'medium': 768}
+
+# Employees in these statuses are moved to the archive table by the
+# archive_employees command
+EMPLOYEE_ARCHIVE_STATUSES = [
+    name.strip() for name in os.environ.get('EMPLOYEE_ARCHIVE_STATUSES', 'resigned,terminated').split(',')
+    if name.strip()
+]
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -131,11 +240,68 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'employee.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'employee.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 50)),
+}
+
+# Upper bound for the ``?page_size=`` query parameter
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 1000))
+
+# Build employee list pages from values_list() rows instead of model
+# instances; the JSON is the same
+API_FAST_LIST = os.environ.get('API_FAST_LIST', 'True').lower() in ('1', 'true', 'yes')
+
+# Change feed: seconds a logged change waits before /api/changes/ serves
+# it on databases other than PostgreSQL, longer than the longest write
+# transaction, and days the log is kept by the prune_changes command
+CHANGE_FEED_DELAY = float(os.environ.get('CHANGE_FEED_DELAY', 2))
+CHANGE_LOG_RETENTION_DAYS = int(os.environ.get('CHANGE_LOG_RETENTION_DAYS', 30))
+
+# Employee typeahead: seconds between checks of the shared index version,
+# and the change log entries applied before a worker rebuilds instead
+TYPEAHEAD_CHECK_INTERVAL = float(os.environ.get('TYPEAHEAD_CHECK_INTERVAL', 1))
+TYPEAHEAD_MAX_CATCH_UP = int(os.environ.get('TYPEAHEAD_MAX_CATCH_UP', 5000))
+
+# Admin change lists count at most this many rows; larger unfiltered tables
+# are counted from the planner statistics instead
+ADMIN_EXACT_COUNT_LIMIT = int(os.environ.get('ADMIN_EXACT_COUNT_LIMIT', 10000))
+
+# Token authentication cache: a per-process LRU and, when TOKEN_CACHE_ALIAS
+# names an entry in CACHES, a shared tier. Without a shared CACHE_BACKEND a
+# worker keeps tokens for TOKEN_CACHE_LOCAL_TTL seconds, the longest a
+# revocation in another worker takes to reach it
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))
+TOKEN_CACHE_TTL = int(os.environ.get('TOKEN_CACHE_TTL', 60))
+TOKEN_CACHE_LOCAL_TTL = int(os.environ.get('TOKEN_CACHE_LOCAL_TTL', 5))
+TOKEN_CACHE_ALIAS = os.environ.get('TOKEN_CACHE_ALIAS') or None
+TOKEN_CACHE_SHARED_TTL = int(os.environ.get('TOKEN_CACHE_SHARED_TTL', 300))
+
+# Request instrumentation: the fraction of requests timed (0 disables the
+# middleware), the threshold above which their SQL is logged, and whether
+# timings are sent back in a Server-Timing header
+PERF_SAMPLE_RATE = float(os.environ.get('PERF_SAMPLE_RATE', 0))
+PERF_SLOW_REQUEST_MS = float(os.environ.get('PERF_SLOW_REQUEST_MS', 500))
+PERF_SLOW_SQL_LIMIT = int(os.environ.get('PERF_SLOW_SQL_LIMIT', 10))
+PERF_SERVER_TIMING = os.environ.get('PERF_SERVER_TIMING', 'True').lower() in ('1', 'true', 'yes')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'employee.performance': {
+            'handlers': ['console'],
+            'level': os.environ.get('PERF_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
 }
 
 # CORS settings
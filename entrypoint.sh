@@ -1,31 +1,27 @@
 #!/bin/sh
 set -e
 
-echo "Running migrations..."
-python manage.py makemigrations --noinput
-python manage.py migrate --noinput
+# Read by gunicorn.conf.py to log time-to-first-request.
+STARTUP_TIME=$(date +%s.%N)
+export STARTUP_TIME
 
 if [ "$1" = "test" ]; then
+  python manage.py bootstrap --skip-user
   echo "Running tests..." 
   python manage.py test --keepdb
 else
-  echo "Creating normal user if not exists..."
-  python manage.py shell << END
-from django.contrib.auth import get_user_model
-User = get_user_model()
-if not User.objects.filter(username='${DJANGO_NORMAL_USERNAME}').exists():
-    User.objects.create_user(
-        username='${DJANGO_NORMAL_USERNAME}',
-        password='${DJANGO_NORMAL_PASSWORD}',
-        email='user@example.com'
-    )
-END
+  # Applies migrations only when some are pending and creates
+  # DJANGO_NORMAL_USERNAME if it does not exist, in one interpreter.
+  python manage.py bootstrap
 
-  if [ "$ENVIRONMENT" = "production" ]; then
+  if [ "$ENVIRONMENT" = "production" ] && [ "$SERVER_INTERFACE" = "asgi" ]; then
+      echo "Starting Gunicorn with Uvicorn workers for production..."
+      exec gunicorn employee_management_system.asgi:application -c gunicorn.conf.py -k uvicorn_worker.UvicornWorker
+  elif [ "$ENVIRONMENT" = "production" ]; then
       echo "Starting Gunicorn for production..."
-      gunicorn employee_management_system.wsgi:application --bind 0.0.0.0:8000 --workers 4
+      exec gunicorn employee_management_system.wsgi:application -c gunicorn.conf.py
   else
       echo "Starting Django development server..."
-      python manage.py runserver 0.0.0.0:8000
+      exec python manage.py runserver 0.0.0.0:8000
   fi
 fi
@@ -0,0 +1,52 @@
+"""
+Gunicorn settings for the production containers (see entrypoint.sh).
+
+The app is imported and its caches warmed once in the master, then
+workers are forked from it, so they start serving immediately and share
+those pages copy-on-write.
+"""
+import os
+import time
+
+# Set by entrypoint.sh when the container starts; defaults to now.
+STARTED_AT = float(os.environ.get('STARTUP_TIME') or time.time())
+
+
+def available_cpus():
+    """CPUs this container may use: its cgroup quota, else its affinity mask."""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as quota_file:
+            quota, period = quota_file.read().split()
+        if quota != 'max':
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+# (2 x CPUs) + 1 as the Gunicorn docs suggest; WEB_CONCURRENCY overrides.
+workers = int(os.environ.get('WEB_CONCURRENCY') or available_cpus() * 2 + 1)
+preload_app = True
+
+
+def when_ready(server):
+    from employee.warmup import warm_caches
+
+    warmed = time.monotonic()
+    warm_caches()
+    server.log.info('Caches warmed in %.2fs; ready %.2fs after startup',
+                    time.monotonic() - warmed, time.time() - STARTED_AT)
+
+
+def post_worker_init(worker):
+    from django.core.signals import request_finished
+
+    def log_first_request(**kwargs):
+        request_finished.disconnect(log_first_request)
+        worker.log.info('Worker %s served its first request %.2fs after startup',
+                        worker.pid, time.time() - STARTED_AT)
+
+    request_finished.connect(log_first_request, weak=False)